@@ -0,0 +1,147 @@
+from concurrent import futures
+import asyncio
+import logging
+import signal
+
+import grpc
+from grpc_health.v1 import health_pb2_grpc
+
+import proto.messages_pb2_grpc as messages_pb2_grpc
+from config import get_config
+from interceptors.aio_auth_interceptor import AioAuthInterceptor
+from interceptors.aio_interceptors import AioAdmissionInterceptor, AioCompressionInterceptor, AioMetricsInterceptor
+from lib.db import AioDb, Db, db_profiles
+from lib.health import HealthMonitor
+from lib.metrics import start_metrics_server
+from lib.counts import count_cache
+from lib.principal_cache import principal_cache
+from lib.passthrough import add_passthrough_servicer
+from lib.server_settings import channel_options, compression, server_settings
+from schema.schema_manager import SchemaManager
+from server import SERVICE_NAMES, server_interceptors
+from services.aio_customers import AioCustomerServicer
+from services.aio_data import AioDataServicer
+from services.aio_reports import AioReportServicer
+from services.companies import CompaniesServicer
+from services.config import ConfigurationServicer
+from services.data import TRIAL_RESULT_METHODS
+from services.reports import SALE_RECORD_METHODS
+from services.shoes import ShoesServicer
+from services.users import UserServicer
+
+
+def aio_server_interceptors(db, config, settings) -> list:
+    """The interceptors of Server, in the same order, for the grpc.aio server
+
+    Args:
+        db (Database): Database the AuthInterceptor reads principals from
+        config (dict): Server config
+        settings (dict): Server settings
+
+    Returns:
+        list: grpc.aio interceptors
+    """
+    metrics, auth, admission, compression = server_interceptors(db, config, settings)
+    return [
+        AioMetricsInterceptor(metrics),
+        AioAuthInterceptor(auth),
+        AioAdmissionInterceptor(admission),
+        AioCompressionInterceptor(compression)
+    ]
+
+
+class AioServer():
+    """grpc.aio variant of Server, run alongside it on its own port
+
+    Data, Reports and Customers serve their read RPCs from motor on the event
+    loop. Every other RPC is the same sync code as Server, run on the
+    migration thread pool, so responses are identical between the two. Both
+    run every RPC through the same metrics, auth, admission and compression,
+    report grpc health and drain on SIGTERM.
+    """
+
+    def __init__(self, testing=False):
+        self.config = get_config()
+        self.config['unittesting'] = testing
+        if not self.config['staging']:
+            with open(self.config['private_key'], 'rb') as f:
+                self.private_key = f.read()
+            with open(self.config['certificate_chain'], 'rb') as f:
+                self.certificate_chain = f.read()
+
+        self.unittesting = testing
+        dbname = 'avaclone' if not testing else 'avaclone-unittests'
+        profiles = db_profiles(self.config)
+        db = Db(self.config['db-host'], profiles, self.config.get('query-log'))
+        motor_db = AioDb(self.config['db-host'], profiles)
+        self.database = db.get_database(dbname)
+        self.ingest_database = db.get_database(dbname, 'ingest')
+        self.analytics_database = db.get_database(dbname, 'analytics')
+        self.motor_database = motor_db.get_database(dbname)
+        self.motor_ingest_database = motor_db.get_database(dbname, 'ingest')
+        self.motor_analytics_database = motor_db.get_database(dbname, 'analytics')
+        if server_settings(self.config)['schema-check'] == 'sync':
+            SchemaManager(self.database).check_and_update_schema()
+        principal_cache.configure(self.config.get('principal-cache-size'), self.config.get('principal-cache-ttl'))
+        count_cache.configure(self.config.get('count-cache-ttl'))
+
+    async def serve(self):
+        settings = server_settings(self.config)
+        aio_settings = self.config.get('aio-server') or {}
+        executor = futures.ThreadPoolExecutor(max_workers=settings['workers'])
+        interceptors = aio_server_interceptors(self.database, self.config, settings)
+        server = grpc.aio.server(
+            migration_thread_pool=executor,
+            interceptors=interceptors,
+            options=channel_options(settings),
+            maximum_concurrent_rpcs=settings['max-concurrent-rpcs'],
+            compression=compression(settings['compression']))
+        add_passthrough_servicer(
+            messages_pb2_grpc.add_DataServicer_to_server, AioDataServicer(self.ingest_database, self.motor_ingest_database), server,
+            TRIAL_RESULT_METHODS)
+        messages_pb2_grpc.add_UsersServicer_to_server(UserServicer(self.database, self.config), server)
+        messages_pb2_grpc.add_CustomersServicer_to_server(AioCustomerServicer(self.database, self.motor_database, self.analytics_database), server)
+        messages_pb2_grpc.add_ShoesServicer_to_server(ShoesServicer(self.database), server)
+        messages_pb2_grpc.add_CompaniesServicer_to_server(CompaniesServicer(self.database, self.config), server)
+        messages_pb2_grpc.add_ConfigurationServicer_to_server(ConfigurationServicer(self.database, self.config), server)
+        add_passthrough_servicer(
+            messages_pb2_grpc.add_ReportsServicer_to_server, AioReportServicer(
+                self.database, self.motor_analytics_database, executor, self.analytics_database), server,
+            SALE_RECORD_METHODS)
+        self.health = HealthMonitor(self.database, SERVICE_NAMES, settings['health-interval-seconds'])
+        health_pb2_grpc.add_HealthServicer_to_server(self.health.servicer, server)
+        # The port bound, for when insecure-port is 0
+        self.insecure_port = server.add_insecure_port(f'[::]:{aio_settings.get("insecure-port", 50061)}')
+        if not self.config['staging']:
+            server_credentials = grpc.ssl_server_credentials(((self.private_key, self.certificate_chain,),))
+            server.add_secure_port(f'[::]:{aio_settings.get("secure-port", 50062)}', server_credentials)
+        await server.start()
+        self.health.start()
+        if not self.unittesting:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, lambda: asyncio.ensure_future(self.drain(server, settings)))
+        if aio_settings.get('metrics-port') and not self.unittesting:
+            # Its own port, the sync server or supervisor already has metrics-port
+            start_metrics_server(aio_settings['metrics-port'])
+        if self.config['staging']:
+            print('Aio Server Started')
+
+        if not self.unittesting:
+            await server.wait_for_termination()
+        return server
+
+    async def drain(self, server, settings):
+        """Stop taking new RPCs and give the in-flight ones time to finish, as Server.drain does
+
+        Args:
+            server (grpc.aio.Server): Running server
+            settings (dict): Server settings
+        """
+        self.health.drain()
+        await asyncio.sleep(settings['drain-delay-seconds'])
+        await server.stop(settings['drain-grace-seconds'])
+
+
+if __name__ == '__main__':
+    logging.basicConfig()
+    asyncio.run(AioServer().serve())
@@ -1,27 +1,42 @@
+import inspect
+
 import grpc
 
+def has_role(roles, context):
+    if isinstance(roles, list):
+        return context.user['role'] in roles
+    return context.user['role'] == roles
+
 def check_role(roles):
     def decorator(function):
-        def wrapper(instance, request, context):
-            if isinstance(roles, list):
-                if not context.user['role'] in roles:
-                    context.abort(grpc.StatusCode.PERMISSION_DENIED, 'You do not have permission to perform this action')
+        # Async handlers (grpc.aio) need wrappers of the same kind or grpc won't await them
+        if inspect.isasyncgenfunction(function):
+            async def async_gen_wrapper(instance, request, context):
+                if not has_role(roles, context):
+                    await context.abort(grpc.StatusCode.PERMISSION_DENIED, 'You do not have permission to perform this action')
                     return
-            else:
-                if not context.user['role'] == roles:
-                    context.abort(grpc.StatusCode.PERMISSION_DENIED, 'You do not have permission to perform this action')
+                async for result in function(instance, request, context):
+                    yield result
+            return async_gen_wrapper
+
+        if inspect.iscoroutinefunction(function):
+            async def async_wrapper(instance, request, context):
+                if not has_role(roles, context):
+                    await context.abort(grpc.StatusCode.PERMISSION_DENIED, 'You do not have permission to perform this action')
                     return
+                return await function(instance, request, context)
+            return async_wrapper
+
+        def wrapper(instance, request, context):
+            if not has_role(roles, context):
+                context.abort(grpc.StatusCode.PERMISSION_DENIED, 'You do not have permission to perform this action')
+                return
             result = function(instance, request, context)
             return result
         return wrapper
     return decorator
 
 def check_user_role(roles, context):
-    if isinstance(roles, list):
-        if not context.user['role'] in roles:
-            context.abort(grpc.StatusCode.PERMISSION_DENIED, 'You do not have permission to perform this action')
-            return
-    else:
-        if not context.user['role'] == roles:
-            context.abort(grpc.StatusCode.PERMISSION_DENIED, 'You do not have permission to perform this action')
-            return
\ No newline at end of file
+    if not has_role(roles, context):
+        context.abort(grpc.StatusCode.PERMISSION_DENIED, 'You do not have permission to perform this action')
+        return
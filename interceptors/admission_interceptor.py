@@ -0,0 +1,64 @@
+import inspect
+
+import grpc
+from grpc_interceptor import ServerInterceptor
+from lib.admission import AdmissionController
+from lib.metrics import REGISTRY, Counter, split_method_name
+
+REJECTED = REGISTRY.register(Counter(
+    'grpc_server_rejected_total', 'RPCs turned away by admission control', ('grpc_service', 'grpc_method', 'reason')))
+
+REJECTED_DETAILS = 'Too many requests, please try again shortly'
+
+
+class AdmissionInterceptor(ServerInterceptor):
+    """Rejects RPCs over their service/company concurrency or rate limits with RESOURCE_EXHAUSTED
+
+    Must run after the AuthInterceptor so the caller's company is known.
+    """
+
+    def __init__(self, controller: AdmissionController):
+        self.controller = controller
+
+    def admit(self, method_name: str, context):
+        """Take a slot for an RPC, counting it if it is turned away
+
+        Args:
+            method_name (str): Full grpc method name
+            context: grpc context, with the caller as context.user
+
+        Returns:
+            tuple: Slot to release once the RPC is done, None if it is over a limit
+        """
+        user = getattr(context, 'user', None)
+        company_id = str(user['company_id']) if user and user.get('company_id') else None
+        slot, reason = self.controller.acquire(method_name, company_id)
+        if slot is None:
+            service, rpc = split_method_name(method_name)
+            REJECTED.inc(grpc_service=service, grpc_method=rpc, reason=reason)
+        return slot
+
+    def intercept(self, method, request, context, method_name: str):
+        slot = self.admit(method_name, context)
+        if slot is None:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, REJECTED_DETAILS)
+            return
+
+        try:
+            response = method(request, context)
+        except Exception:
+            self.controller.release(slot)
+            raise
+
+        if inspect.isgenerator(response):
+            return self._release_after(slot, response)
+
+        self.controller.release(slot)
+        return response
+
+    def _release_after(self, slot, responses):
+        # Streams hold their slot until the last message has been sent
+        try:
+            yield from responses
+        finally:
+            self.controller.release(slot)
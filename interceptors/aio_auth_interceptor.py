@@ -0,0 +1,95 @@
+import asyncio
+import inspect
+
+import grpc
+from interceptors.auth_interceptor import AuthInterceptor
+from lib.request_context import RequestContext, run_tracked, time_remaining
+
+
+class AioContext():
+    """Wraps a grpc.aio servicer context so handlers can read context.user
+
+    The aio contexts are Cython objects that don't take new attributes.
+    """
+
+    def __init__(self, context, user=None, request_context=None):
+        self._context = context
+        self.user = user
+        self.request_context = request_context
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+
+class AioAuthInterceptor(grpc.aio.ServerInterceptor):
+    """AuthInterceptor for the grpc.aio server
+
+    Handles both async handlers and the sync ones grpc.aio runs on its migration thread pool.
+    """
+
+    def __init__(self, auth: AuthInterceptor):
+        self.auth = auth
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        method_name = handler_call_details.method
+        if handler is None or method_name == '/AvaProtos.Reports/GetData':
+            return handler
+
+        metadict = dict(handler_call_details.invocation_metadata or ())
+        for kind in ['unary_unary', 'unary_stream', 'stream_unary', 'stream_stream']:
+            behavior = getattr(handler, kind)
+            if behavior is not None:
+                wrapped = self._wrap(behavior, method_name, metadict)
+                return getattr(grpc, f'{kind}_rpc_method_handler')(
+                    wrapped, handler.request_deserializer, handler.response_serializer)
+        return handler
+
+    def _wrap(self, behavior, method_name, metadict):
+        if inspect.isasyncgenfunction(behavior):
+            async def async_gen_wrapper(request, context):
+                context = await self._authenticate_async(method_name, metadict, context)
+                try:
+                    async for response in behavior(request, context):
+                        yield response
+                except asyncio.CancelledError:
+                    # grpc.aio cancels the handler when the client goes away
+                    context.request_context.abandon('cancelled')
+                    raise
+                finally:
+                    context.request_context.finish(method_name)
+            return async_gen_wrapper
+
+        if inspect.iscoroutinefunction(behavior):
+            async def async_wrapper(request, context):
+                context = await self._authenticate_async(method_name, metadict, context)
+                try:
+                    return await behavior(request, context)
+                except asyncio.CancelledError:
+                    context.request_context.abandon('cancelled')
+                    raise
+                finally:
+                    context.request_context.finish(method_name)
+            return async_wrapper
+
+        # Sync handler, already running on a pool thread
+        def wrapper(request, context):
+            user, company, error = self.auth.authenticate(method_name, metadict)
+            if error:
+                # The migration thread's abort doesn't raise
+                context.abort(*error)
+                return
+            request_context = RequestContext(self.auth.db, user, company, time_remaining(context))
+            context = AioContext(context, user, request_context)
+            return run_tracked(method_name, request_context, lambda: behavior(request, context))
+        return wrapper
+
+    async def _authenticate_async(self, method_name, metadict, context):
+        # A principal cache miss goes to Mongo, keep that off the event loop
+        user, company, error = await asyncio.get_running_loop().run_in_executor(
+            None, self.auth.authenticate, method_name, metadict)
+        if error:
+            await context.abort(*error)
+        request_context = RequestContext(self.auth.db, user, company, time_remaining(context))
+        request_context.method_name = method_name
+        return AioContext(context, user, request_context)
@@ -0,0 +1,168 @@
+import asyncio
+import inspect
+import time
+
+import grpc
+from interceptors.admission_interceptor import REJECTED_DETAILS, AdmissionInterceptor
+from interceptors.compression_interceptor import CompressionInterceptor
+from interceptors.metrics_interceptor import FIRST_MESSAGE_SECONDS, MetricsInterceptor, status_code
+from lib.metrics import split_method_name
+
+
+class AioInterceptor(grpc.aio.ServerInterceptor):
+    """Runs one of the sync server's interceptors on the grpc.aio server
+
+    Sync handlers, which grpc.aio runs on its migration thread pool, go
+    through the sync interceptor as they would on Server. Async handlers go
+    through intercept_unary/intercept_stream, which subclasses implement with
+    the same behaviour.
+    """
+
+    def __init__(self, interceptor):
+        self.interceptor = interceptor
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return handler
+
+        for kind in ['unary_unary', 'unary_stream', 'stream_unary', 'stream_stream']:
+            behavior = getattr(handler, kind)
+            if behavior is not None:
+                wrapped = self._wrap(behavior, handler_call_details.method)
+                return getattr(grpc, f'{kind}_rpc_method_handler')(
+                    wrapped, handler.request_deserializer, handler.response_serializer)
+        return handler
+
+    def _wrap(self, behavior, method_name):
+        if inspect.isasyncgenfunction(behavior):
+            async def async_gen_wrapper(request, context):
+                async for response in self.intercept_stream(behavior, request, context, method_name):
+                    yield response
+            return async_gen_wrapper
+
+        if inspect.iscoroutinefunction(behavior):
+            async def async_wrapper(request, context):
+                return await self.intercept_unary(behavior, request, context, method_name)
+            return async_wrapper
+
+        def wrapper(request, context):
+            return self.intercept_sync(behavior, request, context, method_name)
+        return wrapper
+
+    def intercept_sync(self, behavior, request, context, method_name: str):
+        return self.interceptor.intercept(behavior, request, context, method_name)
+
+    async def intercept_unary(self, behavior, request, context, method_name: str):
+        return await behavior(request, context)
+
+    async def intercept_stream(self, behavior, request, context, method_name: str):
+        async for response in behavior(request, context):
+            yield response
+
+
+class StatusContext():
+    """Remembers the status a sync handler set, which the grpc.aio context it runs with doesn't report"""
+
+    def __init__(self, context):
+        self._context = context
+        self._code = None
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+    def abort(self, code, details=''):
+        self._code = code
+        self._context.abort(code, details)
+
+    def set_code(self, code):
+        self._code = code
+        self._context.set_code(code)
+
+    def code(self):
+        return self._code
+
+
+class AioMetricsInterceptor(AioInterceptor):
+    def __init__(self, interceptor: MetricsInterceptor):
+        super().__init__(interceptor)
+
+    def intercept_sync(self, behavior, request, context, method_name: str):
+        return self.interceptor.intercept(behavior, request, StatusContext(context), method_name)
+
+    async def intercept_unary(self, behavior, request, context, method_name: str):
+        service, rpc = split_method_name(method_name)
+        start = time.perf_counter()
+        try:
+            response = await behavior(request, context)
+        except asyncio.CancelledError:
+            self.interceptor._finish(service, rpc, grpc.StatusCode.CANCELLED, start)
+            raise
+        except Exception as e:
+            self.interceptor._finish(service, rpc, status_code(context, e), start)
+            raise
+
+        if response is not None:
+            self.interceptor._sent(service, rpc, response)
+        self.interceptor._finish(service, rpc, status_code(context), start)
+        return response
+
+    async def intercept_stream(self, behavior, request, context, method_name: str):
+        service, rpc = split_method_name(method_name)
+        start = time.perf_counter()
+        code = None
+        first = True
+        try:
+            async for response in behavior(request, context):
+                if first:
+                    FIRST_MESSAGE_SECONDS.observe(time.perf_counter() - start, grpc_service=service, grpc_method=rpc)
+                    first = False
+                self.interceptor._sent(service, rpc, response)
+                yield response
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client went away mid-stream
+            code = grpc.StatusCode.CANCELLED
+            raise
+        except Exception as e:
+            code = status_code(context, e)
+            raise
+        finally:
+            self.interceptor._finish(service, rpc, code or status_code(context), start)
+
+
+class AioAdmissionInterceptor(AioInterceptor):
+    def __init__(self, interceptor: AdmissionInterceptor):
+        super().__init__(interceptor)
+
+    async def intercept_unary(self, behavior, request, context, method_name: str):
+        slot = self.interceptor.admit(method_name, context)
+        if slot is None:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, REJECTED_DETAILS)
+        try:
+            return await behavior(request, context)
+        finally:
+            self.interceptor.controller.release(slot)
+
+    async def intercept_stream(self, behavior, request, context, method_name: str):
+        slot = self.interceptor.admit(method_name, context)
+        if slot is None:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, REJECTED_DETAILS)
+        try:
+            async for response in behavior(request, context):
+                yield response
+        finally:
+            self.interceptor.controller.release(slot)
+
+
+class AioCompressionInterceptor(AioInterceptor):
+    def __init__(self, interceptor: CompressionInterceptor):
+        super().__init__(interceptor)
+
+    async def intercept_unary(self, behavior, request, context, method_name: str):
+        self.interceptor.apply(context, method_name)
+        return await behavior(request, context)
+
+    async def intercept_stream(self, behavior, request, context, method_name: str):
+        self.interceptor.apply(context, method_name)
+        async for response in behavior(request, context):
+            yield response
@@ -2,66 +2,100 @@ from grpc_interceptor import ServerInterceptor
 import grpc
 import jwt
 from bson import ObjectId
+from lib.principal_cache import principal_cache, USER_PROJECTION, COMPANY_PROJECTION
+from lib.request_context import RequestContext, run_tracked, time_remaining
 
 class AuthInterceptor(ServerInterceptor):
-    EXEMPT_METHODS = ['/AvaProtos.Users/login', '/AvaProtos.Users/sendPasswordReset', '/AvaProtos.Users/resetPassword']
+    EXEMPT_METHODS = ['/AvaProtos.Users/login', '/AvaProtos.Users/sendPasswordReset', '/AvaProtos.Users/resetPassword',
+                      '/grpc.health.v1.Health/Check', '/grpc.health.v1.Health/Watch']
 
-    def __init__(self, database, config):
+    def __init__(self, database, config, cache=None):
         self.config = config
         self.db = database
+        self.cache = cache if cache is not None else principal_cache
 
     def intercept(self, method, request, context, method_name: str):
-        user = None
         if method_name == '/AvaProtos.Reports/GetData':
             return method(request, context)
-            
+
+        user, company, error = self.authenticate(method_name, dict(context.invocation_metadata()))
+        if error:
+            context.abort(*error)
+            return
+
+        setattr(context, 'user', user)
+        request_context = RequestContext(self.db, user, company, time_remaining(context))
+        setattr(context, 'request_context', request_context)
+        return run_tracked(method_name, request_context, lambda: method(request, context))
+
+    def authenticate(self, method_name: str, metadict: dict):
+        """Check the caller's token and load their user and company
+
+        Args:
+            method_name (str): Full grpc method name
+            metadict (dict): Invocation metadata
+
+        Returns:
+            tuple: (user, company, error), error is a (StatusCode, details) pair to abort with or None
+        """
+        user = None
+        company = None
         if not method_name in self.EXEMPT_METHODS:
-            # Get dict of metadata
-            metadict = dict(context.invocation_metadata())
-            
             try:
                 # Attempt to get token
                 auth_header = metadict['authorization']
             except KeyError:
                 # No auth header found in metadata
-                context.abort(grpc.StatusCode.UNAUTHENTICATED, 'No authorization header provided')
-                return
+                return None, None, (grpc.StatusCode.UNAUTHENTICATED, 'No authorization header provided')
 
             try:
                 # Split auth header value to remove get just the token
                 token = auth_header.split(' ')[1]
             except IndexError:
                 # Unable to split token
-                context.abort(grpc.StatusCode.UNAUTHENTICATED, 'Authorization header is malformed')
-                return
+                return None, None, (grpc.StatusCode.UNAUTHENTICATED, 'Authorization header is malformed')
             
             # Check token is valid
             try:
                 user = jwt.decode(token, self.config['jwt-key'], algorithms=["HS256"], verify=True)
                 if not user:
                     # Token is invalid
-                    context.abort(grpc.StatusCode.UNAUTHENTICATED, 'Authorization token is invalid/expired. Please reauthenticate')
-                    return
+                    return None, None, (grpc.StatusCode.UNAUTHENTICATED, 'Authorization token is invalid/expired. Please reauthenticate')
 
-                user = self.db.users.find_one({'email': user['email']})
+                user, company = self._get_principal(token, user['email'])
                 if user['locked']:
-                    context.abort(grpc.StatusCode.PERMISSION_DENIED, 'This account has been locked')
-                    return
+                    return None, None, (grpc.StatusCode.PERMISSION_DENIED, 'This account has been locked')
 
                 if user['role'] < 5:
-                    company = self.db.companies.find_one({'_id': ObjectId(user['company_id'])})
                     if company['blocked']:
-                        context.abort(grpc.StatusCode.UNAUTHENTICATED, 'This account is blocked. Please contact your RUNRIGHT representative')
-                        return
+                        return None, None, (grpc.StatusCode.UNAUTHENTICATED, 'This account is blocked. Please contact your RUNRIGHT representative')
                 
             except:
-                context.abort(grpc.StatusCode.UNAUTHENTICATED, 'Authorization token is invalid/expired. Please reauthenticate')
-                return
+                return None, None, (grpc.StatusCode.UNAUTHENTICATED, 'Authorization token is invalid/expired. Please reauthenticate')
 
 
             if 'x-grpc-web' in metadict and user['role'] < 3:
-                context.abort(grpc.StatusCode.UNAUTHENTICATED, 'Access method not permitted')
-                return
+                return None, None, (grpc.StatusCode.UNAUTHENTICATED, 'Access method not permitted')
 
-        setattr(context, 'user', user)
-        return method(request, context)
+        return user, company, None
+
+    def _get_principal(self, token, email):
+        """Get the user and company for a verified token, from the cache if possible
+
+        Args:
+            token (str): Verified JWT
+            email (str): Email claim from the token
+
+        Returns:
+            tuple: (user, company), company is None for admins
+        """
+        cached = self.cache.get(token)
+        if cached is not None:
+            return cached
+
+        user = self.db.users.find_one({'email': email}, USER_PROJECTION)
+        company = None
+        if user['role'] < 5:
+            company = self.db.companies.find_one({'_id': ObjectId(user['company_id'])}, COMPANY_PROJECTION)
+        self.cache.set(token, user, company)
+        return user, company
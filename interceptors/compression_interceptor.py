@@ -0,0 +1,22 @@
+from grpc_interceptor import ServerInterceptor
+from lib.server_settings import compression
+
+
+class CompressionInterceptor(ServerInterceptor):
+    """Sets response compression per method, overriding the server default
+
+    grpc only applies it when the client advertises support for the
+    algorithm, so clients without it still get plain responses.
+    """
+
+    def __init__(self, method_compression: dict):
+        self.method_compression = {method: compression(name) for method, name in method_compression.items()}
+
+    def apply(self, context, method_name: str):
+        algorithm = self.method_compression.get(method_name)
+        if algorithm is not None and hasattr(context, 'set_compression'):
+            context.set_compression(algorithm)
+
+    def intercept(self, method, request, context, method_name: str):
+        self.apply(context, method_name)
+        return method(request, context)
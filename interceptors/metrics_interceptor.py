@@ -0,0 +1,114 @@
+import inspect
+import time
+
+import grpc
+from grpc_interceptor import ServerInterceptor
+from grpc_interceptor.exceptions import GrpcException
+from pymongo.errors import ExecutionTimeout
+from lib.metrics import REGISTRY, CallbackMetric, Counter, Histogram, split_method_name
+from lib.counts import count_cache
+from lib.principal_cache import principal_cache
+from lib.request_context import read_stats
+
+LABELS = ('grpc_service', 'grpc_method', 'grpc_code')
+
+HANDLED = REGISTRY.register(Counter(
+    'grpc_server_handled_total', 'RPCs completed on the server, regardless of success or failure', LABELS))
+HANDLING_SECONDS = REGISTRY.register(Histogram(
+    'grpc_server_handling_seconds', 'Time to complete an RPC, up to the last message for streams', LABELS))
+FIRST_MESSAGE_SECONDS = REGISTRY.register(Histogram(
+    'grpc_server_first_message_seconds', 'Time until a streaming RPC sent its first message', LABELS[:2]))
+MESSAGES_SENT = REGISTRY.register(Counter(
+    'grpc_server_msg_sent_total', 'Response messages sent by the server', LABELS[:2]))
+BYTES_SENT = REGISTRY.register(Counter(
+    'grpc_server_sent_bytes_total', 'Serialized size of response messages sent by the server', LABELS[:2]))
+
+REGISTRY.register(CallbackMetric(
+    'mongo_reads_total', 'Mongo read commands issued while handling each RPC', 'counter', LABELS[:2],
+    lambda: {split_method_name(method): reads for method, (_, reads) in read_stats().items()}))
+REGISTRY.register(CallbackMetric(
+    'principal_cache_events_total', 'Auth principal cache lookups and removals', 'counter', ('event',),
+    lambda: {k: v for k, v in principal_cache.stats().items() if k != 'size'}))
+REGISTRY.register(CallbackMetric(
+    'principal_cache_size', 'Principals currently held by the auth cache', 'gauge', (),
+    lambda: {(): principal_cache.stats()['size']}))
+REGISTRY.register(CallbackMetric(
+    'count_cache_events_total', 'Cached count lookups', 'counter', ('event',),
+    lambda: {k: v for k, v in count_cache.stats().items() if k != 'size'}))
+
+
+def status_code(context, error=None) -> grpc.StatusCode:
+    """Work out the status an RPC finished with
+
+    Args:
+        context: grpc context of the RPC
+        error (Exception, optional): Exception raised by the handler
+
+    Returns:
+        grpc.StatusCode: Status sent to the client
+    """
+    if isinstance(error, GrpcException):
+        return error.status_code
+    if isinstance(error, ExecutionTimeout):
+        # maxTimeMS came from the client's deadline, which is what it will have seen
+        return grpc.StatusCode.DEADLINE_EXCEEDED
+    # context.abort() records the code on the context before raising
+    code = None
+    if hasattr(context, 'code'):
+        code = context.code()
+    elif hasattr(context, '_state'):
+        code = context._state.code
+    else:
+        code = getattr(context, 'status_code', None)
+    if code is not None:
+        return code
+    return grpc.StatusCode.UNKNOWN if error is not None else grpc.StatusCode.OK
+
+
+class MetricsInterceptor(ServerInterceptor):
+    def intercept(self, method, request, context, method_name: str):
+        service, rpc = split_method_name(method_name)
+        start = time.perf_counter()
+        try:
+            response = method(request, context)
+        except Exception as e:
+            self._finish(service, rpc, status_code(context, e), start)
+            raise
+
+        if inspect.isgenerator(response):
+            return self._track_stream(service, rpc, context, response, start)
+
+        if response is not None:
+            self._sent(service, rpc, response)
+        self._finish(service, rpc, status_code(context), start)
+        return response
+
+    def _track_stream(self, service, rpc, context, responses, start):
+        code = None
+        first = True
+        try:
+            for response in responses:
+                if first:
+                    FIRST_MESSAGE_SECONDS.observe(time.perf_counter() - start, grpc_service=service, grpc_method=rpc)
+                    first = False
+                self._sent(service, rpc, response)
+                yield response
+        except GeneratorExit:
+            # Client went away mid-stream
+            code = grpc.StatusCode.CANCELLED
+            raise
+        except Exception as e:
+            code = status_code(context, e)
+            raise
+        finally:
+            self._finish(service, rpc, code or status_code(context), start)
+
+    def _sent(self, service, rpc, response):
+        MESSAGES_SENT.inc(grpc_service=service, grpc_method=rpc)
+        if hasattr(response, 'ByteSize'):
+            BYTES_SENT.inc(response.ByteSize(), grpc_service=service, grpc_method=rpc)
+
+    def _finish(self, service, rpc, code, start):
+        labels = {'grpc_service': service, 'grpc_method': rpc, 'grpc_code': code.name}
+        HANDLED.inc(**labels)
+        HANDLING_SECONDS.observe(time.perf_counter() - start, **labels)
@@ -0,0 +1,118 @@
+from threading import Lock
+import time
+
+# Device uploads and logins must keep working while dashboards are busy
+DEFAULT_PRIORITY_METHODS = [
+    '/AvaProtos.Data/setShoeTrialResult', '/AvaProtos.Users/login',
+    '/grpc.health.v1.Health/Check', '/grpc.health.v1.Health/Watch'
+]
+
+
+class TokenBucket():
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        """Take a token if one is available, not thread safe on its own
+
+        Returns:
+            bool: False if the bucket is empty
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class AdmissionController():
+    """Decides whether an RPC may start, based on what is already in flight
+
+    Limits are checked without blocking so a caller over its limit gets an
+    immediate rejection rather than waiting for a worker thread.
+    """
+
+    def __init__(self, max_in_flight=None, service_limits=None, company_limit=None, company_rate=None,
+                 company_burst=None, priority_methods=None):
+        self.max_in_flight = max_in_flight
+        self.service_limits = service_limits or {}
+        self.company_limit = company_limit
+        self.company_rate = company_rate
+        self.company_burst = company_burst or company_rate
+        self.priority_methods = set(priority_methods if priority_methods is not None else DEFAULT_PRIORITY_METHODS)
+        self._in_flight = {}
+        self._buckets = {}
+        self._lock = Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a controller from the 'admission' section of the settings
+
+        Args:
+            config (dict): Server config
+
+        Returns:
+            AdmissionController: Controller, unlimited for any setting left out
+        """
+        settings = config.get('admission') or {}
+        return cls(
+            max_in_flight=settings.get('max-in-flight'),
+            service_limits=settings.get('service-limits'),
+            company_limit=settings.get('company-limit'),
+            company_rate=settings.get('company-rate'),
+            company_burst=settings.get('company-burst'),
+            priority_methods=settings.get('priority-methods'))
+
+    def acquire(self, method_name: str, company_id=None):
+        """Try to take a slot for an RPC
+
+        Args:
+            method_name (str): Full grpc method name
+            company_id (str, optional): Company of the caller
+
+        Returns:
+            tuple: (slot, reason), slot is None and reason says which limit was hit if rejected
+        """
+        if method_name in self.priority_methods:
+            # Priority lane, uses the workers left over by max-in-flight
+            return (), None
+
+        service = method_name.strip('/').split('/')[0]
+        limits = [('all', self.max_in_flight), (service, self.service_limits.get(service))]
+        if company_id:
+            limits.append((f'company:{company_id}', self.company_limit))
+
+        with self._lock:
+            for key, limit in limits:
+                if limit is not None and self._in_flight.get(key, 0) >= limit:
+                    return None, 'server' if key == 'all' else 'company' if key.startswith('company:') else 'service'
+
+            if company_id and self.company_rate:
+                bucket = self._buckets.get(company_id)
+                if bucket is None:
+                    bucket = self._buckets[company_id] = TokenBucket(self.company_rate, self.company_burst)
+                if not bucket.take():
+                    return None, 'rate'
+
+            slot = tuple(key for key, _ in limits)
+            for key in slot:
+                self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        return slot, None
+
+    def release(self, slot):
+        with self._lock:
+            for key in slot:
+                count = self._in_flight.get(key, 0) - 1
+                if count > 0:
+                    self._in_flight[key] = count
+                else:
+                    self._in_flight.pop(key, None)
+
+    def in_flight(self) -> dict:
+        with self._lock:
+            return dict(self._in_flight)
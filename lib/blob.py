@@ -0,0 +1,114 @@
+import zlib
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+from lib.migration import resumable_batches
+
+# Codec byte at the start of a stored blob. A serialized message can't
+# start with a byte below 8, that would be field number 0, so blobs
+# written before there was an envelope are told apart by their first byte
+RAW = 0
+ZLIB = 1
+LZMA = 2
+
+CODECS = {'raw': RAW, 'zlib': ZLIB, 'lzma': LZMA}
+
+# Used for blobs written by the servicers. zlib decodes about eight times
+# faster than LZMA for somewhat less compression, see utils.blob_benchmark
+CODEC = ZLIB
+
+# Collections whose documents keep their message encoded in bin
+COLLECTIONS = ['shoeTrialResults', 'metricMappings']
+
+RECOMPRESS_SETTING = 'blob_recompress'
+
+
+def _compress(data: bytes, codec: int) -> bytes:
+    if codec == ZLIB:
+        return zlib.compress(data)
+    if codec == LZMA:
+        import lzma
+        return lzma.compress(data, format=lzma.FORMAT_RAW, filters=[{'id': lzma.FILTER_LZMA2}])
+    if codec == RAW:
+        return data
+    raise ValueError(f'Unknown blob codec {codec}')
+
+
+def encode_blob(data: bytes, codec=CODEC) -> bytes:
+    """Wrap a serialized message in the stored blob envelope
+
+    Stored uncompressed if compressing doesn't make it smaller.
+
+    Args:
+        data (bytes): Serialized message
+        codec (int, optional): RAW, ZLIB or LZMA
+
+    Returns:
+        bytes: Codec byte followed by the compressed message
+    """
+    compressed = _compress(data, codec)
+    if codec != RAW and len(compressed) >= len(data):
+        codec, compressed = RAW, data
+    return bytes((codec,)) + compressed
+
+
+def blob_codec(blob: bytes):
+    """The codec of a stored blob, None if it was written before the envelope"""
+    if blob and blob[0] < 8:
+        return blob[0]
+    return None
+
+
+def decode_blob(blob: bytes) -> bytes:
+    """The serialized message in a stored blob, whether or not it has the envelope
+
+    Args:
+        blob (bytes): bin of a stored document
+
+    Returns:
+        bytes: Serialized message
+    """
+    codec = blob_codec(blob)
+    if codec is None:
+        return blob
+    if codec == RAW:
+        return blob[1:]
+    if codec == ZLIB:
+        return zlib.decompress(blob[1:])
+    if codec == LZMA:
+        import lzma
+        return lzma.decompress(blob[1:], format=lzma.FORMAT_RAW, filters=[{'id': lzma.FILTER_LZMA2}])
+    raise ValueError(f'Unknown blob codec {codec}')
+
+
+def recompress_blobs(db: Database, collection: str, codec=CODEC, batch_size=100, max_batches=None, restart=False) -> int:
+    """Rewrite the bin of every document of a collection with a codec
+
+    Keeps a separate position for each codec. Documents whose bin already
+    uses the codec are left alone.
+
+    Args:
+        db (Database): Database
+        collection (str): One of COLLECTIONS
+        codec (int, optional): RAW, ZLIB or LZMA
+        batch_size (int, optional): Documents per batch
+        max_batches (int, optional): Stop after this many batches, None to run to the end
+        restart (bool, optional): Start again from the first document
+
+    Returns:
+        int: Number of documents looked at, 0 once there are none left
+    """
+    done = 0
+    for results in resumable_batches(db, collection, f'{RECOMPRESS_SETTING}_{collection}_{codec}', projection={'bin': 1},
+                                     batch_size=batch_size, max_batches=max_batches, restart=restart):
+        requests = []
+        for x in results:
+            if x.get('bin') is None or blob_codec(x['bin']) == codec:
+                continue
+            blob = encode_blob(decode_blob(x['bin']), codec)
+            # Only if bin hasn't been rewritten since it was read
+            requests.append(UpdateOne({'_id': x['_id'], 'bin': x['bin']}, {'$set': {'bin': blob}}))
+        if requests:
+            db[collection].bulk_write(requests, ordered=False)
+        done += len(results)
+    return done
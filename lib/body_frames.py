@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import TYPE_CHECKING
+
+import proto.messages_pb2 as messages_pb2
+
+# numpy is imported by the functions that use it, so the server doesn't load
+# it on start, only once the first payload is packed or unpacked
+if TYPE_CHECKING:
+    import numpy as np
+
+# How getShoeTrialResultPayload sends body_frames, from CMSQuery.int_query
+CLASSIC = 0
+PACKED = 1
+PACKED_QUANTIZED = 2
+
+# Largest error of the values packed by PACKED_QUANTIZED. Positions and
+# com_offset are in mm, quaternion components are between -1 and 1
+POSITION_TOLERANCE = 0.05
+QUATERNION_TOLERANCE = 0.0001
+
+# Every BoneData of a BodyFrame, lower_spine to centre_of_mass
+BONES = [x.name for x in messages_pb2.BodyFrame.DESCRIPTOR.fields if x.message_type is not None]
+
+_VERSION = 1
+_HEADER = struct.Struct('<Bdd')
+_ARRAY = struct.Struct('<2sB')
+
+
+def _delta(values: np.ndarray) -> np.ndarray:
+    import numpy as np
+    # Along time, the last axis. Wraps around for unsigned ints, so undone exactly by _undelta
+    if values.shape[-1] == 0:
+        return values
+    return np.concatenate([values[..., :1], np.diff(values, axis=-1)], axis=-1)
+
+
+def _undelta(values: np.ndarray, dtype) -> np.ndarray:
+    import numpy as np
+    return np.cumsum(values, axis=-1, dtype=dtype)
+
+
+def _encode_floats(values: np.ndarray, tolerance: float) -> np.ndarray:
+    """Delta encode float32 values along their last axis
+
+    With a tolerance they are rounded to multiples of twice the tolerance
+    and the differences of those counted in the smallest int that holds
+    them, int16 for anything moving smoothly. Without, or if the values
+    can't be rounded, the differences are of the float32 bit patterns.
+    """
+    import numpy as np
+    if tolerance > 0 and np.isfinite(values).all():
+        steps = np.rint(values.astype(np.float64) / (2 * tolerance))
+        if np.abs(steps).max(initial=0) < 2 ** 62:
+            deltas = _delta(steps.astype(np.int64))
+            for dtype in (np.int16, np.int32):
+                info = np.iinfo(dtype)
+                if deltas.size == 0 or (deltas.min() >= info.min and deltas.max() <= info.max):
+                    return deltas.astype(dtype)
+            return deltas
+    return _delta(values.astype(np.float32).view(np.uint32))
+
+
+def _decode_floats(values: np.ndarray, tolerance: float) -> np.ndarray:
+    import numpy as np
+    if values.dtype.kind == 'u':
+        return _undelta(values, np.uint32).view(np.float32)
+    return (_undelta(values, np.int64) * (2 * tolerance)).astype(np.float32)
+
+
+def _write_array(out: list, values: np.ndarray):
+    import numpy as np
+    # Each byte of the items written together, the high bytes of small
+    # numbers are all zeros and compress to almost nothing
+    values = np.ascontiguousarray(values, values.dtype.newbyteorder('<'))
+    out.append(_ARRAY.pack(values.dtype.str[1:].encode(), values.ndim))
+    out.append(struct.pack(f'<{values.ndim}I', *values.shape))
+    out.append(values.reshape(-1).view(np.uint8).reshape(-1, values.itemsize).T.tobytes())
+
+
+def _read_array(data: memoryview, offset: int):
+    import numpy as np
+    char, ndim = _ARRAY.unpack_from(data, offset)
+    offset += _ARRAY.size
+    shape = struct.unpack_from(f'<{ndim}I', data, offset)
+    offset += 4 * ndim
+    dtype = np.dtype('<' + char.decode())
+    size = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    shuffled = np.frombuffer(data, np.uint8, size, offset).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(shuffled.T).view(dtype).reshape(shape), offset + size
+
+
+def _bone(frame, name):
+    return getattr(frame, name) if frame.HasField(name) else None
+
+
+def _columns(frames, position_tolerance, quaternion_tolerance) -> list:
+    """The arrays of a list of BodyFrames, each with time along its last axis"""
+    import numpy as np
+    bones = [[_bone(frame, name) for name in BONES] for frame in frames]
+    quaternions = [[list(x.quaternion) if x is not None else [] for x in frame] for frame in bones]
+    com_offsets = [list(frame.com_offset) for frame in frames]
+    width = max((len(x) for frame in quaternions for x in frame), default=0)
+    com_width = max(map(len, com_offsets), default=0)
+
+    quaternion_values = np.zeros((len(frames), len(BONES), width), np.float32)
+    for i, frame in enumerate(quaternions):
+        for j, x in enumerate(frame):
+            quaternion_values[i, j, :len(x)] = x
+    com_values = np.zeros((len(frames), com_width), np.float32)
+    for i, x in enumerate(com_offsets):
+        com_values[i, :len(x)] = x
+    positions = np.array(
+        [[(x.x_pos, x.y_pos, x.z_pos) if x is not None else (0, 0, 0) for x in frame] for frame in bones],
+        np.float32).reshape(len(frames), len(BONES), 3)
+
+    return [
+        _delta(np.array([x.micros for x in frames], np.int64)),
+        _encode_floats(np.array([x.stride_index for x in frames], np.float32), 0),
+        np.packbits(np.array([[x is not None for x in frame] for frame in bones], bool).T, axis=-1),
+        np.array([[len(x) for x in frame] for frame in quaternions], np.uint16).reshape(len(frames), len(BONES)).T,
+        np.array(list(map(len, com_offsets)), np.uint16),
+        _encode_floats(positions.transpose(1, 2, 0), position_tolerance),
+        _encode_floats(quaternion_values.transpose(1, 2, 0), quaternion_tolerance),
+        _encode_floats(com_values.T, position_tolerance)]
+
+
+def _frames(columns: list, frames, position_tolerance, quaternion_tolerance):
+    """Add the BodyFrames of the arrays from _columns to a repeated field"""
+    import numpy as np
+    micros, stride_index, present, quaternion_lengths, com_lengths, positions, quaternions, com_values = columns
+    count = len(micros)
+    micros = _undelta(micros, np.int64).tolist()
+    stride_index = _decode_floats(stride_index, 0).tolist()
+    present = np.unpackbits(present, axis=-1, count=count).astype(bool).T.tolist()
+    quaternion_lengths = quaternion_lengths.T.tolist()
+    com_lengths = com_lengths.tolist()
+    positions = _decode_floats(positions, position_tolerance).transpose(2, 0, 1).tolist()
+    quaternions = _decode_floats(quaternions, quaternion_tolerance).transpose(2, 0, 1).tolist()
+    com_values = _decode_floats(com_values, position_tolerance).T.tolist()
+
+    for i in range(count):
+        frame = frames.add(micros=micros[i], stride_index=stride_index[i])
+        frame.com_offset.extend(com_values[i][:com_lengths[i]])
+        for j, name in enumerate(BONES):
+            if not present[i][j]:
+                continue
+            bone = getattr(frame, name)
+            bone.SetInParent()
+            bone.x_pos, bone.y_pos, bone.z_pos = positions[i][j]
+            bone.quaternion.extend(quaternions[i][j][:quaternion_lengths[i][j]])
+
+
+def pack_body_frames(msg: messages_pb2.BodyFramesMsg, position_tolerance=0, quaternion_tolerance=0) -> bytes:
+    """Pack the frames and avg_stride_frames of a BodyFramesMsg into packed_frames
+
+    Every value of a bone across the frames is kept together in time order
+    and stored as its difference from the one before, the columns then
+    compressed with zlib. With tolerances of 0 it unpacks to the same
+    frames, otherwise positions and quaternions come back within their
+    tolerance, plus float32 rounding, in about half the space.
+
+    Args:
+        msg (BodyFramesMsg): Frames to pack, packed_frames is ignored
+        position_tolerance (float, optional): Largest error of positions and com_offset, 0 for none
+        quaternion_tolerance (float, optional): Largest error of quaternion components, 0 for none
+
+    Returns:
+        bytes: Value for packed_frames
+    """
+    out = [_HEADER.pack(_VERSION, position_tolerance, quaternion_tolerance)]
+    for frames in (msg.frames, msg.avg_stride_frames):
+        for values in _columns(frames, position_tolerance, quaternion_tolerance):
+            _write_array(out, values)
+    return zlib.compress(b''.join(out))
+
+
+def unpack_body_frames(data: bytes) -> messages_pb2.BodyFramesMsg:
+    """The BodyFramesMsg packed by pack_body_frames, with frames and avg_stride_frames
+
+    Args:
+        data (bytes): packed_frames
+
+    Returns:
+        BodyFramesMsg: Frames, without packed_frames
+    """
+    data = memoryview(zlib.decompress(data))
+    version, position_tolerance, quaternion_tolerance = _HEADER.unpack_from(data)
+    if version != _VERSION:
+        raise ValueError(f'Unknown packed_frames version {version}')
+    offset = _HEADER.size
+    msg = messages_pb2.BodyFramesMsg()
+    for frames in (msg.frames, msg.avg_stride_frames):
+        columns = []
+        for _ in range(8):
+            values, offset = _read_array(data, offset)
+            columns.append(values)
+        _frames(columns, frames, position_tolerance, quaternion_tolerance)
+    return msg
+
+
+def encode_body_frames(msg: messages_pb2.BodyFramesMsg, encoding=PACKED) -> messages_pb2.BodyFramesMsg:
+    """A BodyFramesMsg as CLASSIC frames, PACKED or PACKED_QUANTIZED packed_frames
+
+    Args:
+        msg (BodyFramesMsg): Frames, classic or packed
+        encoding (int, optional): CLASSIC, PACKED or PACKED_QUANTIZED
+
+    Returns:
+        BodyFramesMsg: msg if it is already encoded that way, otherwise a new one
+    """
+    packed = bool(msg.packed_frames)
+    if encoding == CLASSIC:
+        return unpack_body_frames(msg.packed_frames) if packed else msg
+    if encoding == PACKED and packed:
+        return msg
+    if packed:
+        msg = unpack_body_frames(msg.packed_frames)
+    tolerances = (POSITION_TOLERANCE, QUATERNION_TOLERANCE) if encoding == PACKED_QUANTIZED else (0, 0)
+    return messages_pb2.BodyFramesMsg(packed_frames=pack_body_frames(msg, *tolerances))
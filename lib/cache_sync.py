@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from threading import Lock
+import logging
+import time
+
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = 'cacheInvalidations'
+
+# Invalidations committed this long before the latest one already seen are
+# still looked for, so a slow write or some clock skew doesn't hide them
+MARGIN = timedelta(seconds=5)
+
+
+class CacheSync():
+    """Passes cache invalidations between the server processes through Mongo
+
+    Every invalidation bumps the version of a document in cacheInvalidations.
+    Before serving from a cache, a process reads the documents bumped since
+    it last looked, at most every interval seconds, and drops the entries the
+    other processes invalidated. A write through any process is seen by all
+    of them within the interval rather than the cache's ttl. Off until
+    configured with a database, a single process needs nothing more than
+    its own invalidations.
+    """
+
+    def __init__(self):
+        self.collection = None
+        self.interval = 1
+        self._handlers = {}
+        self._versions = {}
+        self._since = None
+        self._next_poll = 0
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.collection is not None
+
+    def configure(self, db: Database, interval=1):
+        """Start sharing invalidations
+
+        Args:
+            db (Database): Database the processes share, None to stop
+            interval (float, optional): Most seconds an invalidation from another process goes unseen
+        """
+        with self._lock:
+            self.collection = db[COLLECTION] if db is not None else None
+            self.interval = interval
+            self._versions = {}
+            # Anything older was invalidated before this process cached it
+            self._since = datetime.utcnow()
+            self._next_poll = 0
+
+    def subscribe(self, kind: str, handler):
+        """Drop local entries when any process publishes an invalidation
+
+        Args:
+            kind (str): Kind of invalidation
+            handler (callable): Called with the arguments it was published with
+        """
+        self._handlers[kind] = handler
+
+    def publish(self, kind: str, *args):
+        """Tell the other processes about an invalidation already made locally
+
+        Args:
+            kind (str): Kind of invalidation, one with a handler
+            *args (str|None): Arguments for the handler
+        """
+        if not self.enabled:
+            return
+        key = ':'.join([kind] + ['*' if x is None else str(x) for x in args])
+        self.collection.update_one({'_id': key}, {
+            '$set': {'kind': kind, 'args': [None if x is None else str(x) for x in args]},
+            '$inc': {'version': 1},
+            '$currentDate': {'updated': True}}, upsert=True)
+
+    def poll(self):
+        """Apply the invalidations published since the last poll, if one is due"""
+        if not self.enabled or time.monotonic() < self._next_poll:
+            return
+        # Another thread is already polling, no need to wait for it
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_poll = time.monotonic() + self.interval
+            for x in self.collection.find({'updated': {'$gte': self._since - MARGIN}}):
+                if self._versions.get(x['_id']) == x['version']:
+                    continue
+                self._versions[x['_id']] = x['version']
+                self._since = max(self._since, x['updated'])
+                handler = self._handlers.get(x['kind'])
+                if handler is not None:
+                    handler(*x['args'])
+        except PyMongoError:
+            logger.exception('Could not read cache invalidations')
+        finally:
+            self._lock.release()
+
+
+# Shared by the principal and count caches
+cache_sync = CacheSync()
@@ -0,0 +1,200 @@
+from threading import Lock
+import json
+import time
+
+from lib.cache_sync import cache_sync
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure
+
+# Indexes the schema files create that are worth hinting a count with, most selective first
+HINTS = {
+    'shoeTrialResults': [
+        [('customer_id', 1), ('created', 1), ('_id', 1)],
+        [('technician_id', 1), ('recording_date', 1)],
+        [('branch_id', 1), ('recording_date', 1)],
+        [('company_id', 1), ('recording_date', 1)],
+        [('created', 1)]
+    ],
+    'customers': [[('email', 1)], [('company_id', 1), ('updated', 1), ('_id', 1)], [('updated', 1)]],
+    'users': [[('email', 1)], [('company_id', 1)]],
+    'shoes': [[('ean', 1)], [('branches', 1)]],
+    'companies': [[('name', 1)]]
+}
+
+
+def index_hint(collection_name: str, query: dict):
+    """Pick the index to count a query with, one whose leading key the query filters on
+
+    Args:
+        collection_name (str): Name of the collection
+        query (dict): Query being counted
+
+    Returns:
+        list: Index keys or None to leave it to the planner
+    """
+    for keys in HINTS.get(collection_name, []):
+        if keys[0][0] in query:
+            return keys
+    return None
+
+
+def count_exact(collection: Collection, query: dict) -> int:
+    """Exact count of the documents matching a query
+
+    Args:
+        collection (Collection): Collection to count
+        query (dict): Query
+
+    Returns:
+        int: Number of matching documents
+    """
+    hint = index_hint(collection.name, query)
+    if hint is None:
+        return collection.count_documents(query)
+    try:
+        return collection.count_documents(query, hint=hint)
+    except OperationFailure:
+        # The schema update adding the index hasn't run on this database
+        return collection.count_documents(query)
+
+
+def exists(collection: Collection, query: dict) -> bool:
+    """Whether anything matches a query, stops at the first match rather than counting them all
+
+    Args:
+        collection (Collection): Collection to look in
+        query (dict): Query
+
+    Returns:
+        bool: True if at least one document matches
+    """
+    return collection.find_one(query, {'_id': 1}) is not None
+
+
+class CountCache():
+    """Per-tenant totals for counts with no filters other than the caller's company
+
+    Writes through the servicers invalidate the tenant's entries, in every
+    server process through cache_sync. Writes from anywhere else, scripts
+    or the shell, are only picked up when the entry expires. A ttl of 0
+    turns the cache off.
+    """
+
+    def __init__(self, ttl=0):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = Lock()
+
+    def configure(self, ttl=None):
+        """Change the entry lifetime
+
+        Args:
+            ttl (int, optional): Seconds a total stays valid, 0 to not cache
+        """
+        with self._lock:
+            if ttl is not None:
+                self.ttl = ttl
+            self._entries = {}
+
+    def count(self, collection: Collection, query: dict, tenant='') -> int:
+        """Total for a tenant, from the cache when there is a fresh one
+
+        Args:
+            collection (Collection): Collection to count
+            query (dict): Query, must only restrict to the tenant
+            tenant (str, optional): company_id the query is restricted to, '' for all companies
+
+        Returns:
+            int: Number of matching documents
+        """
+        count = self.get(collection, query, tenant)
+        if count is None:
+            count = count_exact(collection, query)
+            self.put(collection, query, count, tenant)
+        return count
+
+    def get(self, collection: Collection, query, tenant=''):
+        """Cached total of a query or pipeline
+
+        Args:
+            collection (Collection): Collection the total is of
+            query (dict|list): Query or pipeline stages the total was counted with
+            tenant (str, optional): company_id the query is restricted to, '' for all companies
+
+        Returns:
+            int: Total or None if there isn't a fresh one
+        """
+        if not self.ttl:
+            return None
+        cache_sync.poll()
+        key = self._key(collection, query, tenant)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return None
+
+    def put(self, collection: Collection, query, count: int, tenant='', depends=()):
+        """Cache a total
+
+        Args:
+            collection (Collection): Collection the total is of
+            query (dict|list): Query or pipeline stages the total was counted with
+            count (int): Total
+            tenant (str, optional): company_id the query is restricted to, '' for all companies
+            depends (list, optional): Other collections the query reads, writes to them drop the total too
+        """
+        if not self.ttl:
+            return
+        key = self._key(collection, query, tenant)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, count, {collection.name, *depends})
+
+    def _key(self, collection, query, tenant):
+        return (collection.full_name, str(tenant or ''), json.dumps(query, sort_keys=True, default=str))
+
+    def invalidate(self, collection_name: str, tenant=None):
+        """Drop cached totals after a write
+
+        Args:
+            collection_name (str): Name of the collection written to
+            tenant (str, optional): company_id written to, None for every company
+        """
+        self.drop(collection_name, tenant)
+        cache_sync.publish('count', collection_name, tenant)
+
+    def drop(self, collection_name: str, tenant=None):
+        # Only in this process
+        tenants = None if tenant is None else {str(tenant), ''}
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if collection_name in entry[2] and (tenants is None or key[1] in tenants):
+                    del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+count_cache = CountCache()
+cache_sync.subscribe('count', count_cache.drop)
+
+
+def count_total(collection: Collection, query: dict, tenant_field='company_id') -> int:
+    """Count for a count RPC, cached when the query only restricts to the caller's company and exact otherwise
+
+    Args:
+        collection (Collection): Collection to count
+        query (dict): Query
+        tenant_field (str, optional): Field the query is restricted to the caller's company by
+
+    Returns:
+        int: Number of matching documents
+    """
+    if set(query) <= {tenant_field}:
+        return count_cache.count(collection, query, query.get(tenant_field, ''))
+    return count_exact(collection, query)
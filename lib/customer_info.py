@@ -0,0 +1,68 @@
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.database import Database
+from lib.migration import resumable_batches
+
+# Customer fields the reports filter and group on, copied onto each of their shoeTrialResults
+FIELDS = ['gender', 'date_of_birth', 'branch_id']
+
+BACKFILL_SETTING = 'customer_info_backfill'
+
+
+def customer_info(customer) -> dict:
+    """The copy of a customer kept on their shoeTrialResults as customer_info
+
+    Args:
+        customer (dict): customers document, or the data being saved by setCustomer
+
+    Returns:
+        dict: customer_info sub document
+    """
+    return {field: customer.get(field) for field in FIELDS}
+
+
+def sync_customer_info(db: Database, customer_id, customer) -> int:
+    """Update the copy of a customer on all of their shoeTrialResults
+
+    Args:
+        db (Database): Database
+        customer_id (ObjectId|str): _id of the customer
+        customer (dict): Customer as saved
+
+    Returns:
+        int: Number of shoeTrialResults updated
+    """
+    res = db.shoeTrialResults.update_many(
+        {'customer_id': str(customer_id)}, {'$set': {'customer_info': customer_info(customer)}})
+    return res.modified_count
+
+
+def backfill_customer_info(db: Database, batch_size=1000, max_batches=None, restart=False) -> int:
+    """Set customer_info on the shoeTrialResults saved before it existed
+
+    Reads the customers of a whole batch of trials with one find.
+
+    Args:
+        db (Database): Database
+        batch_size (int, optional): shoeTrialResults per batch
+        max_batches (int, optional): Stop after this many batches, None to run to the end
+        restart (bool, optional): Look again from the first trial
+
+    Returns:
+        int: Number of shoeTrialResults updated
+    """
+    updated = 0
+    for results in resumable_batches(db, 'shoeTrialResults', BACKFILL_SETTING, {'customer_info': {'$exists': False}},
+                                     {'customer_id': 1}, batch_size, max_batches, restart):
+        customer_ids = set()
+        for x in results:
+            if ObjectId.is_valid(x.get('customer_id')):
+                customer_ids.add(ObjectId(x['customer_id']))
+        customers = {
+            str(x['_id']): x for x in db.customers.find({'_id': {'$in': list(customer_ids)}}, {field: 1 for field in FIELDS})}
+        # Trials whose customer has gone still get an empty copy so they aren't looked at again
+        requests = [
+            UpdateOne({'_id': x['_id']}, {'$set': {'customer_info': customer_info(customers.get(x.get('customer_id'), {}))}})
+            for x in results]
+        updated += db.shoeTrialResults.bulk_write(requests, ordered=False).modified_count
+    return updated
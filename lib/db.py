@@ -1,27 +1,173 @@
 from pymongo import MongoClient
+from pymongo.collection import Collection
+from pymongo.database import Database
+from lib.query_log import QueryLog
+from lib.request_context import ReadCounter, current_request_context
+
+# Each profile gets its own client, so its own connection pool. Reports can
+# then queue on the analytics pool without taking connections from device uploads.
+PROFILES = {
+    'ingest': {'pool-size': 20, 'read-preference': 'primary', 'read-concern': 'local', 'max-time-ms': None},
+    'interactive': {'pool-size': 40, 'read-preference': 'primary', 'read-concern': 'local', 'max-time-ms': 15000},
+    'analytics': {'pool-size': 10, 'read-preference': 'secondaryPreferred', 'read-concern': 'local', 'max-time-ms': 120000}
+}
+DEFAULT_PROFILE = 'interactive'
+
+
+def db_profiles(config) -> dict:
+    """Get the workload profiles with the 'db-profiles' section of the config laid over the defaults
+
+    Args:
+        config (dict): Server config
+
+    Returns:
+        dict: Profile name -> settings
+    """
+    profiles = {name: dict(profile) for name, profile in PROFILES.items()}
+    for name, profile in (config.get('db-profiles') or {}).items():
+        profiles.setdefault(name, dict(PROFILES[DEFAULT_PROFILE])).update(profile)
+    return profiles
+
+
+def client_options(profile) -> dict:
+    """MongoClient keyword arguments for a workload profile
+
+    Args:
+        profile (dict): Profile settings
+
+    Returns:
+        dict: Client options
+    """
+    return {
+        'maxPoolSize': profile['pool-size'],
+        'readPreference': profile['read-preference'],
+        'readConcernLevel': profile['read-concern']
+    }
+
+
+def _cap_to_deadline(kwargs, key, default=None):
+    if kwargs.get(key) is None and default is not None:
+        kwargs[key] = default
+    # Reads issued while serving an RPC shouldn't outlive the client waiting for them
+    request_context = current_request_context()
+    if request_context is None:
+        return
+    remaining = request_context.max_time_ms()
+    if remaining is None:
+        return
+    if kwargs.get(key) is None or kwargs[key] > remaining:
+        kwargs[key] = remaining
+
+
+def deadline_kwargs(request_context, key='maxTimeMS') -> dict:
+    """maxTimeMS keyword argument for a query made on behalf of an RPC, for drivers other than DeadlineCollection
+
+    Args:
+        request_context (RequestContext): Context of the RPC
+        key (str, optional): Name of the argument, 'max_time_ms' for find
+
+    Returns:
+        dict: {key: remaining ms} or empty if the RPC has no deadline
+    """
+    remaining = request_context.max_time_ms() if request_context is not None else None
+    return {key: remaining} if remaining is not None else {}
+
+
+class DeadlineCollection(Collection):
+    """Collection that sets maxTimeMS on reads from its profile's default and the deadline of the RPC being served"""
+
+    def find(self, *args, **kwargs):
+        _cap_to_deadline(kwargs, 'max_time_ms', self.database.max_time_ms)
+        return super().find(*args, **kwargs)
+
+    def aggregate(self, pipeline, session=None, **kwargs):
+        _cap_to_deadline(kwargs, 'maxTimeMS', self.database.max_time_ms)
+        return super().aggregate(pipeline, session, **kwargs)
+
+    def count_documents(self, filter, session=None, **kwargs):
+        _cap_to_deadline(kwargs, 'maxTimeMS', self.database.max_time_ms)
+        return super().count_documents(filter, session, **kwargs)
+
+    def count(self, filter=None, session=None, **kwargs):
+        _cap_to_deadline(kwargs, 'maxTimeMS', self.database.max_time_ms)
+        return super().count(filter, session, **kwargs)
+
+    def distinct(self, key, filter=None, session=None, **kwargs):
+        _cap_to_deadline(kwargs, 'maxTimeMS', self.database.max_time_ms)
+        return super().distinct(key, filter, session, **kwargs)
+
+
+class DeadlineDatabase(Database):
+    def __init__(self, client, name, *args, max_time_ms=None, **kwargs):
+        super().__init__(client, name, *args, **kwargs)
+        # Default maxTimeMS for reads, from the workload profile
+        self.max_time_ms = max_time_ms
+
+    def __getitem__(self, name):
+        return DeadlineCollection(self, name)
+
+    def get_collection(self, name, codec_options=None, read_preference=None, write_concern=None, read_concern=None):
+        return DeadlineCollection(self, name, False, codec_options, read_preference, write_concern, read_concern)
 
 
 class Db(object):
+    """Mongo clients for the workload profiles
 
-    def __init__(self, host):
+    Args:
+        host (str): Mongo host
+        profiles (dict, optional): Workload profiles, see db_profiles
+        query_log (dict, optional): 'query-log' settings for the slow query log
+    """
+
+    def __init__(self, host, profiles=None, query_log=None):
         self.host = host
+        self.profiles = profiles or PROFILES
+        self.query_log = query_log or {}
+        self._clients = {}
         self.connect()
 
-    def connected(self):
-        return hasattr(self, "_connection") and self._connection
+    def connected(self, profile=DEFAULT_PROFILE):
+        return self._clients.get(profile)
 
-    def connect(self):
+    def connect(self, profile=DEFAULT_PROFILE):
         # Already connected?
-        if self.connected():
+        if self.connected(profile):
             return
         try:
-            self._connection = MongoClient(
+            query_log = QueryLog.from_config({'query-log': self.query_log})
+            self._clients[profile] = MongoClient(
                 "mongodb://{}".format(self.host),
-                connect=False)
+                connect=False,
+                event_listeners=[ReadCounter(), query_log],
+                **client_options(self.profiles[profile]))
+            # Slow commands are explained on the client that ran them
+            query_log.client = self._clients[profile]
         except:
-            self._connection = None
+            self._clients[profile] = None
+
+    def close(self):
+        for client in self._clients.values():
+            if client:
+                client.close()
+        self._clients = {}
 
     # Return our database instance
-    def get_database(self, dbname):
-        self.connect()
-        return self._connection[dbname]
\ No newline at end of file
+    def get_database(self, dbname, profile=DEFAULT_PROFILE):
+        self.connect(profile)
+        return DeadlineDatabase(self._clients[profile], dbname, max_time_ms=self.profiles[profile]['max-time-ms'])
+
+
+class AioDb(Db):
+    """Db for the grpc.aio server, backed by motor"""
+
+    def connect(self, profile=DEFAULT_PROFILE):
+        if self.connected(profile):
+            return
+        # Only the aio server needs motor, so it's imported here rather than for everyone
+        from motor.motor_asyncio import AsyncIOMotorClient
+        self._clients[profile] = AsyncIOMotorClient(
+            "mongodb://{}".format(self.host), connect=False, **client_options(self.profiles[profile]))
+
+    def get_database(self, dbname, profile=DEFAULT_PROFILE):
+        self.connect(profile)
+        return self._clients[profile][dbname]
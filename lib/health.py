@@ -0,0 +1,64 @@
+from threading import Event, Thread
+import logging
+
+from grpc_health.v1 import health, health_pb2
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+SERVING = health_pb2.HealthCheckResponse.SERVING
+NOT_SERVING = health_pb2.HealthCheckResponse.NOT_SERVING
+
+
+class HealthMonitor():
+    """Keeps the grpc.health.v1 statuses in line with Mongo's reachability and whether we are draining
+
+    Args:
+        database (Database): Database to ping
+        services (list): Full names of the services to report on, '' (the whole server) is always included
+        interval (float, optional): Seconds between Mongo pings
+    """
+
+    def __init__(self, database, services, interval=5):
+        self.database = database
+        self.services = [''] + list(services)
+        self.interval = interval
+        self.servicer = health.HealthServicer()
+        self.draining = False
+        self.mongo_ok = None
+        self._stop = Event()
+
+    def check(self):
+        """Ping Mongo and update the reported status
+
+        Returns:
+            int: Status now reported for the server
+        """
+        try:
+            self.database.client.admin.command('ping')
+            mongo_ok = True
+        except PyMongoError as e:
+            mongo_ok = False
+            if self.mongo_ok is not False:
+                logger.error('Mongo unreachable, reporting NOT_SERVING: %s', e)
+        self.mongo_ok = mongo_ok
+        status = SERVING if mongo_ok and not self.draining else NOT_SERVING
+        if not self.draining:
+            for service in self.services:
+                self.servicer.set(service, status)
+        return status
+
+    def start(self):
+        self.check()
+        Thread(target=self._run, name='health-monitor', daemon=True).start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def drain(self):
+        """Report NOT_SERVING for good so load balancers stop sending new RPCs"""
+        self.draining = True
+        self._stop.set()
+        # Also ends any Watch streams, which would otherwise hold up the drain
+        self.servicer.enter_graceful_shutdown()
@@ -0,0 +1,152 @@
+from bson import ObjectId
+from pymongo import DESCENDING, UpdateOne
+from pymongo.database import Database
+from lib.migration import resumable_batches
+
+# Fields of a customer's most recent shoeTrialResult kept on the customer as latest_trial
+FIELDS = ['recording_date', 'shoe_name', 'shoe_brand', 'shoe_size', 'shoe_season']
+
+REBUILD_SETTING = 'latest_trial_rebuild'
+
+
+def latest_trial(trial) -> dict:
+    """The summary of a trial kept on its customer as latest_trial
+
+    Args:
+        trial (dict): shoeTrialResults document
+
+    Returns:
+        dict: latest_trial sub document, recording_id is the trial's _id
+    """
+    summary = {'recording_id': trial['_id']}
+    summary.update({field: trial.get(field) for field in FIELDS})
+    return summary
+
+
+def _customer_object_id(customer_id):
+    if isinstance(customer_id, ObjectId):
+        return customer_id
+    return ObjectId(customer_id) if ObjectId.is_valid(customer_id) else None
+
+
+def trial_saved(db: Database, trial) -> bool:
+    """Make a new trial its customer's latest_trial if nothing more recent is
+
+    A single conditional update, so concurrent saves for the same customer
+    leave the most recent in place whatever order they land in.
+
+    Args:
+        db (Database): Database
+        trial (dict): shoeTrialResults document as saved, with its _id
+
+    Returns:
+        bool: True if it became the latest_trial
+    """
+    customer_id = _customer_object_id(trial.get('customer_id'))
+    if customer_id is None:
+        return False
+    res = db.customers.update_one(
+        {'_id': customer_id, '$or': [
+            {'latest_trial': {'$exists': False}},
+            {'latest_trial.recording_date': {'$lte': trial.get('recording_date')}}]},
+        {'$set': {'latest_trial': latest_trial(trial)}})
+    return bool(res.modified_count)
+
+
+def trial_deleted(db: Database, trial) -> bool:
+    """Replace a customer's latest_trial if it was the trial just deleted
+
+    Args:
+        db (Database): Database
+        trial (dict): Deleted shoeTrialResults document, needs _id and customer_id
+
+    Returns:
+        bool: True if the latest_trial changed
+    """
+    customer_id = _customer_object_id(trial.get('customer_id'))
+    if customer_id is None:
+        return False
+    return refresh_latest_trial(db, customer_id, replacing=trial['_id'])
+
+
+def refresh_latest_trial(db: Database, customer_id, replacing=None) -> bool:
+    """Set a customer's latest_trial from their shoeTrialResults
+
+    Args:
+        db (Database): Database
+        customer_id (ObjectId|str): _id of the customer
+        replacing (ObjectId, optional): Only update if latest_trial is still this trial
+
+    Returns:
+        bool: True if the latest_trial changed
+    """
+    customer_id = _customer_object_id(customer_id)
+    if customer_id is None:
+        return False
+    latest = db.shoeTrialResults.find_one(
+        {'customer_id': str(customer_id)}, {field: 1 for field in FIELDS},
+        sort=[('recording_date', DESCENDING)])
+    query = {'_id': customer_id}
+    if replacing is not None:
+        # A save that landed in the meantime has already moved it on
+        query['latest_trial.recording_id'] = replacing
+    if latest is None:
+        update = {'$unset': {'latest_trial': ''}}
+    else:
+        update = {'$set': {'latest_trial': latest_trial(latest)}}
+    return bool(db.customers.update_one(query, update).modified_count)
+
+
+def _unchanged(customer) -> dict:
+    # Query for a customer whose latest_trial is still the one read
+    if 'latest_trial' not in customer:
+        return {'_id': customer['_id'], 'latest_trial': {'$exists': False}}
+    return {'_id': customer['_id'], 'latest_trial.recording_id': customer['latest_trial'].get('recording_id')}
+
+
+def rebuild_latest_trials(db: Database, batch_size=1000, max_batches=None, restart=False) -> int:
+    """Recompute latest_trial for every customer
+
+    Finds the latest trial of a whole batch of customers with one aggregate.
+    Safe to run while the servicers save and delete trials, a customer's
+    latest_trial is only replaced if it hasn't changed since the batch was
+    read or is older than the one found.
+
+    Args:
+        db (Database): Database
+        batch_size (int, optional): Customers per batch
+        max_batches (int, optional): Stop after this many batches, None to run to the end
+        restart (bool, optional): Start again from the first customer
+
+    Returns:
+        int: Number of customers looked at, 0 once there are none left
+    """
+    done = 0
+    for customers in resumable_batches(db, 'customers', REBUILD_SETTING, projection={'latest_trial.recording_id': 1},
+                                       batch_size=batch_size, max_batches=max_batches, restart=restart):
+        customer_ids = [x['_id'] for x in customers]
+
+        latest = {}
+        trials = db.shoeTrialResults.aggregate([
+            {'$match': {'customer_id': {'$in': [str(x) for x in customer_ids]}}},
+            {'$sort': {'recording_date': -1}},
+            {'$group': dict({'_id': '$customer_id', 'recording_id': {'$first': '$_id'}},
+                            **{field: {'$first': '$' + field} for field in FIELDS})}
+        ])
+        for x in trials:
+            x['_id'], x['customer_id'] = x.pop('recording_id'), x['_id']
+            latest[x['customer_id']] = latest_trial(x)
+
+        requests = []
+        for x in customers:
+            summary = latest.get(str(x['_id']))
+            query = _unchanged(x)
+            if summary is not None:
+                # Not over a trial_saved made since the customer was read, unless it is older
+                query = {'$or': [query, {'_id': x['_id'], 'latest_trial.recording_date': {'$lte': summary['recording_date']}}]}
+                requests.append(UpdateOne(query, {'$set': {'latest_trial': summary}}))
+            else:
+                requests.append(UpdateOne(query, {'$unset': {'latest_trial': ''}}))
+        db.customers.bulk_write(requests, ordered=False)
+        done += len(customer_ids)
+    return done
@@ -0,0 +1,41 @@
+from pymongo.database import Database
+
+
+def resumable_batches(db: Database, collection: str, setting: str, query=None, projection=None, batch_size=100,
+                      max_batches=None, restart=False):
+    """Read a collection a batch at a time in _id order, carrying on from where the last run stopped
+
+    The _id reached is saved under setting in the schema collection once the
+    caller asks for the next batch, so a batch that raises is read again
+    next time. Documents the caller updates so they no longer match query
+    aren't read again even with restart.
+
+    Args:
+        db (Database): Database
+        collection (str): Collection to read
+        setting (str): Name of the schema document holding the _id reached
+        query (dict, optional): Documents to read, all if None
+        projection (dict, optional): Fields to read
+        batch_size (int, optional): Documents per batch
+        max_batches (int, optional): Stop after this many batches, None to run to the end
+        restart (bool, optional): Start again from the first document
+
+    Yields:
+        list: Documents of the next batch
+    """
+    if restart:
+        db.schema.delete_one({'name': setting})
+    last_id = (db.schema.find_one({'name': setting}) or {}).get('value')
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        batch_query = dict(query or {})
+        if last_id is not None:
+            batch_query['_id'] = {'$gt': last_id}
+        results = list(db[collection].find(batch_query, projection).sort('_id', 1).limit(batch_size))
+        if not results:
+            return
+        yield results
+
+        last_id = results[-1]['_id']
+        db.schema.update_one({'name': setting}, {'$set': {'value': last_id}}, upsert=True)
+        batches += 1
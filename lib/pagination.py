@@ -0,0 +1,379 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+
+import bson
+import grpc
+import pymongo
+from bson.errors import BSONError
+from lib.counts import count_cache
+from proto.messages_pb2 import CMSQuery
+
+# Trailing metadata keys streaming RPCs send the next page's token and the list's total in
+NEXT_PAGE_TOKEN = 'next-page-token'
+TOTAL_COUNT = 'total-count'
+
+
+class InvalidPageToken(ValueError):
+    pass
+
+
+def encode_page_token(sort_by, descending, value, _id) -> str:
+    """Token for the page after a document
+
+    Args:
+        sort_by (str): Field the results are sorted by, None when sorted by _id alone
+        descending (bool): Sort direction
+        value: Value of sort_by in the last document of the page
+        _id: _id of the last document of the page
+
+    Returns:
+        str: Opaque token for CMSQuery.page_token
+    """
+    token = bson.encode({'s': sort_by or '', 'd': bool(descending), 'v': value, 'i': _id})
+    return urlsafe_b64encode(token).decode('ascii')
+
+
+def decode_page_token(token, sort_by, descending) -> tuple:
+    """Sort key a token continues from
+
+    Args:
+        token (str): CMSQuery.page_token
+        sort_by (str): Field the request sorts by, None when sorted by _id alone
+        descending (bool): Sort direction of the request
+
+    Raises:
+        InvalidPageToken: If the token is corrupt or was made for another sort
+
+    Returns:
+        tuple: Value of sort_by and _id of the last document of the previous page
+    """
+    try:
+        decoded = bson.decode(urlsafe_b64decode(token.encode('ascii')))
+        token_sort, token_descending, value, _id = decoded['s'], decoded['d'], decoded['v'], decoded['i']
+    except (Base64Error, BSONError, UnicodeError, KeyError, ValueError, TypeError):
+        raise InvalidPageToken('page_token is not valid')
+    if token_sort != (sort_by or '') or token_descending != bool(descending):
+        raise InvalidPageToken('page_token is for a different sort')
+    return value, _id
+
+
+def keyset_match(sort_by, descending, value, _id) -> dict:
+    """Query for the documents after a sort key, the range on the sort index that replaces skip
+
+    Args:
+        sort_by (str): Field the results are sorted by, None when sorted by _id alone
+        descending (bool): Sort direction
+        value: Value of sort_by the previous page ended on
+        _id: _id the previous page ended on
+
+    Returns:
+        dict: Query
+    """
+    op = '$lt' if descending else '$gt'
+    if not sort_by:
+        return {'_id': {op: _id}}
+
+    tie = {sort_by: value, '_id': {op: _id}}
+    if value is None:
+        # Missing values sort first, so only ascending has anything after them with another value
+        if descending:
+            return tie
+        return {'$or': [{sort_by: {'$ne': None}}, tie]}
+    if descending:
+        # $lt doesn't match null or missing, which come last when descending
+        return {'$or': [{sort_by: {op: value}}, {sort_by: None}, tie]}
+    return {'$or': [{sort_by: {op: value}}, tie]}
+
+
+def field_value(document, field):
+    """Value of a dotted field in a document, None if it isn't there"""
+    value = document
+    for part in field.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+class Page():
+    """One page of a list RPC
+
+    With a page token the page starts from a range on the sort key and _id,
+    so it costs the same however deep into the results it is. Requests
+    without one fall back to skip. A limit of 0 returns everything.
+
+    Args:
+        limit (int, optional): Documents per page, 0 for no limit
+        skip (int, optional): Documents to skip when there is no token
+        token (str, optional): Token from the previous page
+        sort_by (str, optional): Field to sort by, None to sort by _id alone
+        descending (bool, optional): Sort direction
+
+    Raises:
+        InvalidPageToken: If the token can't be used for this sort
+    """
+
+    def __init__(self, limit=0, skip=0, token='', sort_by=None, descending=False):
+        self.limit = max(limit, 0)
+        self.skip = max(skip, 0)
+        self.sort_by = sort_by or None
+        self.descending = bool(descending)
+        self.after = decode_page_token(token, self.sort_by, self.descending) if token else None
+        self.next_page_token = ''
+        # Set by whatever ran the query if it knows how many results there are in all
+        self.total = None
+
+    @classmethod
+    def from_query(cls, cms_query: CMSQuery, allowed_sorts=(), sort_by=None, descending=None):
+        """Page asked for by a CMSQuery
+
+        Args:
+            cms_query (CMSQuery): Request
+            allowed_sorts (list, optional): Fields the request may sort_by
+            sort_by (str, optional): Field to sort by in place of the request's sort_by
+            descending (bool, optional): Direction in place of the request's sort_order
+
+        Returns:
+            Page: Page
+        """
+        if sort_by is None and cms_query.sort_by in allowed_sorts:
+            sort_by = cms_query.sort_by
+        if descending is None:
+            descending = cms_query.sort_order == CMSQuery.DESCENDING
+        return cls(cms_query.limit, cms_query.skip, cms_query.page_token, sort_by, descending)
+
+    @property
+    def paged(self) -> bool:
+        return bool(self.limit or self.after)
+
+    def sort(self) -> list:
+        """Sort keys, with _id to break ties when paging so every page has the same order
+
+        Returns:
+            list: Keys and directions, empty to leave the order to Mongo
+        """
+        direction = pymongo.DESCENDING if self.descending else pymongo.ASCENDING
+        keys = [(self.sort_by, direction)] if self.sort_by else []
+        if self.paged:
+            keys.append(('_id', direction))
+        return keys
+
+    def restrict(self, query: dict) -> dict:
+        """Query limited to the documents after the previous page
+
+        Args:
+            query (dict): Query for all the results
+
+        Returns:
+            dict: Query for this page onwards
+        """
+        if self.after is None:
+            return query
+        match = keyset_match(self.sort_by, self.descending, *self.after)
+        if not query:
+            return match
+        return {'$and': [query, match]}
+
+    def find(self, collection, query: dict, projection=None, **kwargs):
+        """Find this page, works with pymongo and motor collections
+
+        One document more than the limit is read to tell whether there is a
+        next page, results() holds it back.
+
+        Args:
+            collection (Collection): Collection to read
+            query (dict): Query for all the results
+            projection (dict, optional): Fields to return, must include sort_by
+            **kwargs: Passed to find
+
+        Returns:
+            Cursor: Documents
+        """
+        cursor = collection.find(self.restrict(query), projection, **kwargs)
+        sort = self.sort()
+        if sort:
+            cursor.sort(sort)
+        if self.skip and self.after is None:
+            cursor.skip(self.skip)
+        if self.limit:
+            cursor.limit(self.limit + 1)
+        return cursor
+
+    def stages(self) -> list:
+        """Pipeline stages selecting this page, to end an aggregate with
+
+        Returns:
+            list: $match, $sort, $skip and $limit stages as needed
+        """
+        stages = []
+        if self.after is not None:
+            stages.append({'$match': keyset_match(self.sort_by, self.descending, *self.after)})
+        sort = self.sort()
+        if sort:
+            stages.append({'$sort': dict(sort)})
+        if self.skip and self.after is None:
+            stages.append({'$skip': self.skip})
+        if self.limit:
+            stages.append({'$limit': self.limit + 1})
+        return stages
+
+    def _sort_key(self, document):
+        return field_value(document, self.sort_by) if self.sort_by else None, document.get('_id')
+
+    def _finish(self, context, last):
+        if last is not None:
+            self.next_page_token = encode_page_token(self.sort_by, self.descending, *last)
+        metadata = []
+        if self.next_page_token:
+            metadata.append((NEXT_PAGE_TOKEN, self.next_page_token))
+        if self.total is not None:
+            metadata.append((TOTAL_COUNT, str(self.total)))
+        if metadata and hasattr(context, 'set_trailing_metadata'):
+            context.set_trailing_metadata(tuple(metadata))
+
+    def results(self, context, documents):
+        """Stream the page, sending the next page's token and the total in the trailing metadata
+
+        Args:
+            context: grpc context of the RPC
+            documents (iterable): Output of find() or an aggregate ending with stages()
+
+        Yields:
+            dict: Documents of the page
+        """
+        last = None
+        for i, x in enumerate(documents):
+            if self.limit and i == self.limit:
+                self._finish(context, last)
+                return
+            # Before yielding, the message builders delete _id
+            last = self._sort_key(x)
+            yield x
+        self._finish(context, None)
+
+    async def results_async(self, context, documents):
+        """results() for motor cursors, or lists, on the grpc.aio server"""
+        if not hasattr(documents, '__aiter__'):
+            documents = _aiter(documents)
+        last = None
+        i = 0
+        async for x in documents:
+            if self.limit and i == self.limit:
+                self._finish(context, last)
+                return
+            last = self._sort_key(x)
+            i += 1
+            yield x
+        self._finish(context, None)
+
+
+async def _aiter(documents):
+    for x in documents:
+        yield x
+
+
+class PagedAggregate():
+    """A list RPC's aggregate, run once for both its page and the total it is out of
+
+    The stages filtering the list run once and a $facet splits their output
+    into the page and a $count. Totals go in the count cache, so later pages
+    and the matching count RPC reuse them rather than running the stages again.
+    Lists without a limit are streamed from a plain aggregate, without a total
+    unless one is cached, as the whole list won't fit in the one $facet
+    document.
+
+    Args:
+        collection (Collection): Collection to aggregate, pymongo or motor
+        stages (list): Stages selecting and shaping every document of the list
+        page (Page): Page to return
+        tenant (str, optional): company_id the list is restricted to, '' if it isn't
+        depends (list, optional): Other collections the stages read, writes to them drop the cached total
+        after (list, optional): Stages shaping the documents of the page, run after it is selected
+        **kwargs: Passed to aggregate
+    """
+
+    def __init__(self, collection, stages, page: Page, tenant='', depends=(), after=(), **kwargs):
+        self.collection = collection
+        self.stages = stages
+        self.page = page
+        self.tenant = tenant or ''
+        self.depends = depends
+        self.after = list(after)
+        self.kwargs = kwargs
+
+    def cached_total(self):
+        return count_cache.get(self.collection, self.stages, self.tenant)
+
+    def _store_total(self, total):
+        count_cache.put(self.collection, self.stages, total, self.tenant, self.depends)
+
+    def _use_facet(self) -> bool:
+        # Later pages come from a client that already has the total
+        return bool(self.page.limit) and self.page.after is None and self.page.total is None
+
+    def facet_pipeline(self) -> list:
+        return self.stages + [{'$facet': {'page': self.page.stages() + self.after, 'total': [{'$count': 'count'}]}}]
+
+    def page_pipeline(self) -> list:
+        return self.stages + self.page.stages() + self.after
+
+    def count_pipeline(self) -> list:
+        return self.stages + [{'$count': 'count'}]
+
+    def _read_facet(self, result):
+        result = result or {'page': [], 'total': []}
+        total = result['total'][0]['count'] if result['total'] else 0
+        self._store_total(total)
+        self.page.total = total
+        return result['page']
+
+    def run(self):
+        """Run the aggregate for the page, setting page.total when it is known
+
+        Returns:
+            iterable: Documents for page.results()
+        """
+        self.page.total = self.cached_total()
+        if self._use_facet():
+            return self._read_facet(next(self.collection.aggregate(self.facet_pipeline(), **self.kwargs), None))
+        return self.collection.aggregate(self.page_pipeline(), **self.kwargs)
+
+    async def run_async(self):
+        """run() for motor"""
+        self.page.total = self.cached_total()
+        if self._use_facet():
+            results = await self.collection.aggregate(self.facet_pipeline(), **self.kwargs).to_list(1)
+            return self._read_facet(results[0] if results else None)
+        return self.collection.aggregate(self.page_pipeline(), **self.kwargs)
+
+    def count(self) -> int:
+        """Total for a count RPC, from the cache when there is a fresh one
+
+        Returns:
+            int: Number of documents in the whole list
+        """
+        total = self.cached_total()
+        if total is None:
+            result = next(self.collection.aggregate(self.count_pipeline(), **self.kwargs), None)
+            total = result['count'] if result else 0
+            self._store_total(total)
+        return total
+
+
+def request_page(cms_query: CMSQuery, context, allowed_sorts=(), **kwargs):
+    """Page for a list RPC, aborting it with INVALID_ARGUMENT if the page token is no good
+
+    Args:
+        cms_query (CMSQuery): Request
+        context: grpc context of the RPC
+        allowed_sorts (list, optional): Fields the request may sort_by
+        **kwargs: See Page.from_query
+
+    Returns:
+        Page: Page or None if the RPC was aborted
+    """
+    try:
+        return Page.from_query(cms_query, allowed_sorts, **kwargs)
+    except InvalidPageToken as e:
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        return None
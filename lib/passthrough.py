@@ -0,0 +1,132 @@
+import grpc
+from google.protobuf.descriptor import FieldDescriptor
+
+_LENGTH_DELIMITED = {FieldDescriptor.TYPE_STRING, FieldDescriptor.TYPE_BYTES}
+_VARINT = {FieldDescriptor.TYPE_INT64, FieldDescriptor.TYPE_INT32, FieldDescriptor.TYPE_UINT64,
+           FieldDescriptor.TYPE_UINT32, FieldDescriptor.TYPE_BOOL, FieldDescriptor.TYPE_ENUM}
+
+
+class SerializedMessage():
+    """An encoded message streamed to the client as it is
+
+    RPCs registered with add_passthrough_servicer can yield these in place
+    of messages, grpc sends the bytes without serializing anything.
+
+    Args:
+        data (bytes): Encoded message
+        message_class: Message type the bytes decode to
+    """
+
+    __slots__ = ('data', 'message_class')
+
+    def __init__(self, data, message_class):
+        self.data = data
+        self.message_class = message_class
+
+    def ByteSize(self) -> int:
+        return len(self.data)
+
+    def message(self):
+        """Decode the message, for callers in the same process"""
+        msg = self.message_class()
+        msg.ParseFromString(self.data)
+        return msg
+
+
+def _varint(value) -> bytes:
+    # Negative ints are sent as their 64 bit two's complement, ten bytes long
+    value &= (1 << 64) - 1
+    encoded = bytearray()
+    while True:
+        bits = value & 0x7f
+        value >>= 7
+        if value:
+            encoded.append(bits | 0x80)
+        else:
+            encoded.append(bits)
+            return bytes(encoded)
+
+
+def encode_fields(message_class, **fields) -> bytes:
+    """Encode singular scalar fields of a message, including those left at their default
+
+    Appended to an encoded message they replace the values already in it,
+    as the last value of a singular field on the wire is the one kept.
+
+    Args:
+        message_class: Message type the fields belong to
+        **fields: Field name -> value, strings, bytes and integer types only
+
+    Returns:
+        bytes: The fields on the wire
+    """
+    encoded = bytearray()
+    for name, value in fields.items():
+        field = message_class.DESCRIPTOR.fields_by_name[name]
+        if field.type in _LENGTH_DELIMITED:
+            value = value.encode('utf-8') if isinstance(value, str) else bytes(value)
+            encoded += _varint(field.number << 3 | 2) + _varint(len(value)) + value
+        elif field.type in _VARINT:
+            encoded += _varint(field.number << 3) + _varint(int(value))
+        else:
+            raise TypeError(f'{name} can\'t be overridden without parsing the message')
+    return bytes(encoded)
+
+
+def override_fields(data, message_class, **fields) -> SerializedMessage:
+    """A stored message with some fields replaced, without decoding it
+
+    Args:
+        data (bytes): Encoded message
+        message_class: Message type of data
+        **fields: Field name -> value, see encode_fields
+
+    Returns:
+        SerializedMessage: Message to stream
+    """
+    return SerializedMessage(data + encode_fields(message_class, **fields), message_class)
+
+
+def passthrough_serializer(serializer):
+    """Response serializer sending SerializedMessages as they are and serializing anything else"""
+    def serialize(response):
+        if isinstance(response, SerializedMessage):
+            return response.data
+        return serializer(response)
+    return serialize
+
+
+class _PassthroughHandler(grpc.GenericRpcHandler):
+    def __init__(self, handler, methods):
+        self.handler = handler
+        self.methods = methods
+
+    def service(self, handler_call_details):
+        handler = self.handler.service(handler_call_details)
+        if handler is None or handler_call_details.method not in self.methods:
+            return handler
+        return handler._replace(response_serializer=passthrough_serializer(handler.response_serializer))
+
+
+class _PassthroughServer():
+    def __init__(self, server, methods):
+        self.server = server
+        self.methods = methods
+
+    def add_generic_rpc_handlers(self, handlers):
+        self.server.add_generic_rpc_handlers(tuple(_PassthroughHandler(x, self.methods) for x in handlers))
+
+    def __getattr__(self, name):
+        return getattr(self.server, name)
+
+
+def add_passthrough_servicer(add_servicer_to_server, servicer, server, methods):
+    """Register a servicer whose streaming RPCs may yield SerializedMessages
+
+    Args:
+        add_servicer_to_server (callable): Generated add_*Servicer_to_server function
+        servicer: Servicer to register
+        server: grpc or grpc.aio server
+        methods (iterable): Full names of the methods that send SerializedMessages
+    """
+    add_servicer_to_server(servicer, _PassthroughServer(server, frozenset(methods)))
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from threading import Lock
+import time
+
+from lib.cache_sync import cache_sync
+
+# Only the fields the interceptor and servicers read off context.user
+USER_PROJECTION = {'email': 1, 'name': 1, 'role': 1, 'company_id': 1, 'branch_id': 1, 'locked': 1}
+COMPANY_PROJECTION = {'blocked': 1, 'type': 1, 'licence_expiry': 1}
+
+
+class PrincipalCache():
+    """Verified principals by token
+
+    Invalidations are published through cache_sync, so with several server
+    processes a role change, lock or block reaches all of them within
+    cache-sync-interval seconds rather than ttl.
+    """
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def configure(self, max_size=None, ttl=None):
+        """Resize the cache and/or change the entry lifetime
+
+        Args:
+            max_size (int, optional): Maximum number of principals held
+            ttl (int, optional): Seconds an entry stays valid
+        """
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max_size
+            if ttl is not None:
+                self.ttl = ttl
+            self._trim()
+
+    def get(self, token: str):
+        """Get the cached principal for a token
+
+        Args:
+            token (str): Raw JWT from the authorization header
+
+        Returns:
+            tuple: (user, company) or None if not cached/expired
+        """
+        cache_sync.poll()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires, user, company = entry
+            if expires < time.monotonic():
+                del self._entries[token]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self.hits += 1
+            # Hand out a copy so a servicer can't alter the shared entry
+            return dict(user), company
+
+    def set(self, token: str, user: dict, company: dict = None):
+        with self._lock:
+            self._entries[token] = (time.monotonic() + self.ttl, user, company)
+            self._entries.move_to_end(token)
+            self._trim()
+
+    def invalidate_user(self, user_id):
+        """Drop every cached principal for a user
+
+        Args:
+            user_id (ObjectId|str): _id of the user
+        """
+        self.drop_user(user_id)
+        cache_sync.publish('user', user_id)
+
+    def drop_user(self, user_id):
+        # Only in this process
+        user_id = str(user_id)
+        self._invalidate(lambda user, company: str(user['_id']) == user_id)
+
+    def invalidate_company(self, company_id):
+        """Drop every cached principal belonging to a company
+
+        Args:
+            company_id (ObjectId|str): _id of the company
+        """
+        self.drop_company(company_id)
+        cache_sync.publish('company', company_id)
+
+    def drop_company(self, company_id):
+        # Only in this process
+        company_id = str(company_id)
+        self._invalidate(lambda user, company: str(user.get('company_id')) == company_id)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+    def _invalidate(self, predicate):
+        with self._lock:
+            stale = [token for token, (_, user, company) in self._entries.items() if predicate(user, company)]
+            for token in stale:
+                del self._entries[token]
+            self.invalidations += len(stale)
+
+    def _trim(self):
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+# Shared between the AuthInterceptor and the servicers that invalidate it
+principal_cache = PrincipalCache()
+cache_sync.subscribe('user', principal_cache.drop_user)
+cache_sync.subscribe('company', principal_cache.drop_company)
@@ -0,0 +1,234 @@
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from threading import Lock
+import json
+import logging
+import random
+import time
+
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+from lib.metrics import REGISTRY, Counter, Histogram, split_method_name
+from lib.request_context import current_request_context
+
+logger = logging.getLogger(__name__)
+
+# Commands whose shape is worth logging and which explain accepts
+EXPLAINABLE_COMMANDS = {'find', 'aggregate', 'count', 'distinct'}
+TIMED_COMMANDS = EXPLAINABLE_COMMANDS | {'getMore', 'insert', 'update', 'delete', 'findAndModify'}
+
+# Driver fields that aren't part of the query and that explain rejects
+_DRIVER_FIELDS = {'lsid', 'txnNumber', 'autocommit', 'startTransaction', 'readConcern', 'batchSize'}
+
+# Parts of a command that hold the query's shape, everything else is an option
+_SHAPE_FIELDS = ('filter', 'query', 'pipeline', 'sort', 'projection', 'key', 'hint')
+
+DEFAULTS = {
+    'slow-ms': 500,
+    'explain-sample-rate': 0.1,
+    'explain-interval-seconds': 600,
+    'lookup-docs-examined': 10000
+}
+
+COMMAND_SECONDS = REGISTRY.register(Histogram(
+    'mongo_command_seconds', 'Time taken by Mongo commands, by the RPC that sent them',
+    ('command', 'collection', 'grpc_service', 'grpc_method')))
+SLOW_COMMANDS = REGISTRY.register(Counter(
+    'mongo_slow_commands_total', 'Mongo commands slower than the slow query threshold',
+    ('command', 'collection', 'fingerprint')))
+EXPLAIN_FLAGS = REGISTRY.register(Counter(
+    'mongo_explain_flags_total', 'Problems found when explaining slow commands', ('flag', 'fingerprint')))
+
+
+def _shape(value):
+    if isinstance(value, dict):
+        return {k: _shape(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        # ['a', 'b', 'c'] for an $in is the same query as ['a']
+        shapes = []
+        for x in value:
+            shape = _shape(x)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    return '?'
+
+
+def query_shape(command_name, command) -> dict:
+    """Reduce a command to its shape, with every literal value replaced by '?'
+
+    Args:
+        command_name (str): Name of the command
+        command (dict): Command document
+
+    Returns:
+        dict: Shape of the command
+    """
+    shape = {command_name: command.get(command_name)}
+    for field in _SHAPE_FIELDS:
+        if field in command:
+            # Sort orders and projections are part of the shape, not values
+            shape[field] = command[field] if field in ('sort', 'projection', 'key', 'hint') else _shape(command[field])
+    return shape
+
+
+def fingerprint(shape) -> str:
+    return sha1(json.dumps(shape, sort_keys=True, default=str).encode('utf8')).hexdigest()[:12]
+
+
+def explain_flags(explain, lookup_docs_examined=DEFAULTS['lookup-docs-examined']) -> list:
+    """Find the problems in an explain("executionStats") result
+
+    Args:
+        explain (dict): Output of the explain command
+        lookup_docs_examined (int, optional): Docs examined by a $lookup before it is flagged as a fan-out
+
+    Returns:
+        list: Sorted flags, COLLSCAN and/or LOOKUP_FANOUT
+    """
+    flags = set()
+
+    def walk(value):
+        if isinstance(value, dict):
+            if value.get('stage') == 'COLLSCAN':
+                flags.add('COLLSCAN')
+            if '$lookup' in value:
+                if value.get('collectionScans') or value.get('totalDocsExamined', 0) > lookup_docs_examined:
+                    flags.add('LOOKUP_FANOUT')
+            for x in value.values():
+                walk(x)
+        elif isinstance(value, list):
+            for x in value:
+                walk(x)
+
+    walk(explain)
+    return sorted(flags)
+
+
+class QueryLog(monitoring.CommandListener):
+    """Times Mongo commands against the RPC that sent them and logs the slow ones
+
+    Slow reads are logged with a fingerprint of their shape, so the same
+    query with different values groups together. A sample of them is
+    explained on a background thread and any COLLSCAN or $lookup fan-out is
+    logged and counted.
+
+    Args:
+        slow_ms (int, optional): Commands slower than this are logged
+        explain_sample_rate (float, optional): Share of slow commands to explain
+        explain_interval_seconds (float, optional): Least time between explains of the same fingerprint
+        lookup_docs_examined (int, optional): See explain_flags
+    """
+
+    def __init__(self, slow_ms=DEFAULTS['slow-ms'], explain_sample_rate=DEFAULTS['explain-sample-rate'],
+                 explain_interval_seconds=DEFAULTS['explain-interval-seconds'],
+                 lookup_docs_examined=DEFAULTS['lookup-docs-examined']):
+        self.slow_ms = slow_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_interval_seconds = explain_interval_seconds
+        self.lookup_docs_examined = lookup_docs_examined
+        # Set by Db once the client this listens to exists
+        self.client = None
+        self._pending = {}
+        self._explained = {}
+        self._lock = Lock()
+        self._executor = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Build from the 'query-log' section of the config
+
+        Args:
+            config (dict): Server config
+
+        Returns:
+            QueryLog: Listener
+        """
+        settings = dict(DEFAULTS)
+        settings.update(config.get('query-log') or {})
+        return cls(settings['slow-ms'], settings['explain-sample-rate'],
+                   settings['explain-interval-seconds'], settings['lookup-docs-examined'])
+
+    def started(self, event):
+        if event.command_name not in TIMED_COMMANDS:
+            return
+        request_context = current_request_context()
+        method_name = request_context.method_name if request_context is not None else None
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (
+                event.command, event.database_name, method_name or '')
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+    def _finish(self, event):
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        command, database_name, method_name = pending
+        collection = command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = command.get('collection', '')
+        grpc_service, grpc_method = split_method_name(method_name) if method_name else ('', '')
+        seconds = event.duration_micros / 1e6
+        COMMAND_SECONDS.observe(seconds, command=event.command_name, collection=collection,
+                                grpc_service=grpc_service, grpc_method=grpc_method)
+        if seconds * 1000 < self.slow_ms or event.command_name not in EXPLAINABLE_COMMANDS:
+            return
+
+        shape = query_shape(event.command_name, command)
+        key = fingerprint(shape)
+        SLOW_COMMANDS.inc(command=event.command_name, collection=collection, fingerprint=key)
+        logger.warning('Slow %s on %s took %dms for %s, fingerprint %s: %s', event.command_name, collection,
+                       seconds * 1000, method_name or 'no RPC', key, json.dumps(shape, default=str))
+        if self._should_explain(key):
+            self._explain_executor().submit(self.explain, database_name, command, key)
+
+    def _should_explain(self, key):
+        if self.client is None or random.random() >= self.explain_sample_rate:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            last = self._explained.get(key)
+            if last is not None and now - last < self.explain_interval_seconds:
+                return False
+            self._explained[key] = now
+        return True
+
+    def _explain_executor(self):
+        # Explains run the query again, one at a time keeps that from adding much load
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='query-explain')
+            return self._executor
+
+    def explain(self, database_name, command, key):
+        """Explain a slow command and log anything it flags
+
+        Args:
+            database_name (str): Database the command ran against
+            command (dict): Command as it was sent
+            key (str): Fingerprint of the command
+
+        Returns:
+            list: Flags found, see explain_flags
+        """
+        command = {k: v for k, v in command.items() if not k.startswith('$') and k not in _DRIVER_FIELDS}
+        if 'cursor' in command:
+            # Drop any batchSize
+            command['cursor'] = {}
+        try:
+            explain = self.client[database_name].command('explain', command, verbosity='executionStats')
+        except PyMongoError as e:
+            logger.warning('Unable to explain fingerprint %s: %s', key, e)
+            return []
+        flags = explain_flags(explain, self.lookup_docs_examined)
+        for flag in flags:
+            EXPLAIN_FLAGS.inc(flag=flag, fingerprint=key)
+        if flags:
+            logger.warning('Fingerprint %s: %s', key, ', '.join(flags))
+        return flags
@@ -0,0 +1,83 @@
+from collections import defaultdict
+
+# Prefix of the fields of a customer's latest shoe trial in the queries of the customer lists
+TRIAL_PREFIX = 'shoeTrialResults.'
+
+# Prefix of the same fields in the copy of the latest trial kept on the customer
+SUMMARY_PREFIX = 'latest_trial.'
+
+# Leading keys of the customers indexes, matched first so the planner can use them
+CUSTOMER_INDEX_FIELDS = ['company_id', 'branch_id']
+
+_RANGE_OPERATORS = {'$gt', '$gte', '$lt', '$lte'}
+
+
+def is_trial_field(field) -> bool:
+    return field.startswith(TRIAL_PREFIX)
+
+
+def _rank(field, condition):
+    if field in CUSTOMER_INDEX_FIELDS:
+        return CUSTOMER_INDEX_FIELDS.index(field)
+    operators = set(condition) if isinstance(condition, dict) else set()
+    if not operators or not any(x.startswith('$') for x in operators):
+        # Equality, then ranges, then everything else such as $regex
+        return len(CUSTOMER_INDEX_FIELDS)
+    if operators <= _RANGE_OPERATORS:
+        return len(CUSTOMER_INDEX_FIELDS) + 1
+    return len(CUSTOMER_INDEX_FIELDS) + 2
+
+
+def _combine(predicates) -> dict:
+    conditions = defaultdict(list)
+    for field, condition in predicates:
+        conditions[field].append(condition)
+    query = {}
+    for field in sorted(conditions, key=lambda x: _rank(x, conditions[x][0])):
+        if len(conditions[field]) == 1:
+            query[field] = conditions[field][0]
+    clashes = [{field: x} for field in conditions if len(conditions[field]) > 1 for x in conditions[field]]
+    if clashes:
+        query['$and'] = clashes
+    return query
+
+
+class CustomerTrialPlan():
+    """Where the predicates of a list of customers with their latest shoe trial run
+
+    The latest trial is kept on each customer as latest_trial, so predicates
+    on it, the shoeTrialResults.* fields, become predicates on
+    latest_trial.* and everything runs in one $match on customers, with
+    index keys first, before anything else. Customers without a trial have
+    no latest_trial and are left out, as the $unwind of the old join did.
+    """
+
+    def __init__(self):
+        self.customer = []
+        self.trial = []
+
+    def add(self, query: dict):
+        """Add the predicates of a query on customers joined to their latest trial
+
+        Args:
+            query (dict): Query, trial fields prefixed with shoeTrialResults.
+        """
+        for field, condition in query.items():
+            if is_trial_field(field):
+                self.trial.append((field[len(TRIAL_PREFIX):], condition))
+            else:
+                self.customer.append((field, condition))
+
+    def match(self) -> dict:
+        """Query on customers for every predicate
+
+        Returns:
+            dict: Query
+        """
+        predicates = list(self.customer)
+        predicates.extend((SUMMARY_PREFIX + field, condition) for field, condition in self.trial)
+        predicates.append((SUMMARY_PREFIX + 'recording_id', {'$exists': True}))
+        return _combine(predicates)
+
+    def stages(self) -> list:
+        return [{'$match': self.match()}]
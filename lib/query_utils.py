@@ -1,4 +1,4 @@
-from bcrypt import re
+import re
 from pymongo.cursor import Cursor
 from lib.timestamp import now
 from proto.messages_pb2 import CMSQuery
@@ -0,0 +1,263 @@
+from datetime import datetime
+from threading import Lock, local
+import inspect
+import logging
+import time
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import monitoring
+from pymongo.errors import ExecutionTimeout
+from lib.metrics import REGISTRY, Counter, split_method_name
+
+logger = logging.getLogger(__name__)
+
+READ_COMMANDS = {'find', 'getMore', 'aggregate', 'count', 'distinct'}
+
+_current = local()
+_stats_lock = Lock()
+_read_stats = {}
+
+ABANDONED = REGISTRY.register(Counter(
+    'grpc_server_abandoned_total', 'RPCs that stopped early because the client cancelled or its deadline passed',
+    ('grpc_service', 'grpc_method', 'reason')))
+
+
+class RequestContext():
+    """Per-RPC cache of the caller's company, branch, devices and licence state
+
+    Everything is loaded lazily and at most once per RPC, so servicers can ask
+    for the same company as often as they like without going back to Mongo.
+    """
+
+    def __init__(self, db, user=None, company_summary=None, time_remaining=None):
+        self.db = db
+        self.user = user
+        self.reads = 0
+        self.method_name = None
+        self.deadline = time.monotonic() + time_remaining if time_remaining is not None else None
+        self._company_summary = company_summary
+        self._companies = {}
+
+    def get_company(self, company_id):
+        """Get a company document, memoized for the rest of the RPC
+
+        Args:
+            company_id (ObjectId|str): _id of the company
+
+        Returns:
+            dict: Company document or None if it doesn't exist
+        """
+        key = str(company_id) if company_id else ''
+        if key not in self._companies:
+            try:
+                self._companies[key] = self.db.companies.find_one({'_id': ObjectId(key)})
+            except (InvalidId, TypeError):
+                self._companies[key] = None
+        return self._companies[key]
+
+    @property
+    def company(self):
+        if not self.user:
+            return None
+        return self.get_company(self.user.get('company_id'))
+
+    @property
+    def branch(self):
+        company = self.company
+        if not company:
+            return None
+        return next((x for x in company.get('branches', []) if x['branch_id'] == self.user.get('branch_id')), None)
+
+    @property
+    def device_ids(self):
+        company = self.company
+        if not company:
+            return set()
+        return {device['device_id'] for branch in company.get('branches', []) for device in branch.get('devices', [])}
+
+    @property
+    def licence_active(self):
+        """Whether the caller's company holds a current, non-lite licence"""
+        # The interceptor's cached company summary already has the licence fields
+        company = self._company_summary if self._company_summary is not None else self.company
+        if not company:
+            return False
+
+        type_val = company.get('type')
+        licence_expiry = company.get('licence_expiry')
+        if type_val is None or type_val == 'lite' or licence_expiry is None:
+            return False
+        return datetime.now() < datetime.fromtimestamp(licence_expiry / 1000.0)
+
+    def max_time_ms(self):
+        """Milliseconds left until the client's deadline, for use as maxTimeMS
+
+        Returns:
+            int: Remaining time, at least 1 so an expired deadline fails fast. None if there is no deadline
+        """
+        if self.deadline is None:
+            return None
+        return max(1, int((self.deadline - time.monotonic()) * 1000))
+
+    def abandon(self, reason):
+        """Record that the RPC stopped doing work for a client that is no longer waiting
+
+        Args:
+            reason (str): 'cancelled' or 'deadline'
+        """
+        service, method = split_method_name(self.method_name or '')
+        ABANDONED.inc(grpc_service=service, grpc_method=method, reason=reason)
+        logger.info('%s abandoned: %s', self.method_name, reason)
+
+    def bind(self):
+        _current.request_context = self
+
+    def unbind(self):
+        if getattr(_current, 'request_context', None) is self:
+            _current.request_context = None
+
+    def finish(self, method_name):
+        self.unbind()
+        with _stats_lock:
+            calls, reads = _read_stats.get(method_name, (0, 0))
+            _read_stats[method_name] = (calls + 1, reads + self.reads)
+        logger.debug('%s performed %d mongo reads', method_name, self.reads)
+
+
+def get_request_context(context, db) -> RequestContext:
+    """Get the RequestContext attached to a grpc context, attaching one if missing
+
+    Args:
+        context: grpc context of the current RPC
+        db (Database): Database to load from
+
+    Returns:
+        RequestContext: Context for the current RPC
+    """
+    request_context = getattr(context, 'request_context', None)
+    if request_context is None:
+        request_context = RequestContext(db, getattr(context, 'user', None), time_remaining=time_remaining(context))
+        setattr(context, 'request_context', request_context)
+    return request_context
+
+
+def current_request_context():
+    return getattr(_current, 'request_context', None)
+
+
+def time_remaining(context):
+    """Seconds left until the deadline of an RPC
+
+    Args:
+        context: grpc context of the RPC
+
+    Returns:
+        float: Seconds left or None if the client didn't set a deadline
+    """
+    if not hasattr(context, 'time_remaining'):
+        return None
+    return context.time_remaining()
+
+
+def while_active(context, results):
+    """Iterate a cursor only while the client is still waiting for the results
+
+    Stops pulling from the cursor as soon as the RPC is cancelled or times out
+    and closes it so Mongo can drop the query.
+
+    Args:
+        context: grpc context of the RPC
+        results (iterable): Cursor or other iterable being streamed back
+
+    Yields:
+        Items of results
+    """
+    iterator = iter(results)
+    while True:
+        if hasattr(context, 'is_active') and not context.is_active():
+            remaining = time_remaining(context)
+            reason = 'deadline' if remaining is not None and remaining <= 0 else 'cancelled'
+            request_context = getattr(context, 'request_context', None)
+            if request_context is not None:
+                request_context.abandon(reason)
+            if hasattr(results, 'close'):
+                results.close()
+            return
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        yield item
+
+
+def run_tracked(method_name, request_context: RequestContext, call):
+    """Run an RPC handler with Mongo reads attributed to its RequestContext
+
+    Args:
+        method_name (str): Full grpc method name
+        request_context (RequestContext): Context of the RPC
+        call (callable): Invokes the handler
+
+    Returns:
+        Handler response, streams are wrapped so counting covers iteration
+    """
+    request_context.method_name = method_name
+    request_context.bind()
+    try:
+        response = call()
+    except ExecutionTimeout:
+        request_context.abandon('deadline')
+        request_context.finish(method_name)
+        raise
+    except Exception:
+        request_context.finish(method_name)
+        raise
+
+    if inspect.isgenerator(response):
+        return _track_stream(method_name, request_context, response)
+
+    request_context.finish(method_name)
+    return response
+
+
+def _track_stream(method_name, request_context, responses):
+    request_context.bind()
+    try:
+        for response in responses:
+            yield response
+    except GeneratorExit:
+        # grpc stopped consuming the stream, the client is gone
+        request_context.abandon('cancelled')
+        raise
+    except ExecutionTimeout:
+        request_context.abandon('deadline')
+        raise
+    finally:
+        request_context.finish(method_name)
+
+
+def read_stats() -> dict:
+    """Calls and Mongo reads recorded per RPC method
+
+    Returns:
+        dict: method name -> (calls, reads)
+    """
+    with _stats_lock:
+        return dict(_read_stats)
+
+
+class ReadCounter(monitoring.CommandListener):
+    """Attributes Mongo read commands to the RequestContext bound to the calling thread"""
+
+    def started(self, event):
+        if event.command_name in READ_COMMANDS:
+            request_context = current_request_context()
+            if request_context is not None:
+                request_context.reads += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
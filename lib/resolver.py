@@ -0,0 +1,118 @@
+from collections import defaultdict
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+# Rows resolved together by the streaming RPCs, enough to amortise the $in
+# without holding back much of the stream
+BATCH_SIZE = 100
+
+# Fields the report and customer lists read from the documents they resolve
+USER_PROJECTION = {'name': 1, 'company_id': 1, 'branch_id': 1}
+COMPANY_PROJECTION = {'name': 1, 'branches.branch_id': 1, 'branches.name': 1}
+
+
+class Resolver():
+    """Fetches the documents a result set refers to with one $in per collection
+
+    Call load() with every id a page or result set refers to, then get() each
+    one. Documents are memoized for the life of the resolver, one per RPC, so
+    ids repeated across rows or batches are only read once. Unknown and
+    invalid ids resolve to None.
+
+    Args:
+        db (Database): Database, pymongo or motor
+        projections (dict, optional): collection name -> projection to fetch with
+    """
+
+    def __init__(self, db, projections=None):
+        self.db = db
+        self.projections = projections or {}
+        self._documents = defaultdict(dict)
+
+    def _missing(self, collection, ids) -> list:
+        documents = self._documents[collection]
+        missing = []
+        for _id in ids:
+            key = str(_id) if _id else ''
+            if key in documents:
+                continue
+            # Not found until the query says otherwise
+            documents[key] = None
+            try:
+                missing.append(ObjectId(key))
+            except (InvalidId, TypeError):
+                pass
+        return missing
+
+    def _query(self, collection, missing):
+        return self.db[collection].find({'_id': {'$in': missing}}, self.projections.get(collection))
+
+    def _store(self, collection, document):
+        self._documents[collection][str(document['_id'])] = document
+
+    def load(self, collection, ids):
+        """Fetch the documents of a collection that aren't loaded yet
+
+        Args:
+            collection (str): Collection name
+            ids (iterable): _ids, as ObjectId or str
+        """
+        missing = self._missing(collection, ids)
+        if missing:
+            for x in self._query(collection, missing):
+                self._store(collection, x)
+
+    async def load_async(self, collection, ids):
+        """load() for motor"""
+        missing = self._missing(collection, ids)
+        if missing:
+            async for x in self._query(collection, missing):
+                self._store(collection, x)
+
+    def get(self, collection, _id):
+        """A document by _id, loading it on its own if load() wasn't called for it
+
+        Args:
+            collection (str): Collection name
+            _id (ObjectId|str): _id of the document
+
+        Returns:
+            dict: Document or None if it doesn't exist
+        """
+        key = str(_id) if _id else ''
+        if key not in self._documents[collection]:
+            self.load(collection, [key])
+        return self._documents[collection][key]
+
+
+def batches(documents, size=BATCH_SIZE):
+    """Split a stream of documents into lists to resolve together
+
+    Args:
+        documents (iterable): Documents
+        size (int, optional): Documents per batch
+
+    Yields:
+        list: Up to size documents
+    """
+    batch = []
+    for x in documents:
+        batch.append(x)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def batches_async(documents, size=BATCH_SIZE):
+    """batches() for async iterators"""
+    batch = []
+    async for x in documents:
+        batch.append(x)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,85 @@
+import grpc
+
+DEFAULTS = {
+    'processes': 1,
+    'workers': 10,
+    'max-concurrent-rpcs': None,
+    'insecure-port': 50051,
+    'secure-port': 50052,
+    'compression': 'none',
+    'method-compression': {},
+    'drain-grace-seconds': 30,
+    'drain-delay-seconds': 5,
+    'health-interval-seconds': 5,
+    'schema-check': 'sync'
+}
+
+# settings.json key -> grpc channel argument(s)
+CHANNEL_ARGS = {
+    'max-message-bytes': ('grpc.max_send_message_length', 'grpc.max_receive_message_length'),
+    'keepalive-time-ms': ('grpc.keepalive_time_ms',),
+    'keepalive-timeout-ms': ('grpc.keepalive_timeout_ms',),
+    'keepalive-permit-without-calls': ('grpc.keepalive_permit_without_calls',),
+    'http2-max-pings-without-data': ('grpc.http2.max_pings_without_data',),
+    'http2-min-ping-interval-ms': ('grpc.http2.min_ping_interval_without_data_ms',),
+    'http2-lookahead-bytes': ('grpc.http2.lookahead_bytes',),
+    'http2-bdp-probe': ('grpc.http2.bdp_probe',),
+    'http2-max-frame-size': ('grpc.http2.max_frame_size',)
+}
+
+COMPRESSION = {
+    'none': grpc.Compression.NoCompression,
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate
+}
+
+
+def server_settings(config) -> dict:
+    """Get the 'server' section of the config with defaults filled in
+
+    Args:
+        config (dict): Server config
+
+    Returns:
+        dict: Server settings
+    """
+    settings = dict(DEFAULTS)
+    settings.update(config.get('server') or {})
+    return settings
+
+
+def channel_options(settings) -> list:
+    """Build the grpc.server options list from the server settings
+
+    Args:
+        settings (dict): Server settings
+
+    Returns:
+        list: (name, value) channel arguments
+    """
+    options = []
+    for key, names in CHANNEL_ARGS.items():
+        value = settings.get(key)
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = int(value)
+        options.extend((name, value) for name in names)
+    # Anything else grpc understands can be passed straight through
+    options.extend((name, value) for name, value in (settings.get('grpc-options') or {}).items())
+    return options
+
+
+def compression(name) -> grpc.Compression:
+    """Map a compression name from the settings to the grpc enum
+
+    Args:
+        name (str): 'none', 'gzip' or 'deflate'
+
+    Returns:
+        grpc.Compression: Algorithm
+    """
+    try:
+        return COMPRESSION[(name or 'none').lower()]
+    except KeyError:
+        raise ValueError(f'Unknown compression {name}, expected one of {", ".join(COMPRESSION)}')
@@ -0,0 +1,141 @@
+from urllib.request import urlopen
+import logging
+import multiprocessing
+import signal
+import time
+
+from lib.metrics import REGISTRY, Counter, start_metrics_server
+
+logger = logging.getLogger(__name__)
+
+RESTARTS = REGISTRY.register(Counter(
+    'supervisor_worker_restarts_total', 'Worker processes restarted after exiting unexpectedly', ('worker',)))
+
+
+def worker_metrics_port(metrics_port, index):
+    # Each worker exposes its own registry on the ports just above the supervisor's
+    return metrics_port + 1 + index
+
+
+def merge_scrapes(scrapes) -> str:
+    """Merge Prometheus text scrapes from several workers into one, labelling each sample with its worker
+
+    Args:
+        scrapes (list): (worker, body) pairs
+
+    Returns:
+        str: Combined scrape body
+    """
+    families = {}
+    for worker, body in scrapes:
+        family = None
+        for line in body.splitlines():
+            if not line:
+                continue
+            if line.startswith('# HELP ') or line.startswith('# TYPE '):
+                family = line.split(' ')[2]
+                entry = families.setdefault(family, {'HELP': None, 'TYPE': None, 'samples': []})
+                entry[line[2:6]] = line
+                continue
+            if family is None:
+                continue
+            name, _, value = line.rpartition(' ')
+            label = f'worker="{worker}"'
+            if name.endswith('}'):
+                name = f'{name[:-1]},{label}}}'
+            else:
+                name = f'{name}{{{label}}}'
+            families[family]['samples'].append(f'{name} {value}')
+
+    lines = []
+    for entry in families.values():
+        lines.extend(x for x in (entry['HELP'], entry['TYPE']) if x)
+        lines.extend(entry['samples'])
+    return '\n'.join(lines) + '\n'
+
+
+class WorkerRegistry():
+    """Registry stand-in for the supervisor's scrape endpoint that gathers every worker's metrics"""
+
+    def __init__(self, metrics_port, processes, timeout=2):
+        self.metrics_port = metrics_port
+        self.processes = processes
+        self.timeout = timeout
+
+    def render(self) -> str:
+        scrapes = [('supervisor', REGISTRY.render())]
+        for index in range(self.processes):
+            try:
+                url = f'http://127.0.0.1:{worker_metrics_port(self.metrics_port, index)}/metrics'
+                with urlopen(url, timeout=self.timeout) as response:
+                    scrapes.append((str(index), response.read().decode('utf-8')))
+            except OSError:
+                # Worker is restarting, its series will be back next scrape
+                logger.warning('Could not scrape metrics from worker %d', index)
+        return merge_scrapes(scrapes)
+
+
+class Supervisor():
+    """Runs a fixed number of server worker processes and restarts any that die
+
+    Workers are started with the spawn method so none of them inherit grpc or
+    MongoClient state from the supervisor.
+    """
+
+    def __init__(self, target, processes, metrics_port=None, min_uptime=5, max_backoff=30):
+        self.target = target
+        self.processes = processes
+        self.metrics_port = metrics_port
+        self.min_uptime = min_uptime
+        self.max_backoff = max_backoff
+        self.stopping = False
+        self._context = multiprocessing.get_context('spawn')
+        self._workers = {}
+
+    def _start(self, index):
+        process = self._context.Process(target=self.target, args=(index,), name=f'worker-{index}', daemon=False)
+        process.start()
+        worker = self._workers.get(index, {'failures': 0})
+        worker.update({'process': process, 'started': time.monotonic()})
+        self._workers[index] = worker
+        logger.info('Started worker %d (pid %d)', index, process.pid)
+
+    def _stop(self, signum, frame):
+        self.stopping = True
+
+    def check_workers(self):
+        """Restart any worker that has exited, backing off if it keeps crashing on start up"""
+        now = time.monotonic()
+        for index, worker in list(self._workers.items()):
+            process = worker['process']
+            if process.is_alive() or self.stopping:
+                continue
+            if 'restart_at' not in worker:
+                logger.error('Worker %d (pid %d) exited with %s', index, process.pid, process.exitcode)
+                if now - worker['started'] < self.min_uptime:
+                    worker['failures'] += 1
+                else:
+                    worker['failures'] = 0
+                backoff = min(self.max_backoff, 2 ** (worker['failures'] - 1)) if worker['failures'] else 0
+                worker['restart_at'] = now + backoff
+            if now >= worker['restart_at']:
+                del worker['restart_at']
+                RESTARTS.inc(worker=str(index))
+                self._start(index)
+
+    def run(self, poll_interval=1):
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        if self.metrics_port:
+            start_metrics_server(self.metrics_port, registry=WorkerRegistry(self.metrics_port, self.processes))
+        for index in range(self.processes):
+            self._start(index)
+
+        while not self.stopping:
+            self.check_workers()
+            time.sleep(poll_interval)
+
+        for worker in self._workers.values():
+            worker['process'].terminate()
+        for worker in self._workers.values():
+            worker['process'].join()
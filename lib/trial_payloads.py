@@ -0,0 +1,152 @@
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.database import Database
+from lib.blob import decode_blob, encode_blob
+from lib.body_frames import CLASSIC, PACKED, encode_body_frames
+from lib.migration import resumable_batches
+import proto.messages_pb2 as messages_pb2
+
+# The large sub-messages of a ShoeTrialResult, kept out of shoeTrialResults in
+# shoeTrialPayloads so lists and reports don't read them. body_frames alone is
+# every bone of every frame.
+FIELDS = ['body_frames', 'alignment', 'qa_msg']
+
+# Bytes per shoeTrialPayloads document, well under the 16MB document limit
+CHUNK_SIZE = 1024 * 1024
+
+SPLIT_SETTING = 'trial_payload_split'
+
+
+def split_payload(msg: messages_pb2.ShoeTrialResult) -> bytes:
+    """Move the payload fields out of a trial, with body_frames packed
+
+    Args:
+        msg (ShoeTrialResult): Trial, left without its payload fields
+
+    Returns:
+        bytes: Encoded ShoeTrialResult holding just the payload fields, empty if it had none
+    """
+    payload = messages_pb2.ShoeTrialResult()
+    for field in FIELDS:
+        if msg.HasField(field):
+            getattr(payload, field).CopyFrom(getattr(msg, field))
+            msg.ClearField(field)
+    if payload.HasField('body_frames'):
+        payload.body_frames.CopyFrom(encode_body_frames(payload.body_frames, PACKED))
+    return payload.SerializeToString()
+
+
+def save_payload(db: Database, recording_id: ObjectId, payload: bytes, chunk_size=CHUNK_SIZE) -> int:
+    """Store a trial's payload in chunks, replacing any already stored
+
+    Args:
+        db (Database): Database
+        recording_id (ObjectId): _id of the trial
+        payload (bytes): Output of split_payload
+        chunk_size (int, optional): Bytes per chunk
+
+    Returns:
+        int: Number of chunks, saved on the trial as payload_chunks
+    """
+    db.shoeTrialPayloads.delete_many({'recording_id': recording_id})
+    chunks = [
+        {'recording_id': recording_id, 'n': n, 'data': payload[i:i + chunk_size]}
+        for n, i in enumerate(range(0, len(payload), chunk_size))]
+    if chunks:
+        db.shoeTrialPayloads.insert_many(chunks, ordered=False)
+    return len(chunks)
+
+
+def load_payload(db: Database, recording_id: ObjectId) -> bytes:
+    """A trial's payload as saved by save_payload
+
+    Args:
+        db (Database): Database
+        recording_id (ObjectId): _id of the trial
+
+    Returns:
+        bytes: Encoded ShoeTrialResult holding just the payload fields
+    """
+    chunks = db.shoeTrialPayloads.find({'recording_id': recording_id}, {'data': 1}).sort('n', ASCENDING)
+    return b''.join(x['data'] for x in chunks)
+
+
+def delete_payload(db: Database, recording_id: ObjectId):
+    db.shoeTrialPayloads.delete_many({'recording_id': recording_id})
+
+
+def trial_payload(db: Database, trial: dict) -> bytes:
+    """The payload of a stored trial, wherever it is kept
+
+    Args:
+        db (Database): Database
+        trial (dict): shoeTrialResults document with _id, bin and payload_chunks
+
+    Returns:
+        bytes: Encoded ShoeTrialResult holding just the payload fields
+    """
+    if 'payload_chunks' in trial:
+        return load_payload(db, trial['_id']) if trial['payload_chunks'] else b''
+    # Saved before payloads were split out and not migrated yet
+    msg = messages_pb2.ShoeTrialResult()
+    msg.ParseFromString(decode_blob(trial['bin']))
+    return split_payload(msg)
+
+
+def encode_payload(payload: bytes, encoding=CLASSIC) -> bytes:
+    """A payload with its body_frames encoded as asked
+
+    Payloads saved before body_frames was packed have classic frames,
+    those saved since have packed_frames. Either is sent as it is when it
+    is already what was asked for.
+
+    Args:
+        payload (bytes): Output of trial_payload
+        encoding (int, optional): CLASSIC, PACKED or PACKED_QUANTIZED, see lib.body_frames
+
+    Returns:
+        bytes: Encoded ShoeTrialResult holding just the payload fields
+    """
+    msg = messages_pb2.ShoeTrialResult()
+    msg.ParseFromString(payload)
+    if not msg.HasField('body_frames'):
+        return payload
+    body_frames = encode_body_frames(msg.body_frames, encoding)
+    if body_frames is msg.body_frames:
+        return payload
+    msg.body_frames.CopyFrom(body_frames)
+    return msg.SerializeToString()
+
+
+def split_trial_payloads(db: Database, batch_size=100, max_batches=None, restart=False) -> int:
+    """Move the payload of the shoeTrialResults saved before it was split out into shoeTrialPayloads
+
+    The payload is saved before the trial drops it, so a trial is never left
+    without one, and dropped again if the trial was rewritten after it was
+    read.
+
+    Args:
+        db (Database): Database
+        batch_size (int, optional): shoeTrialResults per batch
+        max_batches (int, optional): Stop after this many batches, None to run to the end
+        restart (bool, optional): Look again from the first trial
+
+    Returns:
+        int: Number of shoeTrialResults updated
+    """
+    updated = 0
+    for results in resumable_batches(db, 'shoeTrialResults', SPLIT_SETTING, {'payload_chunks': {'$exists': False}},
+                                     {'bin': 1}, batch_size, max_batches, restart):
+        for x in results:
+            msg = messages_pb2.ShoeTrialResult()
+            msg.ParseFromString(decode_blob(x['bin']))
+            chunks = save_payload(db, x['_id'], split_payload(msg))
+            # Only if the trial hasn't been rewritten since it was read
+            res = db.shoeTrialResults.update_one({'_id': x['_id'], 'bin': x['bin'], 'payload_chunks': {'$exists': False}}, {
+                '$set': {'bin': encode_blob(msg.SerializeToString()), 'payload_chunks': chunks},
+                '$unset': {field: '' for field in FIELDS}})
+            if res.matched_count:
+                updated += res.modified_count
+            else:
+                delete_payload(db, x['_id'])
+    return updated
@@ -0,0 +1,101 @@
+from pymongo import UpdateOne
+from pymongo.database import Database
+from lib.blob import decode_blob
+from lib.converter import protobuf_to_dict
+from lib.migration import resumable_batches
+import proto.messages_pb2 as messages_pb2
+
+# The fields of a ShoeTrialResult stored on its shoeTrialResults document
+# next to bin, the only ones queries, sorts, aggregates and lookups can use.
+# Everything else is only in bin. created is the document's own, set when
+# it is saved
+FIELDS = ['customer_id', 'technician_id', 'device_id', 'company_id', 'branch_id', 'recording_date', 'age_days',
+          'metric_mapping_version', 'shoe_brand', 'shoe_name', 'shoe_size', 'shoe_season', 'purchase_decision']
+
+# Maps stored with just some fields of each value, those the customer export
+# and the CSV extract read
+MAP_FIELDS = {
+    'raw_metrics': ['median'],
+    'macro_metric_results': ['score', 'grade']
+}
+
+# Message fields stored before there was a projection, removed by reindex_trials
+UNPROJECTED = [x.name for x in messages_pb2.ShoeTrialResult.DESCRIPTOR.fields
+               if x.name not in FIELDS and x.name not in MAP_FIELDS and x.name not in ['recording_id', 'created']]
+
+REINDEX_SETTING = 'trial_reindex'
+
+
+def trial_projection(msg: messages_pb2.ShoeTrialResult) -> dict:
+    """The fields of a trial stored next to its bin
+
+    Scalars are stored even when left at their default, as before, so
+    queries on them match the same documents.
+
+    Args:
+        msg (ShoeTrialResult): Trial
+
+    Returns:
+        dict: The FIELDS and MAP_FIELDS of the shoeTrialResults document
+    """
+    projected = messages_pb2.ShoeTrialResult()
+    for name in FIELDS:
+        if projected.DESCRIPTOR.fields_by_name[name].message_type is None:
+            setattr(projected, name, getattr(msg, name))
+        elif msg.HasField(name):
+            getattr(projected, name).CopyFrom(getattr(msg, name))
+    data = protobuf_to_dict(projected, including_default_value_fields=True)
+    data = {name: data[name] for name in FIELDS if name in data}
+    for name, keys in MAP_FIELDS.items():
+        data[name] = {key: {x: getattr(value, x) for x in keys} for key, value in getattr(msg, name).items()}
+    return data
+
+
+def expanded_trial(trial: dict, msg=None) -> dict:
+    """A stored trial with every field of its message, as they were all stored before the projection
+
+    Args:
+        trial (dict): shoeTrialResults document, with bin unless msg is given
+        msg (ShoeTrialResult, optional): The trial's message if already in hand, saves decoding bin
+
+    Returns:
+        dict: The document with the rest of the message filled in from bin
+    """
+    if msg is None:
+        msg = messages_pb2.ShoeTrialResult()
+        msg.ParseFromString(decode_blob(trial['bin']))
+    expanded = protobuf_to_dict(msg, including_default_value_fields=True)
+    del expanded['recording_id']
+    expanded.update((key, value) for key, value in trial.items() if key not in MAP_FIELDS)
+    return expanded
+
+
+def reindex_trials(db: Database, batch_size=100, max_batches=None, restart=False) -> int:
+    """Rebuild the projection of every shoeTrialResult from its bin
+
+    Sets FIELDS and MAP_FIELDS from bin and removes the other message fields
+    stored before there was a projection. Run with restart after changing
+    the projection.
+
+    Args:
+        db (Database): Database
+        batch_size (int, optional): shoeTrialResults per batch
+        max_batches (int, optional): Stop after this many batches, None to run to the end
+        restart (bool, optional): Start again from the first trial
+
+    Returns:
+        int: Number of shoeTrialResults looked at, 0 once there are none left
+    """
+    done = 0
+    for results in resumable_batches(db, 'shoeTrialResults', REINDEX_SETTING, projection={'bin': 1},
+                                     batch_size=batch_size, max_batches=max_batches, restart=restart):
+        requests = []
+        for x in results:
+            msg = messages_pb2.ShoeTrialResult()
+            msg.ParseFromString(decode_blob(x['bin']))
+            requests.append(UpdateOne({'_id': x['_id']}, {
+                '$set': trial_projection(msg),
+                '$unset': {name: '' for name in UNPROJECTED}}))
+        db.shoeTrialResults.bulk_write(requests, ordered=False)
+        done += len(results)
+    return done
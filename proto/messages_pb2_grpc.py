@@ -1860,6 +1860,11 @@ class DataStub(object):
                 request_serializer=messages__pb2.CMSQuery.SerializeToString,
                 response_deserializer=messages__pb2.CMSResult.FromString,
                 )
+        self.getShoeTrialResultPayload = channel.unary_unary(
+                '/AvaProtos.Data/getShoeTrialResultPayload',
+                request_serializer=messages__pb2.CMSQuery.SerializeToString,
+                response_deserializer=messages__pb2.ShoeTrialResult.FromString,
+                )
 
 
 class DataServicer(object):
@@ -1929,6 +1934,14 @@ class DataServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def getShoeTrialResultPayload(self, request, context):
+        """Returns the body_frames, alignment and qa_msg of a ShoeTrialResult (using CMSQuery.string_query = recording_id)
+        The lists of ShoeTrialResults are sent without them
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_DataServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -1977,6 +1990,11 @@ def add_DataServicer_to_server(servicer, server):
                     request_deserializer=messages__pb2.CMSQuery.FromString,
                     response_serializer=messages__pb2.CMSResult.SerializeToString,
             ),
+            'getShoeTrialResultPayload': grpc.unary_unary_rpc_method_handler(
+                    servicer.getShoeTrialResultPayload,
+                    request_deserializer=messages__pb2.CMSQuery.FromString,
+                    response_serializer=messages__pb2.ShoeTrialResult.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'AvaProtos.Data', rpc_method_handlers)
@@ -2140,6 +2158,23 @@ class Data(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def getShoeTrialResultPayload(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/AvaProtos.Data/getShoeTrialResultPayload',
+            messages__pb2.CMSQuery.SerializeToString,
+            messages__pb2.ShoeTrialResult.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
 
 class ConfigurationStub(object):
     """Missing associated documentation comment in .proto file."""
@@ -0,0 +1,39 @@
+from pymongo.database import Database
+
+# Compound indexes follow equality, sort, range. The reports match on the
+# company/branch/technician and purchase decision and both range on and sort
+# by recording_date, so recording_date goes last.
+INDEXES = {
+    'shoeTrialResults': [
+        [('company_id', 1), ('recording_date', 1)],
+        [('company_id', 1), ('purchase_decision.decision', 1), ('recording_date', 1)],
+        [('branch_id', 1), ('recording_date', 1)],
+        [('technician_id', 1), ('recording_date', 1)],
+        [('recording_date', 1)],
+        [('customer_id', 1), ('created', 1)]
+    ],
+    'customers': [
+        [('company_id', 1), ('updated', 1)],
+        [('company_id', 1), ('branch_id', 1), ('updated', 1)]
+    ]
+}
+
+# Single field indexes from v001 that are now a prefix of one of the above
+REDUNDANT = {
+    'shoeTrialResults': ['company_id_1', 'branch_id_1', 'technician_id_1', 'customer_id_1']
+}
+
+
+def update(db: Database) -> bool:
+    for collection, indexes in INDEXES.items():
+        for keys in indexes:
+            # Don't block writes to the collection while the index builds
+            db[collection].create_index(keys, background=True)
+
+    # Only drop once the replacements exist, so queries always have an index
+    for collection, names in REDUNDANT.items():
+        existing = db[collection].index_information()
+        for name in names:
+            if name in existing:
+                db[collection].drop_index(name)
+    return True
@@ -0,0 +1,32 @@
+from pymongo.database import Database
+
+# The list RPCs page from a range on their sort key and _id, so _id joins
+# the end of the indexes they sort with to keep the sort out of memory.
+INDEXES = {
+    'shoeTrialResults': [
+        [('customer_id', 1), ('created', 1), ('_id', 1)]
+    ],
+    'customers': [
+        [('company_id', 1), ('updated', 1), ('_id', 1)],
+        [('company_id', 1), ('branch_id', 1), ('updated', 1), ('_id', 1)]
+    ]
+}
+
+# v003 indexes that are now a prefix of one of the above
+REDUNDANT = {
+    'shoeTrialResults': ['customer_id_1_created_1'],
+    'customers': ['company_id_1_updated_1', 'company_id_1_branch_id_1_updated_1']
+}
+
+
+def update(db: Database) -> bool:
+    for collection, indexes in INDEXES.items():
+        for keys in indexes:
+            db[collection].create_index(keys, background=True)
+
+    for collection, names in REDUNDANT.items():
+        existing = db[collection].index_information()
+        for name in names:
+            if name in existing:
+                db[collection].drop_index(name)
+    return True
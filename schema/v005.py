@@ -0,0 +1,32 @@
+import threading
+
+from lib.latest_trial import rebuild_latest_trials
+from pymongo.database import Database
+
+# The customer lists match, sort and page on the latest_trial kept on each
+# customer, and keeping it up to date reads a customer's newest trial.
+INDEXES = {
+    'shoeTrialResults': [
+        [('customer_id', 1), ('recording_date', 1)]
+    ],
+    'customers': [
+        [('latest_trial.recording_date', 1), ('_id', 1)],
+        [('company_id', 1), ('latest_trial.recording_date', 1), ('_id', 1)],
+        [('company_id', 1), ('branch_id', 1), ('latest_trial.recording_date', 1), ('_id', 1)]
+    ]
+}
+
+
+def update(db: Database) -> bool:
+    for collection, indexes in INDEXES.items():
+        for keys in indexes:
+            db[collection].create_index(keys, background=True)
+
+    # Reads every customer and trial, so it doesn't hold up serving. Until it
+    # reaches a customer they only show in the lists once a trial is saved for
+    # them. If the server stops first, python -m utils.rebuild_latest_trials
+    # carries on from where it got to
+    threading.Thread(
+        target=rebuild_latest_trials, args=(db,), kwargs={'restart': True}, name='latest-trial-rebuild',
+        daemon=True).start()
+    return True
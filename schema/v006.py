@@ -0,0 +1,19 @@
+from lib.trial_payloads import split_trial_payloads
+from pymongo.database import Database
+
+# body_frames, alignment and qa_msg move out of shoeTrialResults into chunks
+# read back in order by the trial they belong to
+INDEXES = {
+    'shoeTrialPayloads': [
+        [('recording_id', 1), ('n', 1)]
+    ]
+}
+
+
+def update(db: Database) -> bool:
+    for collection, indexes in INDEXES.items():
+        for keys in indexes:
+            db[collection].create_index(keys, unique=True, background=True)
+
+    split_trial_payloads(db)
+    return True
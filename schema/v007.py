@@ -0,0 +1,10 @@
+from lib.trial_projection import reindex_trials
+from pymongo.database import Database
+
+# shoeTrialResults keep just the projection of lib.trial_projection next to
+# bin, rather than every field of the message
+
+
+def update(db: Database) -> bool:
+    reindex_trials(db, restart=True)
+    return True
@@ -0,0 +1,10 @@
+from lib.cache_sync import COLLECTION
+from pymongo.database import Database
+
+# Server processes poll cacheInvalidations for the documents bumped since
+# they last looked, see lib.cache_sync
+
+
+def update(db: Database) -> bool:
+    db[COLLECTION].create_index([('updated', 1)], background=True)
+    return True
@@ -7,26 +7,63 @@ import logging
 import math
 import time
 from concurrent import futures
+import signal
+import threading
 import grpc
+from grpc_health.v1 import health_pb2_grpc
 
 import proto.messages_pb2 as messages_pb2
 import proto.messages_pb2_grpc as messages_pb2_grpc
 # from interceptors.error_interceptor import ErrorInterceptor
 from config import get_config
-from lib.db import Db
+from lib.admission import AdmissionController
+from lib.db import Db, db_profiles
+from lib.health import HealthMonitor
+from interceptors.admission_interceptor import AdmissionInterceptor
 from interceptors.auth_interceptor import AuthInterceptor
+from interceptors.compression_interceptor import CompressionInterceptor
+from interceptors.metrics_interceptor import MetricsInterceptor
+from lib.metrics import start_metrics_server
+from lib.passthrough import add_passthrough_servicer
+from lib.cache_sync import cache_sync
+from lib.counts import count_cache
+from lib.principal_cache import principal_cache
+from lib.server_settings import channel_options, compression, server_settings
+from lib.supervisor import Supervisor, worker_metrics_port
 from services.companies import CompaniesServicer
 from services.config import ConfigurationServicer
 from services.customers import CustomerServicer
-from services.data import DataServicer
-from services.reports import ReportServicer
+from services.data import TRIAL_RESULT_METHODS, DataServicer
+from services.reports import SALE_RECORD_METHODS, ReportServicer
 from services.shoes import ShoesServicer
 from services.users import UserServicer
-import debugpy
+
+SERVICE_NAMES = [service.full_name for service in messages_pb2.DESCRIPTOR.services_by_name.values()]
+
+
+def server_interceptors(db, config, settings) -> list:
+    """Build the interceptors the server runs every RPC through, outermost first
+
+    Args:
+        db (Database): Database the AuthInterceptor reads principals from
+        config (dict): Server config
+        settings (dict): Server settings
+
+    Returns:
+        list: Interceptors
+    """
+    # Metrics goes first so rejected/unauthenticated calls are still counted
+    # Admission needs the caller's company so has to come after auth
+    return [
+        MetricsInterceptor(),
+        AuthInterceptor(db, config),
+        AdmissionInterceptor(AdmissionController.from_config(config)),
+        CompressionInterceptor(settings['method-compression'])
+    ]
 
 
 class Server():
-    def __init__(self, testing = False):
+    def __init__(self, testing = False, worker_index=None, check_schema=True):
         self.config = get_config()
         self.config['unittesting'] = testing
         if not self.config['staging']:
@@ -36,30 +73,74 @@ class Server():
                 self.certificate_chain = f.read()
 
         self.unittesting = testing
-        db = Db(self.config['db-host'])
+        # Set when running as one of several processes under the Supervisor
+        self.worker_index = worker_index
+        db = Db(self.config['db-host'], db_profiles(self.config), self.config.get('query-log'))
         db.connect()
-        self.database = db.get_database('avaclone' if not testing else 'avaclone-unittests')
-        SchemaManager(self.database).check_and_update_schema()
+        dbname = 'avaclone' if not testing else 'avaclone-unittests'
+        self.database = db.get_database(dbname)
+        # Device uploads and reports each get their own pool so neither can starve the other
+        self.ingest_database = db.get_database(dbname, 'ingest')
+        self.analytics_database = db.get_database(dbname, 'analytics')
+        # 'sync' checks before the port is bound, 'background' checks once the server is up and 'off' leaves it
+        # to another instance
+        self.schema_check = server_settings(self.config)['schema-check'] if check_schema else 'off'
+        if self.schema_check == 'sync':
+            SchemaManager(self.database).check_and_update_schema()
+        principal_cache.configure(self.config.get('principal-cache-size'), self.config.get('principal-cache-ttl'))
+        count_cache.configure(self.config.get('count-cache-ttl'))
+        if worker_index is not None:
+            # The other workers' caches only hear about writes made through this one through Mongo,
+            # cached principals and counts are at most cache-sync-interval seconds stale between them
+            cache_sync.configure(self.database, self.config.get('cache-sync-interval', 1))
     
     def serve(self):
-        interceptors = [AuthInterceptor(self.database, self.config)]
+        settings = server_settings(self.config)
+        interceptors = server_interceptors(self.database, self.config, settings)
+        options = channel_options(settings)
+        if self.worker_index is not None:
+            # Every worker process binds the same ports and the kernel spreads connections between them
+            options.append(('grpc.so_reuseport', 1))
         # if not self.config['staging']:
         #     interceptors.append(ErrorInterceptor())
-        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), interceptors=interceptors)
-        messages_pb2_grpc.add_DataServicer_to_server(DataServicer(self.database), server)
+        server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=settings['workers']),
+            interceptors=interceptors,
+            options=options,
+            maximum_concurrent_rpcs=settings['max-concurrent-rpcs'],
+            compression=compression(settings['compression']))
+        add_passthrough_servicer(
+            messages_pb2_grpc.add_DataServicer_to_server, DataServicer(self.ingest_database), server,
+            TRIAL_RESULT_METHODS)
         messages_pb2_grpc.add_UsersServicer_to_server(UserServicer(self.database, self.config), server)
-        messages_pb2_grpc.add_CustomersServicer_to_server(CustomerServicer(self.database), server)
+        messages_pb2_grpc.add_CustomersServicer_to_server(CustomerServicer(self.database, self.analytics_database), server)
         messages_pb2_grpc.add_ShoesServicer_to_server(ShoesServicer(self.database), server)
         messages_pb2_grpc.add_CompaniesServicer_to_server(CompaniesServicer(self.database, self.config), server)
         messages_pb2_grpc.add_ConfigurationServicer_to_server(ConfigurationServicer(self.database, self.config), server)
-        messages_pb2_grpc.add_ReportsServicer_to_server(ReportServicer(self.database), server)
-        server.add_insecure_port('[::]:50051')
+        add_passthrough_servicer(
+            messages_pb2_grpc.add_ReportsServicer_to_server, ReportServicer(self.database, self.analytics_database), server,
+            SALE_RECORD_METHODS)
+        self.health = HealthMonitor(self.database, SERVICE_NAMES, settings['health-interval-seconds'])
+        health_pb2_grpc.add_HealthServicer_to_server(self.health.servicer, server)
+        server.add_insecure_port(f'[::]:{settings["insecure-port"]}')
         if not self.config['staging']:
             server_credentials = grpc.ssl_server_credentials(((self.private_key, self.certificate_chain,),))
-            server.add_secure_port('[::]:50052', server_credentials)
-        else:
+            server.add_secure_port(f'[::]:{settings["secure-port"]}', server_credentials)
+        elif self.worker_index is None:
+            import debugpy
             debugpy.listen(("localhost", 5678))
         server.start()
+        self.health.start()
+        if self.schema_check == 'background':
+            threading.Thread(
+                target=SchemaManager(self.database).check_and_update_schema, name='schema-check', daemon=True).start()
+        if not self.unittesting:
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.start_drain(server, settings))
+        if self.config.get('metrics-port') and not self.unittesting:
+            metrics_port = self.config['metrics-port']
+            if self.worker_index is not None:
+                metrics_port = worker_metrics_port(metrics_port, self.worker_index)
+            start_metrics_server(metrics_port)
         if self.config['staging']:
             print('Server Started')
         
@@ -67,7 +148,44 @@ class Server():
             server.wait_for_termination()
         return server
 
+    def drain(self, server, settings):
+        """Stop taking new RPCs and give the in-flight ones time to finish
 
-if __name__ == '__main__':
+        Args:
+            server (grpc.Server): Running server
+            settings (dict): Server settings
+        """
+        self.health.drain()
+        # Give envoy a few health checks to notice before the ports close
+        time.sleep(settings['drain-delay-seconds'])
+        server.stop(settings['drain-grace-seconds']).wait()
+
+    def start_drain(self, server, settings):
+        # Signal handlers run on the main thread, which is sat in wait_for_termination
+        threading.Thread(target=self.drain, args=(server, settings), name='drain').start()
+
+
+def run_worker(index):
+    logging.basicConfig()
+    # The supervisor has already brought the schema up to date
+    Server(worker_index=index, check_schema=False).serve()
+
+
+def main():
     logging.basicConfig()
-    Server().serve()
+    config = get_config()
+    processes = server_settings(config).get('processes') or 1
+    if processes == 1:
+        Server().serve()
+        return
+
+    # Update the schema once up front rather than racing in every worker
+    if server_settings(config)['schema-check'] != 'off':
+        db = Db(config['db-host'])
+        SchemaManager(db.get_database('avaclone')).check_and_update_schema()
+        db.close()
+    Supervisor(run_worker, processes, config.get('metrics-port')).run()
+
+
+if __name__ == '__main__':
+    main()
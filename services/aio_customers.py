@@ -0,0 +1,44 @@
+import grpc
+from lib.db import deadline_kwargs
+from lib.pagination import InvalidPageToken, Page
+from lib.resolver import COMPANY_PROJECTION, Resolver, batches_async
+from services.customers import (CUSTOMER_SORTS, CustomerServicer, add_company_names, customer_message,
+                                customers_sort, customer_summary_message)
+
+
+class AioCustomerServicer(CustomerServicer):
+    """CustomerServicer for the grpc.aio server
+
+    getCustomers is read through motor, everything else is inherited and runs
+    on the migration thread pool against pymongo.
+    """
+
+    def __init__(self, db, motor_db, analytics_db=None):
+        super().__init__(db, analytics_db)
+        self.motor_db = motor_db
+
+    async def getCustomers(self, request, context):
+        try:
+            if request.mode:
+                page = Page.from_query(request, **customers_sort(request))
+            else:
+                page = Page.from_query(request, CUSTOMER_SORTS)
+        except InvalidPageToken as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            return
+
+        if request.mode:
+            customers = await self.customers_aggregate(
+                request, context, page, self.motor_db, **deadline_kwargs(context.request_context)).run_async()
+            resolver = Resolver(self.motor_db, {'companies': COMPANY_PROJECTION})
+            async for batch in batches_async(page.results_async(context, customers)):
+                await resolver.load_async('companies', [x['company_id'] for x in batch])
+                for x in batch:
+                    add_company_names(x, resolver.get('companies', x['company_id']))
+                    yield customer_summary_message(x)
+        else:
+            query = self.customers_query(request, context)
+            customers = page.find(
+                self.motor_db.customers, query, **deadline_kwargs(context.request_context, 'max_time_ms'))
+            async for x in page.results_async(context, customers):
+                yield customer_message(x)
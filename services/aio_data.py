@@ -0,0 +1,53 @@
+import grpc
+from lib.db import deadline_kwargs
+from lib.pagination import InvalidPageToken, Page
+import proto.messages_pb2 as messages_pb2
+from services.data import TRIAL_RESULT_PROJECTION, TRIAL_RESULT_SORTS, DataServicer, trial_result_message
+
+
+class AioDataServicer(DataServicer):
+    """DataServicer for the grpc.aio server
+
+    The read RPCs are served from motor on the event loop, everything else is
+    inherited and run on the migration thread pool against pymongo.
+    """
+
+    def __init__(self, db, motor_db):
+        super().__init__(db)
+        self.motor_db = motor_db
+
+    async def getShoeTrialResults(self, request, context):
+        try:
+            page = Page.from_query(request, TRIAL_RESULT_SORTS)
+        except InvalidPageToken as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            return
+        query = self.shoe_trial_results_query(request, context)
+        shoe_trial_results = page.find(
+            self.motor_db.shoeTrialResults, query, TRIAL_RESULT_PROJECTION,
+            **deadline_kwargs(context.request_context, 'max_time_ms'))
+        async for x in page.results_async(context, shoe_trial_results):
+            yield trial_result_message(x)
+
+    async def getShoeTrialResultsByCustomerId(self, request: messages_pb2.CMSQuery, context):
+        try:
+            page = Page.from_query(request, TRIAL_RESULT_SORTS)
+        except InvalidPageToken as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            return
+        query = self.customer_results_query(request, context)
+        shoe_trial_results = page.find(
+            self.motor_db.shoeTrialResults, query, TRIAL_RESULT_PROJECTION,
+            **deadline_kwargs(context.request_context, 'max_time_ms'))
+        async for x in page.results_async(context, shoe_trial_results):
+            yield trial_result_message(x)
+
+    async def countShoeTrialResults(self, request, context):
+        query = self.shoe_trial_results_query(request, context)
+        count = await self.motor_db.shoeTrialResults.count_documents(query, **deadline_kwargs(context.request_context))
+        return messages_pb2.CMSResult(int_result=count)
+
+    async def countShoeTrialResultsByCustomerId(self, request: messages_pb2.CMSQuery, context):
+        query = self.customer_results_query(request, context)
+        count = await self.motor_db.shoeTrialResults.count_documents(query, **deadline_kwargs(context.request_context))
+        return messages_pb2.CMSResult(int_result=count)
@@ -0,0 +1,81 @@
+import asyncio
+
+import grpc
+from decorators.required_role import check_role
+from lib.db import deadline_kwargs
+from lib.pagination import InvalidPageToken
+import proto.messages_pb2 as messages_pb2
+from services.reports import SALE_RECORD_PROJECTION, ReportServicer, records_page, sale_record_message
+
+
+def _run_bound(request_context, query):
+    # Lets the pymongo reads made on a pool thread pick up the RPC's deadline
+    request_context.bind()
+    try:
+        return query()
+    finally:
+        request_context.unbind()
+
+
+class AioReportServicer(ReportServicer):
+    """ReportServicer for the grpc.aio server
+
+    The record streams are read through motor. The dashboard's queries are
+    independent of each other so they are run concurrently rather than one
+    after another. Everything else is inherited and runs on the migration
+    thread pool against pymongo.
+    """
+
+    def __init__(self, db, motor_db, executor=None, analytics_db=None):
+        super().__init__(db, analytics_db)
+        self.motor_db = motor_db
+        self.executor = executor
+
+    async def _stream_records(self, pipeline_for, request, query: messages_pb2.ReportQuery, context, created=False):
+        try:
+            page = records_page(query)
+        except InvalidPageToken as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            return
+        results = self.motor_db.shoeTrialResults.aggregate(
+            pipeline_for(request, page) + [SALE_RECORD_PROJECTION], **deadline_kwargs(context.request_context))
+        async for x in page.results_async(context, results):
+            yield sale_record_message(x, created)
+
+    @check_role([2, 3, 4, 5, 6])
+    async def GetDashboardReport(self, request: messages_pb2.ReportQuery, context) -> messages_pb2.DashboardReport:
+        error = self.dashboard_access_error(request, context)
+        if error:
+            await context.abort(*error)
+            return
+
+        loop = asyncio.get_running_loop()
+        queries = self.dashboard_queries(request)
+        results = await asyncio.gather(*[
+            loop.run_in_executor(self.executor, _run_bound, context.request_context, query) for query in queries.values()])
+        return self.dashboard_report(dict(zip(queries, results)))
+
+    @check_role([2, 3, 4, 5, 6])
+    async def GetNoSaleRecords(self, request: messages_pb2.NoSaleQuery, context):
+        # Always filter by at least a company and a date frame
+        if not request.query.company_id and context.user['role'] not in [5, 6]:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, 'company_id is required')
+            return
+
+        async for msg in self._stream_records(self.no_sale_records_pipeline, request, request.query, context):
+            yield msg
+
+    @check_role([2, 3, 4, 5, 6])
+    async def GetBrandSaleRecords(self, request, context):
+        async for msg in self._stream_records(self.brand_sale_records_pipeline, request, request.query, context):
+            yield msg
+
+    @check_role([2, 3, 4, 5, 6])
+    async def GetTechSaleRecords(self, request: messages_pb2.ReportQuery, context):
+        async for msg in self._stream_records(self.tech_sale_records_pipeline, request, request, context):
+            yield msg
+
+    @check_role([2, 3, 4, 5, 6])
+    async def GetDailySaleScanRecords(self, request: messages_pb2.SaleScanRecordsQuery, context):
+        async for msg in self._stream_records(self.daily_sale_scan_records_pipeline, request, request.query, context, created=True):
+            yield msg
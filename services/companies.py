@@ -1,6 +1,7 @@
 import time
 from bson.errors import InvalidId
-from lib.query_utils import add_creation_attrs, add_update_attrs, cms_to_mongo, skip_and_limit, sort_cursor
+from lib.query_utils import add_creation_attrs, add_update_attrs, cms_to_mongo
+from lib.pagination import request_page
 from lib.counter import Counters
 
 import grpc
@@ -14,6 +15,9 @@ import base64
 import os
 from datetime import datetime
 from lib.ftp import upload_image_to_ftp
+from lib.principal_cache import principal_cache
+from lib.counts import count_cache, count_exact, exists
+from lib.request_context import while_active
 
 class CompaniesServicer(messages_pb2_grpc.CompaniesServicer):
     def __init__(self, db: Database, config):
@@ -62,10 +66,11 @@ class CompaniesServicer(messages_pb2_grpc.CompaniesServicer):
     def getCompanies(self, request: messages_pb2.CMSQuery, context):
         query = cms_to_mongo(request, allowed_filters=['name'])
         self._restrict_to_company_object_id(query, context)
-        companies = self.db.companies.find(query)
-        skip_and_limit(request, companies)
-        sort_cursor(request, companies, ['name'])
-        for x in companies:
+        page = request_page(request, context, ['name'])
+        if page is None:
+            return
+        companies = page.find(self.db.companies, query)
+        for x in page.results(context, while_active(context, companies)):
             # Convert _id to company_id for message
             x['company_id'] = str(x['_id'])
             del x['_id']
@@ -76,7 +81,7 @@ class CompaniesServicer(messages_pb2_grpc.CompaniesServicer):
         # Get a count of companies in the system
         query = cms_to_mongo(request, allowed_filters=['name'])
         self._restrict_to_company_object_id(query, context)
-        count = self.db.companies.count(query)
+        count = count_exact(self.db.companies, query)
         return messages_pb2.CMSResult(
             int_result=count
         )
@@ -96,18 +101,20 @@ class CompaniesServicer(messages_pb2_grpc.CompaniesServicer):
             return
         del data['company_id']
         del data['branches']
-        if not self.db.companies.count({'_id': mongoid}):
+        if not exists(self.db.companies, {'_id': mongoid}):
             context.abort(grpc.StatusCode.NOT_FOUND,
                           'Could not find company with specified id')
             return            
         add_update_attrs(data, context)
         res = self.db.companies.update_one({'_id': mongoid}, {'$set': data})
+        # Blocking/unblocking goes through here
+        principal_cache.invalidate_company(mongoid)
         return messages_pb2.CMSResult(int_result=res.modified_count)
 
     @check_role([6])
     def addCompany(self, request: messages_pb2.Customer, context):
         data = protobuf_to_dict(request, including_default_value_fields=True)
-        if self.db.companies.count({'name': data['name']}):
+        if exists(self.db.companies, {'name': data['name']}):
             context.abort(grpc.StatusCode.ALREADY_EXISTS, 'A company already exists by this name')
             return
 
@@ -140,12 +147,13 @@ class CompaniesServicer(messages_pb2_grpc.CompaniesServicer):
         del data['company_id']
         del data['branches']
 
-        if not self.db.companies.count({'_id': mongoid}):
+        if not exists(self.db.companies, {'_id': mongoid}):
             context.abort(grpc.StatusCode.NOT_FOUND,
                           'Could not find company with specified id')
             return            
         add_update_attrs(data, context)
         res = self.db.companies.update_one({'_id': mongoid}, {'$set': {'licence_expiry': data['licence_expiry'], 'month_count': data['month_count'], 'type': data['type'], 'payment_model': data['payment_model']}})
+        principal_cache.invalidate_company(mongoid)
 
         historyId = ObjectId()
         history = {}
@@ -190,7 +198,7 @@ class CompaniesServicer(messages_pb2_grpc.CompaniesServicer):
 
         del data['company_id']
 
-        if not self.db.companies.count({'_id': mongoid}):
+        if not exists(self.db.companies, {'_id': mongoid}):
             context.abort(grpc.StatusCode.NOT_FOUND,
                           'Could not find company with specified id')
             return            
@@ -208,7 +216,7 @@ class CompaniesServicer(messages_pb2_grpc.CompaniesServicer):
     def getLicenseHistory(self, request: messages_pb2.LicenseHistoryQuery, context):
         company_id = request.company_id
         histories = self.db.transhistories.find({'company_id': company_id})
-        for x in histories:
+        for x in while_active(context, histories):
             del x['_id']
             yield messages_pb2.LicenseHistory(**x)
 
@@ -266,4 +274,7 @@ class CompaniesServicer(messages_pb2_grpc.CompaniesServicer):
         self.db.users.delete_many({'company_id': data['company_id']})
         self.db.shoeTrialResults.delete_many({'company_id': data['company_id']})
         self.db.customers.delete_many({'company_id': data['company_id']})
+        principal_cache.invalidate_company(mongo_id)
+        for collection in ['users', 'shoeTrialResults', 'customers']:
+            count_cache.invalidate(collection, data['company_id'])
         return messages_pb2.CMSResult(int_result=int(res.deleted_count))
\ No newline at end of file
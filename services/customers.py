@@ -1,19 +1,126 @@
 import bson
-from bson.errors import InvalidId
 from pymongo.database import Database
 from decorators.required_role import check_role
-from lib.query_utils import add_creation_attrs, add_update_attrs, cms_to_mongo, restrict_to_company, skip_and_limit, cms_to_customerModel
+from lib.query_utils import add_creation_attrs, add_update_attrs, cms_to_mongo, restrict_to_company, cms_to_customerModel
+from lib.query_planner import CustomerTrialPlan
+from lib.pagination import Page, PagedAggregate, request_page
 import proto.messages_pb2_grpc as messages_pb2_grpc
 import proto.messages_pb2 as messages_pb2
 import grpc
 from bson import BSON, ObjectId
 from lib.timestamp import now
 from lib.converter import protobuf_to_dict
-from lib.query_utils import sort_cursor
+from lib.counts import count_cache, count_total, exists
+from lib.customer_info import sync_customer_info
+from lib.latest_trial import FIELDS as LATEST_TRIAL_FIELDS
+from lib.request_context import while_active
+from lib.resolver import COMPANY_PROJECTION, Resolver, batches
+
+def add_company_names(x, company):
+    """Set company_name and branch_name on a customer, blank if the company is unknown
+
+    Args:
+        x (dict): Customer document
+        company (dict): Company the customer belongs to or None
+    """
+    x['company_name'] = ''
+    x['branch_name'] = ''
+    if company is not None:
+        x['company_name'] = company['name']
+        for branch in company['branches']:
+            if branch['branch_id'] == x['branch_id']:
+                x['branch_name'] = branch['name']
+
+CUSTOMER_SORTS = ['first_name', 'last_name', 'email', 'date_of_birth', 'created', 'updated']
+
+# Customer fields returned by the lists of customers with their latest shoe trial
+LIST_FIELDS = ['email', 'address', 'first_name', 'last_name', 'date_of_birth', 'company_id', 'branch_id', 'gender',
+               'updated', 'created']
+
+# Fields of the latest shoe trial shown with each customer, the lists can sort on any of them
+TRIAL_FIELDS = LATEST_TRIAL_FIELDS
+
+# Only shown by the export and not kept in latest_trial, read from the trial itself
+EXPORT_TRIAL_FIELDS = ['raw_metrics', 'purchase_decision']
+
+# Applied to just the page, after it is selected
+LIST_PROJECTION = {'$project': dict({x: 1 for x in LIST_FIELDS}, latest_trial=1)}
+
+
+def customers_sort(request, default_descending=True) -> dict:
+    """Sort field and direction of the lists of customers with their latest shoe trial
+
+    Unlike the other lists a sort_order of ASCENDING sorts descending here.
+
+    Args:
+        request (CMSQuery): Request
+        default_descending (bool, optional): Direction of the default sort on recording_date
+
+    Returns:
+        dict: sort_by and descending for Page.from_query
+    """
+    if not request.sort_by:
+        return {'sort_by': 'latest_trial.recording_date', 'descending': default_descending}
+    sort_by = 'latest_trial.' + request.sort_by if request.sort_by in TRIAL_FIELDS else request.sort_by
+    return {'sort_by': sort_by, 'descending': request.sort_order == messages_pb2.CMSQuery.ASCENDING}
+
+
+def latest_trial_stages(*queries) -> list:
+    """Stages selecting the customers with a latest shoe trial that match some queries
+
+    Args:
+        *queries (dict): Queries on the customers joined to their trial, trial fields prefixed with shoeTrialResults.
+
+    Returns:
+        list: Pipeline stages, with the predicates planned by CustomerTrialPlan
+    """
+    plan = CustomerTrialPlan()
+    for query in queries:
+        plan.add(query)
+    return plan.stages()
+
+
+def bio_filters(request) -> dict:
+    """Query for the filters of the bio customer lists, run on customers with their latest shoe trial
+
+    Args:
+        request (CMSQuery): Request
+
+    Returns:
+        dict: Query, empty if there are no filters
+    """
+    query = {}
+    if request.company:
+        query['company_id'] = request.company
+    if request.start_millis:
+        query['shoeTrialResults.recording_date'] = {'$gte': request.start_millis, '$lte': request.end_millis}
+    if request.start_bir_millis:
+        query['date_of_birth'] = {'$gte': request.start_bir_millis, '$lte': request.end_bir_millis}
+    if request.gender:
+        query['gender'] = int(request.gender)
+    for field, value in [('shoe_brand', request.brand), ('shoe_name', request.model),
+                         ('shoe_season', request.season), ('shoe_size', request.size)]:
+        if value:
+            query['shoeTrialResults.' + field] = value
+    return query
+
+def customer_summary_message(x) -> messages_pb2.Customer:
+    x['customer_id'] = str(x['_id'])
+    del x['_id']
+    summary = x.pop('latest_trial')
+    x['shoeTrialResults'] = {field: summary[field] for field in TRIAL_FIELDS if summary.get(field) is not None}
+    return messages_pb2.Customer(**x)
+
+def customer_message(x) -> messages_pb2.Customer:
+    x['customer_id'] = str(x['_id'])
+    del x['_id']
+    return messages_pb2.Customer(**x)
 
 class CustomerServicer(messages_pb2_grpc.CustomersServicer):
-    def __init__(self, db):
+    def __init__(self, db, analytics_db=None):
         self.db: Database = db
+        # The bio lists and export read from a secondary when there is one, under the analytics time limit
+        self.analytics_db: Database = analytics_db if analytics_db is not None else db
 
     def getCustomers(self, request, context):
         # query = cms_to_mongo(request, allowed_filters=['first_name', 'last_name', 'email'], start_end_on='updated')
@@ -29,181 +136,117 @@ class CustomerServicer(messages_pb2_grpc.CustomersServicer):
         # skip_and_limit(request, customers)
         # sort_cursor(request, customers, ['first_name', 'last_name', 'email', 'created', 'updated'])
         if request.mode :
-            pipeline = []
-            if context.user['role'] not in [6]:
-                pipeline.append({
-                    '$match': {
-                        'company_id': context.user['company_id']
-                    }
-                })
-            if context.user['role'] == 3:
-                pipeline.append({
-                    '$match': {
-                        'branch_id': context.user['branch_id']
-                    }
-                })
-            pipeline.append(
-                {
-                    "$project": {
-                        "_id": {
-                            "$toString": "$_id"
-                        },
-                        "email": "$email",
-                        "address": "$address",
-                        "first_name": "$first_name",
-                        "last_name": "$last_name",
-                        "date_of_birth": "$date_of_birth",
-                        "company_id": "$company_id",
-                        "branch_id": "$branch_id",
-                        "gender": "$gender",
-                        "updated": "$updated",
-                        "created": "$created"
-                    }
-                }
-            )
-
-            pipeline.append({
-                '$lookup': {
-                    'from': 'shoeTrialResults',
-                    'localField': '_id',
-                    'foreignField': 'customer_id',
-                    'as': 'shoeTrialResults',
-                    'pipeline': [
-                        {
-                            '$project': {
-                                '_id': 0,
-                                'recording_date': '$recording_date',
-                                'shoe_name': '$shoe_name',
-                                'shoe_brand': '$shoe_brand',
-                                'shoe_size': '$shoe_size',
-                                'shoe_season': '$shoe_season'
-                            }
-                        },
-                        {
-                            '$sort': {
-                                'recording_date': - 1
-                            }
-                        },
-                        {
-                            '$group': {
-                                '_id': "$customer_id",
-                                'recording_date': {
-                                    '$first': '$recording_date'
-                                },
-                                'shoe_name': {
-                                    '$first': '$shoe_name'
-                                },
-                                'shoe_brand': {
-                                        '$first': '$shoe_brand'
-                                },
-                                'shoe_size': {
-                                        '$first': '$shoe_size'
-                                },
-                                'shoe_season': {
-                                        '$first': '$shoe_season'
-                                }
-                            }
-                        }
-                    ]
-                },
-            })
-
-            pipeline.append({
-                '$unwind': '$shoeTrialResults'
-            })
-
-            sort = request.sort_by
-            sort_order = request.sort_order
-            if len(sort) > 0:
-                if sort == "shoe_name" or sort == "shoe_brand" or sort == "shoe_size" or sort == "recording_date" or sort == "shoe_season" :
-                    pipeline.append({
-                        "$sort": {
-                            "shoeTrialResults." + sort: -1 if sort_order == 0 else 1
-                        }
-                    })
-                else: 
-                    pipeline.append({
-                        "$sort": {
-                            sort: -1 if sort_order == 0 else 1
-                        }
-                    })
-            else: 
-                pipeline.append({
-                    "$sort": {
-                        "shoeTrialResults.recording_date": -1
-                    }
-                })
-
-            filter_on = []
-            string_query = []
-            match_query = {}
-            if len(request.filter_on) > 0:
-                filter_on = request.filter_on.split(",")
-                string_query = request.string_query.split(",")
-            if len(filter_on) > 0:
-                query_model = cms_to_customerModel(request)
-                matchObj = {}
-                matchObj['$match'] = query_model
-                pipeline.append(matchObj)
-
-            skip = request.skip
-            pipeline.append({
-                '$skip': int(skip)
-            })
+            page = request_page(request, context, **customers_sort(request))
+            if page is None:
+                return
+            customers = self.customers_aggregate(request, context, page).run()
+            for x in self.with_company_names(page.results(context, while_active(context, customers))):
+                yield customer_summary_message(x)
+        else:
+            page = request_page(request, context, CUSTOMER_SORTS)
+            if page is None:
+                return
+            query = self.customers_query(request, context)
+            customers = page.find(self.db.customers, query)
+            for x in page.results(context, while_active(context, customers)):
+                yield customer_message(x)
+
+    def customers_stages(self, request, context) -> list:
+        """Stages listing the caller's customers with their latest shoe trial, for getCustomers and countCustomers in mode
+
+        Args:
+            request (CMSQuery): Request
+            context: grpc context of the RPC
+
+        Returns:
+            list: Pipeline stages, without the paging
+        """
+        match = {}
+        if context.user['role'] not in [6]:
+            match['company_id'] = context.user['company_id']
+        if context.user['role'] == 3:
+            match['branch_id'] = context.user['branch_id']
+
+        return latest_trial_stages(match, cms_to_customerModel(request))
+
+    def customers_pipeline(self, request, context, page: Page = None) -> list:
+        """Pipeline for one page of getCustomers in mode
+
+        Args:
+            request (CMSQuery): Request
+            context: grpc context of the RPC
+            page (Page, optional): Page to select, from the request if not given
+
+        Returns:
+            list: Pipeline
+        """
+        if page is None:
+            page = Page.from_query(request, **customers_sort(request))
+        return self.customers_stages(request, context) + page.stages() + [LIST_PROJECTION]
+
+    def customers_aggregate(self, request, context, page: Page, db=None, **kwargs) -> PagedAggregate:
+        """Page and total of getCustomers in mode
+
+        Args:
+            request (CMSQuery): Request
+            context: grpc context of the RPC
+            page (Page): Page to select
+            db (Database, optional): Database to read, motor on the aio server
+            **kwargs: Passed to aggregate
+
+        Returns:
+            PagedAggregate: Aggregate to run
+        """
+        db = db if db is not None else self.db
+        tenant = context.user['company_id'] if context.user['role'] not in [6] else ''
+        return PagedAggregate(db.customers, self.customers_stages(request, context), page, tenant,
+                              depends=['shoeTrialResults'], after=[LIST_PROJECTION], **kwargs)
+
+    def bio_customers_aggregate(self, request, page: Page) -> PagedAggregate:
+        """Page and total of getBioCustomers
+
+        Args:
+            request (CMSQuery): Request
+            page (Page): Page to select
+
+        Returns:
+            PagedAggregate: Aggregate to run
+        """
+        stages = latest_trial_stages(cms_to_customerModel(request), bio_filters(request))
+        return PagedAggregate(self.analytics_db.customers, stages, page, request.company, depends=['shoeTrialResults'],
+                              after=[LIST_PROJECTION])
+
+    def customers_query(self, request, context) -> dict:
+        query = cms_to_mongo(request, allowed_filters=[
+                             'first_name', 'last_name', 'email'], start_end_on='updated')
+
+        if context.user['role'] not in [6]:
+            restrict_to_company(query, context)
 
-            limit = request.limit
-            pipeline.append({
-                '$limit': int(limit)
-            })
+        # if not self.db.customers.count(query):
+        #     context.abort(grpc.StatusCode.NOT_FOUND,
+        #                 'No results found for this query')
+        #     return
+        return query
 
-            customers = self.db.customers.aggregate(pipeline)
-            for x in customers:
-                if x['company_id']: # Check if company_id is not an empty string
-                    try:
-                        company = self.db.companies.find_one({'_id': ObjectId(x['company_id'])})
-                        if company is not None:
-                            x['company_name'] = company['name']
-                            branch_name = ''
-                            for branch in company['branches']:
-                                if branch['branch_id'] == x['branch_id']:
-                                    branch_name = branch['name']
-                            x['branch_name'] = branch_name
-                        else:
-                            x['company_name'] = ''
-                            x['branch_name'] = ''
-                    except bson.errors.InvalidId:
-                        # Handle the case where company_id is not a valid ObjectId
-                        x['company_name'] = ''
-                        x['branch_name'] = ''
-                else:
-                    # Handle the case where company_id is an empty string
-                    x['company_name'] = ''
-                    x['branch_name'] = ''
+    def company_resolver(self) -> Resolver:
+        return Resolver(self.db, {'companies': COMPANY_PROJECTION})
 
-                x['customer_id'] = str(x['_id'])
-                del x['_id']
-                del x['shoeTrialResults']['_id']
-                yield messages_pb2.Customer(**x)
-        else:
-            query = cms_to_mongo(request, allowed_filters=[
-                                 'first_name', 'last_name', 'email'], start_end_on='updated')
+    def with_company_names(self, customers):
+        """Set company_name and branch_name on a stream of customers, fetching their companies a batch at a time
 
-            if context.user['role'] not in [6]:
-                restrict_to_company(query, context)
+        Args:
+            customers (iterable): Customer documents
 
-            # if not self.db.customers.count(query):
-            #     context.abort(grpc.StatusCode.NOT_FOUND,
-            #                 'No results found for this query')
-            #     return
-
-            customers = self.db.customers.find(query)
-            skip_and_limit(request, customers)
-            sort_cursor(request, customers, [
-                        'first_name', 'last_name', 'email', 'date_of_birth', 'created', 'updated'])
-            for x in customers:
-                x['customer_id'] = str(x['_id'])
-                del x['_id']
-                yield messages_pb2.Customer(**x)
+        Yields:
+            dict: Customer documents
+        """
+        resolver = self.company_resolver()
+        for batch in batches(customers):
+            resolver.load('companies', [x['company_id'] for x in batch])
+            for x in batch:
+                add_company_names(x, resolver.get('companies', x['company_id']))
+                yield x
 
     def countCustomers(self, request, context):
         # query = cms_to_mongo(request, allowed_filters=['first_name', 'last_name', 'email'], start_end_on='updated')
@@ -211,146 +254,14 @@ class CustomerServicer(messages_pb2_grpc.CustomersServicer):
         #     restrict_to_company(query, context)
         # count = self.db.customers.count(query)
         if request.mode :
-            pipeline = []
-            if context.user['role'] not in [6]:
-                pipeline.append({
-                    '$match': {
-                        'company_id': context.user['company_id']
-                    }
-                })
-            if context.user['role'] == 3:
-                pipeline.append({
-                    '$match': {
-                        'branch_id': context.user['branch_id']
-                    }
-                })
-            pipeline.append(
-                {
-                    "$project": {
-                        "_id": {
-                            "$toString": "$_id"
-                        },
-                        "email": "$email",
-                        "address": "$address",
-                        "first_name": "$first_name",
-                        "last_name": "$last_name",
-                        "gender": "$gender",
-                        "updated": "$updated"
-                    }
-                }
-            )
-
-            pipeline.append({
-                '$lookup': {
-                    'from': 'company', # The name of the company collection
-                    'localField': 'company_id', # The field from the customers collection
-                    'foreignField': '_id', # The field from the company collection
-                    'as': 'company_info' # The name of the new array field
-                }
-            })
-
-            pipeline.append({
-                '$lookup': {
-                    'from': 'shoeTrialResults',
-                    'localField': '_id',
-                    'foreignField': 'customer_id',
-                    'as': 'shoeTrialResults',
-                    'pipeline': [
-                        {
-                            '$project': {
-                                                        '_id': 0,
-                                'recording_date': '$recording_date',
-                                'shoe_name': '$shoe_name',
-                                                        'shoe_brand': '$shoe_brand',
-                                                        'shoe_size': '$shoe_size',
-                                                        'shoe_season': '$shoe_season'
-                            }
-                        },
-                        {
-                            '$sort': {
-                                'recording_date': - 1
-                            }
-                        },
-                        {
-                            '$group': {
-                                '_id': "$customer_id",
-                                'recording_date': {
-                                    '$first': '$recording_date'
-                                },
-                                'shoe_name': {
-                                    '$first': '$shoe_name'
-                                },
-                                'shoe_brand': {
-                                        '$first': '$shoe_brand'
-                                },
-                                'shoe_size': {
-                                        '$first': '$shoe_size'
-                                },
-                                'shoe_season': {
-                                        '$first': '$shoe_season'
-                                }
-                            }
-                        }
-                    ]
-                },
-            })
-
-            pipeline.append({
-                '$unwind': '$shoeTrialResults'
-            })
-
-            sort = request.sort_by
-            sort_order = request.sort_order
-            if len(sort) > 0:
-                if sort == "shoe_name" or sort == "shoe_brand" or sort == "shoe_size" or sort == "recording_date" or sort == "shoe_season" :
-                    pipeline.append({
-                        "$sort": {
-                            "shoeTrialResults." + sort: -1 if sort_order == 0 else 1
-                        }
-                    })
-                else: 
-                    pipeline.append({
-                        "$sort": {
-                            sort: -1 if sort_order == 0 else 1
-                        }
-                    })
-            else: 
-                pipeline.append({
-                    "$sort": {
-                        "shoeTrialResults.recording_date": 1
-                    }
-                })
-
-            filter_on = []
-            string_query = []
-            match_query = {}
-            if len(request.filter_on) > 0:
-                filter_on = request.filter_on.split(",")
-                string_query = request.string_query.split(",")
-            if len(filter_on) > 0:
-                query_model = cms_to_customerModel(request)
-                matchObj = {}
-                matchObj['$match'] = query_model
-                pipeline.append(matchObj)
-
-            pipeline.append({
-                "$group": {
-                    "_id": 'null',
-                    "count": { "$sum": 1 }
-                }
-            })
-
-            count = self.db.customers.aggregate(pipeline)
-            count_val = 0
-            for x in count:
-                count_val = x['count']
-
-            return messages_pb2.CMSResult(int_result=count_val)
+            # Same total getCustomers sends with its first page
+            count = self.customers_aggregate(request, context, Page()).count()
+            return messages_pb2.CMSResult(int_result=count)
         else:
             query = cms_to_mongo(request, allowed_filters=['first_name', 'last_name', 'email'], start_end_on='updated')
             if context.user['role'] not in [6,5]:
                 restrict_to_company(query, context)
-            count = self.db.customers.count(query)
+            count = count_total(self.db.customers, query)
             return messages_pb2.CMSResult(int_result=count)
 
     @check_role([6,5,4])
@@ -364,6 +275,7 @@ class CustomerServicer(messages_pb2_grpc.CustomersServicer):
             query['company_id'] = context.user['company_id']
 
         res = self.db.customers.delete_one(query)
+        count_cache.invalidate('customers')
         return messages_pb2.CMSResult(int_result=int(res.deleted_count))
 
     def setCustomer(self, request, context):
@@ -376,7 +288,7 @@ class CustomerServicer(messages_pb2_grpc.CustomersServicer):
                 find_filter = {'_id': mongoid}
                 if not context.user['role'] in [6, 5]:
                     restrict_to_company(find_filter, context)
-                if not self.db.customers.count(find_filter):
+                if not exists(self.db.customers, find_filter):
                     context.abort(grpc.StatusCode.NOT_FOUND, 'Could not find customer with specified id')
                     return
 
@@ -392,594 +304,50 @@ class CustomerServicer(messages_pb2_grpc.CustomersServicer):
 
         
         res = self.db.customers.update_one({'_id': mongoid}, {'$set': data}, True)
+        if res.upserted_id:
+            count_cache.invalidate('customers', data.get('company_id'))
+        elif res.modified_count:
+            # Filtered totals match on the edited fields, and admins can move the customer to another company
+            count_cache.invalidate('customers', data['company_id'] if context.user['role'] not in [6, 5] else None)
         if res.modified_count:
             self.db.shoeTrialResults.update_many({'customer._id': ObjectId(data['customer_id'])}, {'$set': {'customer': data}})
+            sync_customer_info(self.db, mongoid, data)
             return messages_pb2.CMSResult(int_result=res.modified_count)
         elif res.upserted_id:
             return messages_pb2.CMSResult(string_result=str(res.upserted_id))
 
     def getBioCustomers(self, request, context):
-        pipeline = []
-        
-        pipeline.append(
-            {
-                "$project": {
-                    "_id": {
-                        "$toString": "$_id"
-                    },
-                    "email": "$email",
-                    "address": "$address",
-                    "first_name": "$first_name",
-                    "last_name": "$last_name",
-                    "date_of_birth": "$date_of_birth",
-                    "company_id": "$company_id",
-                    "branch_id": "$branch_id",
-                    "gender": "$gender",
-                    "updated": "$updated",
-                    "created": "$created"
-                }
-            }
-        )
-
-        pipeline.append({
-            '$lookup': {
-                'from': 'shoeTrialResults',
-                'localField': '_id',
-                'foreignField': 'customer_id',
-                'as': 'shoeTrialResults',
-                'pipeline': [
-                    {
-                        '$project': {
-                            '_id': 0,
-                            'recording_date': '$recording_date',
-                            'shoe_name': '$shoe_name',
-                            'shoe_brand': '$shoe_brand',
-                            'shoe_size': '$shoe_size',
-                            'shoe_season': '$shoe_season'
-                        }
-                    },
-                    {
-                        '$sort': {
-                            'recording_date': - 1
-                        }
-                    },
-                    {
-                        '$group': {
-                            '_id': "$customer_id",
-                            'recording_date': {
-                                '$first': '$recording_date'
-                            },
-                            'shoe_name': {
-                                '$first': '$shoe_name'
-                            },
-                            'shoe_brand': {
-                                    '$first': '$shoe_brand'
-                            },
-                            'shoe_size': {
-                                    '$first': '$shoe_size'
-                            },
-                            'shoe_season': {
-                                    '$first': '$shoe_season'
-                            }
-                        }
-                    }
-                ]
-            },
-        })
-
-        pipeline.append({
-            '$unwind': '$shoeTrialResults'
-        })
-
-        sort = request.sort_by
-        sort_order = request.sort_order
-        if len(sort) > 0:
-            if sort == "shoe_name" or sort == "shoe_brand" or sort == "shoe_size" or sort == "recording_date" or sort == "shoe_season" :
-                pipeline.append({
-                    "$sort": {
-                        "shoeTrialResults." + sort: -1 if sort_order == 0 else 1
-                    }
-                })
-            else: 
-                pipeline.append({
-                    "$sort": {
-                        sort: -1 if sort_order == 0 else 1
-                    }
-                })
-        else: 
-            pipeline.append({
-                "$sort": {
-                    "shoeTrialResults.recording_date": 1
-                }
-            })
-
-        filter_on = []
-        string_query = []
-        match_query = {}
-        if len(request.filter_on) > 0:
-            filter_on = request.filter_on.split(",")
-            string_query = request.string_query.split(",")
-        if len(filter_on) > 0:
-            query_model = cms_to_customerModel(request)
-            matchObj = {}
-            matchObj['$match'] = query_model
-            pipeline.append(matchObj)
-
-        if request.company:
-            pipeline.append({
-                '$match': {
-                    'company_id': request.company
-                }
-            })
-
-        if request.start_millis:
-            pipeline.append(
-                {
-                    '$match': {
-                        'shoeTrialResults.recording_date': {'$gte': request.start_millis,
-                            '$lte': request.end_millis
-                        }
-                    },
-                }
-            )
-
-        if request.start_bir_millis:
-            pipeline.append(
-                {
-                    '$match': {
-                        'date_of_birth': {'$gte': request.start_bir_millis,
-                            '$lte': request.end_bir_millis
-                        }
-                    }
-                }
-            )
-
-        if request.gender:
-            pipeline.append({
-                '$match': {
-                    'gender': int(request.gender)
-                }
-            })
-
-        if request.brand:
-            pipeline.append({
-                '$match': {
-                    'shoeTrialResults.shoe_brand': request.brand
-                }
-            })
-
-        if request.model:
-            pipeline.append({
-                '$match': {
-                    'shoeTrialResults.shoe_name': request.model
-                }
-            })
-        
-        if request.season:
-            pipeline.append({
-                '$match': {
-                    'shoeTrialResults.shoe_season': request.season
-                }
-            })
-
-        if request.size:
-            pipeline.append({
-                '$match': {
-                    'shoeTrialResults.shoe_size': request.size
-                }
-            })
-
-        skip = request.skip
-        pipeline.append({
-            '$skip': int(skip)
-        })
-
-        limit = request.limit
-        pipeline.append({
-            '$limit': int(limit)
-        })
-
-        customers = self.db.customers.aggregate(pipeline)
-        for x in customers:
-            if x['company_id']: 
-                try:
-                    company = self.db.companies.find_one({'_id': ObjectId(x['company_id'])})
-                    if company is not None:
-                        x['company_name'] = company['name']
-                        branch_name = ''
-                        for branch in company['branches']:
-                            if branch['branch_id'] == x['branch_id']:
-                                branch_name = branch['name']
-                        x['branch_name'] = branch_name
-                    else:
-                        x['company_name'] = ''
-                        x['branch_name'] = ''
-                except bson.errors.InvalidId:
-                    x['company_name'] = ''
-                    x['branch_name'] = ''
-            else:
-                x['company_name'] = ''
-                x['branch_name'] = ''
-
-            x['customer_id'] = str(x['_id'])
-            del x['_id']
-            del x['shoeTrialResults']['_id']
-            yield messages_pb2.Customer(**x)
+        page = request_page(request, context, **customers_sort(request, default_descending=False))
+        if page is None:
+            return
+        customers = self.bio_customers_aggregate(request, page).run()
+        for x in self.with_company_names(page.results(context, while_active(context, customers))):
+            yield customer_summary_message(x)
 
     def countBioCustomers(self, request, context):
-        pipeline = []
+        count = self.bio_customers_aggregate(request, Page()).count()
+        return messages_pb2.CMSResult(int_result=count)
 
-        pipeline.append(
+    def getBioCustomersExport(self, request, context):
+        pipeline = latest_trial_stages(bio_filters(request))
+        pipeline.extend([
             {
-                "$project": {
-                    "_id": {
-                        "$toString": "$_id"
-                    },
-                    "email": "$email",
-                    "address": "$address",
-                    "first_name": "$first_name",
-                    "last_name": "$last_name",
-                    "date_of_birth": "$date_of_birth",
-                    "gender": "$gender",
-                    "updated": "$updated",
-                    "company_id": "$company_id",
+                '$lookup': {
+                    'from': 'shoeTrialResults',
+                    'localField': 'latest_trial.recording_id',
+                    'foreignField': '_id',
+                    'as': 'trial',
+                    'pipeline': [{'$project': dict({'_id': 0}, **{x: 1 for x in EXPORT_TRIAL_FIELDS})}]
                 }
-            }
-        )
-
-        pipeline.append({
-            '$lookup': {
-                'from': 'company', # The name of the company collection
-                'localField': 'company_id', # The field from the customers collection
-                'foreignField': '_id', # The field from the company collection
-                'as': 'company_info' # The name of the new array field
-            }
-        })
-
-        pipeline.append({
-            '$lookup': {
-                'from': 'shoeTrialResults',
-                'localField': '_id',
-                'foreignField': 'customer_id',
-                'as': 'shoeTrialResults',
-                'pipeline': [
-                    {
-                        '$project': {
-                            '_id': 0,
-                            'recording_date': '$recording_date',
-                            'shoe_name': '$shoe_name',
-                            'shoe_brand': '$shoe_brand',
-                            'shoe_size': '$shoe_size',
-                            'shoe_season': '$shoe_season'
-                        }
-                    },
-                    {
-                        '$sort': {
-                            'recording_date': - 1
-                        }
-                    },
-                    {
-                        '$group': {
-                            '_id': "$customer_id",
-                            'recording_date': {
-                                '$first': '$recording_date'
-                            },
-                            'shoe_name': {
-                                '$first': '$shoe_name'
-                            },
-                            'shoe_brand': {
-                                    '$first': '$shoe_brand'
-                            },
-                            'shoe_size': {
-                                    '$first': '$shoe_size'
-                            },
-                            'shoe_season': {
-                                    '$first': '$shoe_season'
-                            }
-                        }
-                    }
-                ]
             },
-        })
-
-        pipeline.append({
-            '$unwind': '$shoeTrialResults'
-        })
-
-        sort = request.sort_by
-        sort_order = request.sort_order
-        if len(sort) > 0:
-            if sort == "shoe_name" or sort == "shoe_brand" or sort == "shoe_size" or sort == "recording_date" or sort == "shoe_season" :
-                pipeline.append({
-                    "$sort": {
-                        "shoeTrialResults." + sort: -1 if sort_order == 0 else 1
-                    }
-                })
-            else: 
-                pipeline.append({
-                    "$sort": {
-                        sort: -1 if sort_order == 0 else 1
-                    }
-                })
-        else: 
-            pipeline.append({
-                "$sort": {
-                    "shoeTrialResults.recording_date": 1
-                }
-            })
-
-        filter_on = []
-        string_query = []
-        match_query = {}
-        if len(request.filter_on) > 0:
-            filter_on = request.filter_on.split(",")
-            string_query = request.string_query.split(",")
-        if len(filter_on) > 0:
-            query_model = cms_to_customerModel(request)
-            matchObj = {}
-            matchObj['$match'] = query_model
-            pipeline.append(matchObj)
-
-        if request.company:
-            pipeline.append({
-                '$match': {
-                    'company_id': request.company
-                }
-            })
-
-        if request.gender:
-            pipeline.append({
-                '$match': {
-                    'gender': int(request.gender)
-                }
-            })
-
-        if request.start_millis:
-            pipeline.append(
-                {
-                    '$match': {
-                        'shoeTrialResults.recording_date': {'$gte': request.start_millis,
-                            '$lte': request.end_millis
-                        }
-                    },
-                }
-            )
-
-        if request.start_bir_millis:
-            pipeline.append(
-                {
-                    '$match': {
-                        'date_of_birth': {'$gte': request.start_bir_millis,
-                            '$lte': request.end_bir_millis
-                        }
-                    }
-                }
-            )
-
-        if request.brand:
-            pipeline.append({
-                '$match': {
-                    'shoeTrialResults.shoe_brand': request.brand
-                }
-            })
-
-        if request.model:
-            pipeline.append({
-                '$match': {
-                    'shoeTrialResults.shoe_name': request.model
-                }
-            })
-        
-        if request.season:
-            pipeline.append({
-                '$match': {
-                    'shoeTrialResults.shoe_season': request.season
-                }
-            })
-
-        if request.size:
-            pipeline.append({
-                '$match': {
-                    'shoeTrialResults.shoe_size': request.size
-                }
-            })
-
-        pipeline.append({
-            "$group": {
-                "_id": 'null',
-                "count": { "$sum": 1 }
-            }
-        })
-
-        count = self.db.customers.aggregate(pipeline)
-        count_val = 0
-        for x in count:
-            count_val = x['count']
-
-        return messages_pb2.CMSResult(int_result=count_val)
-        
-    def getBioCustomersExport(self, request, context):
-        pipeline = []
-        
-        pipeline.append(
             {
-                "$project": {
-                    "_id": {
-                        "$toString": "$_id"
-                    },
-                    "email": "$email",
-                    "address": "$address",
-                    "first_name": "$first_name",
-                    "last_name": "$last_name",
-                    "date_of_birth": "$date_of_birth",
-                    "company_id": "$company_id",
-                    "branch_id": "$branch_id",
-                    "gender": "$gender",
-                    "updated": "$updated",
-                    "created": "$created"
-                }
+                '$project': dict(
+                    {x: 1 for x in LIST_FIELDS},
+                    shoeTrialResults=dict(
+                        {x: '$latest_trial.' + x for x in TRIAL_FIELDS},
+                        **{x: {'$arrayElemAt': ['$trial.' + x, 0]} for x in EXPORT_TRIAL_FIELDS}))
             }
-        )
-
-        pipeline.append({
-            '$lookup': {
-                'from': 'shoeTrialResults',
-                'localField': '_id',
-                'foreignField': 'customer_id',
-                'as': 'shoeTrialResults',
-                'pipeline': [
-                    {
-                        '$project': {
-                            '_id': 0,
-                            'recording_date': '$recording_date',
-                            'shoe_name': '$shoe_name',
-                            'shoe_brand': '$shoe_brand',
-                            'shoe_size': '$shoe_size',
-                            'shoe_season': '$shoe_season',
-                            'raw_metrics' : '$raw_metrics',
-                            'purchase_decision': '$purchase_decision',
-                            # 'right_step_separation' : '$raw_metrics',
-                            # 'body_mass_index' : '$raw_metrics',
-                            # 'running_speed' : '$raw_metrics',
-                            # 'cadence' : '$raw_metrics',
-                            # 'right_ground_contact' : '$raw_metrics',
-                            # 'left_ground_contact' : '$raw_metrics',
-                            # 'avg_ground_contact' : '$raw_metrics',
-                            # 'flight_time' : '$raw_metrics',
-                            # 'vertical_oscillation' : '$raw_metrics',
-                            # 'sideways_oscillation' : '$raw_metrics',
-                            # 'forward_oscillation' : '$raw_metrics',
-                            # 'dynamic_balance' : '$raw_metrics',
-                            # 'stride_length' : '$raw_metrics',
-                            # 'left_overstride' : '$raw_metrics',
-                            # 'right_overstride' : '$raw_metrics',
-                            # 'avg_overstride' : '$raw_metrics',
-                            # 'braking_power' : '$raw_metrics',
-                            # 'left_knee_stability' : '$raw_metrics',
-                            # 'right_knee_stability' : '$raw_metrics',
-                            # 'avg_knee_stability' : '$raw_metrics',
-                            # 'left_GC_vertical_oscillation' : '$raw_metrics',
-                            # 'right_GC_vertical_oscillation' : '$raw_metrics',
-                            # 'avg_GC_vertical_oscillation' : '$raw_metrics',
-                            # 'left_norm_separation' : '$raw_metrics',
-                            # 'right_norm_separation' : '$raw_metrics',
-                            # 'avg_normal_separation' : '$raw_metrics',
-                            # 'left_knee_angle' : '$raw_metrics',
-                            # 'right_knee_angle' : '$raw_metrics',
-                            # 'avg_knee_angle' : '$raw_metrics',
-                            # 'left_knee_flexion' : '$raw_metrics',
-                            # 'right_knee_flexion' : '$raw_metrics',
-                            # 'avg_knee_flexion' : '$raw_metrics',
-                            # 'vertical_stiffness' : '$raw_metrics',
-                            # 'duty_factor' : '$raw_metrics',
-                            # 'right_dorsiflexion' : '$raw_metrics',
-                            # 'left_orsiflexion' : '$raw_metrics',
-                            # 'avg_dorsiflexion' : '$raw_metrics',
-                            # 'VOSL_magnitude' : '$raw_metrics',
-                        }
-                    },
-                    {
-                        '$sort': {
-                            'recording_date': - 1
-                        }
-                    },
-                    {
-                        '$group': {
-                            '_id': "$customer_id",
-                            'recording_date': {
-                                '$first': '$recording_date'
-                            },
-                            'shoe_name': {
-                                '$first': '$shoe_name'
-                            },
-                            'shoe_brand': {
-                                    '$first': '$shoe_brand'
-                            },
-                            'shoe_size': {
-                                    '$first': '$shoe_size'
-                            },
-                            'shoe_season': {
-                                    '$first': '$shoe_season'
-                            },
-                            'raw_metrics': {
-                                    '$first': '$raw_metrics'
-                            },
-                            'purchase_decision': {
-                                '$first': '$purchase_decision'
-                            }
-                        }
-                    }
-                ]
-            },
-        })
-
-        pipeline.append({
-            '$unwind': '$shoeTrialResults'
-        })
-
-        if request.company:
-            pipeline.append({
-                '$match': {
-                    'company_id': request.company
-                }
-            })
-
-        if request.start_millis:
-            pipeline.append(
-                {
-                    '$match': {
-                        'shoeTrialResults.recording_date': {'$gte': request.start_millis,
-                            '$lte': request.end_millis
-                        }
-                    },
-                }
-            )
-
-        if request.start_bir_millis:
-            pipeline.append(
-                {
-                    '$match': {
-                        'date_of_birth': {'$gte': request.start_bir_millis,
-                            '$lte': request.end_bir_millis
-                        }
-                    }
-                }
-            )
-
-        if request.gender:
-            pipeline.append({
-                '$match': {
-                    'gender': int(request.gender)
-                }
-            })
-
-        if request.brand:
-            pipeline.append({
-                '$match': {
-                    'shoeTrialResults.shoe_brand': request.brand
-                }
-            })
-
-        if request.model:
-            pipeline.append({
-                '$match': {
-                    'shoeTrialResults.shoe_name': request.model
-                }
-            })
-        
-        if request.season:
-            pipeline.append({
-                '$match': {
-                    'shoeTrialResults.shoe_season': request.season
-                }
-            })
-
-        if request.size:
-            pipeline.append({
-                '$match': {
-                    'shoeTrialResults.shoe_size': request.size
-                }
-            })
+        ])
 
         def ensure_nested_key_exists(data, keys, default_value):
             if not keys:
@@ -993,28 +361,8 @@ class CustomerServicer(messages_pb2_grpc.CustomersServicer):
                     data[key] = {}
                 ensure_nested_key_exists(data[key], keys[1:], default_value)
 
-        customers = self.db.customers.aggregate(pipeline)
-        for x in customers:
-            if x['company_id']: 
-                try:
-                    company = self.db.companies.find_one({'_id': ObjectId(x['company_id'])})
-                    if company is not None:
-                        x['company_name'] = company['name']
-                        branch_name = ''
-                        for branch in company['branches']:
-                            if branch['branch_id'] == x['branch_id']:
-                                branch_name = branch['name']
-                        x['branch_name'] = branch_name
-                    else:
-                        x['company_name'] = ''
-                        x['branch_name'] = ''
-                except bson.errors.InvalidId:
-                    x['company_name'] = ''
-                    x['branch_name'] = ''
-            else:
-                x['company_name'] = ''
-                x['branch_name'] = ''
-
+        customers = self.analytics_db.customers.aggregate(pipeline)
+        for x in self.with_company_names(while_active(context, customers)):
             x['customer_id'] = str(x['_id'])
             
 
@@ -1116,7 +464,6 @@ class CustomerServicer(messages_pb2_grpc.CustomersServicer):
             # x['no_sales_reason'] = x['shoeTrialResults']['purchase_decision']['no_sale_reason']
             
             del x['_id']
-            del x['shoeTrialResults']['_id']
             del x['shoeTrialResults']['raw_metrics']
             del x['shoeTrialResults']['purchase_decision']
             yield messages_pb2.Customer(**x)
\ No newline at end of file
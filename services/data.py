@@ -9,22 +9,80 @@ import proto.messages_pb2_grpc as messages_pb2_grpc
 from bson import ObjectId
 from bson.errors import InvalidId
 from decorators.required_role import check_role, check_user_role
+from lib.blob import decode_blob, encode_blob
+from lib.body_frames import CLASSIC, PACKED, PACKED_QUANTIZED
 from lib.converter import protobuf_to_dict
+from lib.counts import count_cache, count_exact, count_total
+from lib.customer_info import customer_info
+from lib.latest_trial import trial_deleted, trial_saved
+from lib.passthrough import SerializedMessage, override_fields
+from lib.trial_payloads import delete_payload, encode_payload, save_payload, split_payload, trial_payload
+from lib.trial_projection import expanded_trial, trial_projection
 from lib.query_utils import (add_creation_attrs, cms_to_mongo, cms_to_shoeModel,
-                             restrict_to_company, skip_and_limit, sort_cursor, convert_to_int, save_html_to_file, get_recommedation_value)
+                             restrict_to_company, convert_to_int, save_html_to_file, get_recommedation_value)
 from lib.emai import send_email_with_html_attachment
+from lib.pagination import request_page
+from lib.request_context import get_request_context, while_active
 from lib.timestamp import now
 from pymongo.database import Database
 
+TRIAL_RESULT_SORTS = ['created', 'updated']
+
+
+# Fields trial_result_message and paging read, projected so the rest of each trial isn't decoded just to be dropped
+TRIAL_RESULT_PROJECTION = {'bin': 1, 'created': 1, 'updated': 1}
+
+# Left out of the trials sent by getMinifiedResultsByCustomerId
+MINIFIED_OMITTED = ['micro_metric_scores', 'body_frames', 'alignment', 'qa_msg', 'capture_engine_version',
+                    'recording_filename']
+
+# Streams of trial results send the stored bin rather than a message built from it
+TRIAL_RESULT_METHODS = [
+    '/AvaProtos.Data/getShoeTrialResults',
+    '/AvaProtos.Data/getShoeTrialResultsByCustomerId',
+    '/AvaProtos.Data/getShoeTrialResultPayload'
+]
+
+
+def trial_result_message(x) -> SerializedMessage:
+    """Build the message for a stored shoe trial result from its serialized copy
+
+    The stored bin is sent once decompressed, with recording_id and created
+    appended to replace the ones in it, rather than parsed and serialized
+    again.
+
+    Args:
+        x (dict): shoeTrialResults document, at least the fields of TRIAL_RESULT_PROJECTION
+
+    Returns:
+        SerializedMessage: Encoded messages_pb2.ShoeTrialResult to send
+    """
+    return override_fields(decode_blob(x['bin']), messages_pb2.ShoeTrialResult, recording_id=str(x['_id']), created=x['created'])
+
 
 class DataServicer(messages_pb2_grpc.DataServicer):
     def __init__(self, db: Database):
         self.db = db
 
+    def shoe_trial_results_query(self, request, context) -> dict:
+        # Filter by start and end millis if provided in request
+        query = cms_to_mongo(request)
+
+        # Restrict by company if not an admin
+        if not context.user['role'] in [6, 5]:
+            restrict_to_company(query, context)
+        return query
+
+    def customer_results_query(self, request, context) -> dict:
+        query = cms_to_mongo(request)
+        query = restrict_to_company(query, context)
+        query['customer_id'] = request.string_query
+        return query
+
     @check_role([6, 5, 2])
     def setMetricMapping(self, request, context):
         data = protobuf_to_dict(request, including_default_value_fields=True)
-        data['bin'] = request.SerializeToString()
+        data['bin'] = encode_blob(request.SerializeToString())
         add_creation_attrs(data, context)
         if data['version'] is None:
             context.abort(grpc.StatusCode.INVALID_ARGUMENT,
@@ -48,11 +106,13 @@ class DataServicer(messages_pb2_grpc.DataServicer):
 
     def getMetricMapping(self, request, context):
         query = cms_to_mongo(request)
-        metric_mappings = self.db.metricMappings.find(query)
-        skip_and_limit(request, metric_mappings)
-        for x in metric_mappings:
+        page = request_page(request, context)
+        if page is None:
+            return
+        metric_mappings = page.find(self.db.metricMappings, query)
+        for x in page.results(context, while_active(context, metric_mappings)):
             msg = messages_pb2.MetricMappingMsg()
-            msg.ParseFromString(x['bin'])
+            msg.ParseFromString(decode_blob(x['bin']))
             msg.created = x['created']
             yield msg
 
@@ -69,15 +129,10 @@ class DataServicer(messages_pb2_grpc.DataServicer):
             return messages_pb2.MetricMappingMsg(**doc)
 
     def countShoeTrialResults(self, request, context):
-        # Filter by start and end millis if provided in request
-        query = cms_to_mongo(request)
-
-        # Restrict by company if not an admin
-        if not context.user['role'] in [6, 5]:
-            restrict_to_company(query, context)
+        query = self.shoe_trial_results_query(request, context)
 
         # Get results
-        count = self.db.shoeTrialResults.count(query)
+        count = count_total(self.db.shoeTrialResults, query)
 
         return messages_pb2.CMSResult(int_result=count)
 
@@ -93,14 +148,14 @@ class DataServicer(messages_pb2_grpc.DataServicer):
             return
 
         try:
-            matching_customer_count = self.db.customers.count(
+            customer = self.db.customers.find_one(
                 {'_id': ObjectId(request.customer_id)})
         except InvalidId:
             context.abort(grpc.StatusCode.INVALID_ARGUMENT,
                           'customer_id specified does not exist')
             return
 
-        if not matching_customer_count:
+        if not customer:
             context.abort(grpc.StatusCode.INVALID_ARGUMENT,
                           'customer_id specified does not exist')
             return
@@ -109,64 +164,48 @@ class DataServicer(messages_pb2_grpc.DataServicer):
         request.company_id = str(context.user['company_id'])
         request.branch_id = str(context.user['branch_id'])
 
-        if not self.db.companies.count({'_id': ObjectId(request.company_id), 'branches.devices.device_id': request.device_id}):
+        request_context = get_request_context(context, self.db)
+        if request.device_id not in request_context.device_ids:
             context.abort(grpc.StatusCode.INVALID_ARGUMENT,
                           'specified device_id does not exist')
             return
 
+        mongoid = ObjectId()
+        # The frames go in shoeTrialPayloads
+        payload = split_payload(request)
+
         serialised = request.SerializeToString()
-        data = protobuf_to_dict(request, including_default_value_fields=True)
+        # Only the fields queries use, the rest is read from bin
+        data = trial_projection(request)
         add_creation_attrs(data, context)
 
-        if 'recording_id' in data:
-            del data['recording_id']
-
-        mongoid = ObjectId()
         # Store message encoded in bin attribute
-        data['bin'] = serialised
-        res = self.db.shoeTrialResults.update_one(
-            {'_id': mongoid}, {'$set': data}, True)
+        data['bin'] = encode_blob(serialised)
+        # Copy what the reports need of the customer so they don't have to join on customers
+        data['customer_info'] = customer_info(customer)
+
+        # Saved first so the trial is never without them, and removed again if the trial can't be saved
+        data['payload_chunks'] = save_payload(self.db, mongoid, payload)
+        try:
+            res = self.db.shoeTrialResults.update_one(
+                {'_id': mongoid}, {'$set': data}, True)
+        except Exception:
+            delete_payload(self.db, mongoid)
+            raise
+        count_cache.invalidate('shoeTrialResults', data['company_id'])
+        trial_saved(self.db, dict(data, _id=mongoid))
 
 
         #####################################################################################
 
 
-        user_company_id = context.user['company_id']
-        role_company = self.db.companies.find_one({"_id": ObjectId(user_company_id)})
-
-        licence_expiry = role_company.get('licence_expiry')
-        type_val = role_company.get('type')
-        sendingEmailConfig = False
-        if type_val is not None: 
-            if type_val != 'lite':
-                if licence_expiry is not None:
-                    date_from_value = datetime.fromtimestamp(licence_expiry / 1000.0)
-
-                    # Get the current date and time
-                    current_date = datetime.now()
-
-                    # Compare the two dates
-                    is_current_date_smaller = current_date < date_from_value
-
-                    if is_current_date_smaller:
-                        sendingEmailConfig = True
-                    else:
-                        sendingEmailConfig = False
-                else:
-                    print("Licence expiry date is None")
-                    sendingEmailConfig = False
-            else: 
-                sendingEmailConfig = False
-        else:
-            sendingEmailConfig = False
-
-        if sendingEmailConfig:
+        if request_context.licence_active:
 
-            result = self.db.shoeTrialResults.find_one({"_id": mongoid})
-            customer = self.db.customers.find_one({"_id": ObjectId(result['customer_id'])})
-            user = self.db.users.find_one({"_id": ObjectId(result['technician_id'])})
-            branch_company = self.db.companies.find_one({"_id": ObjectId(user['company_id'])})
-            companies = self.db.companies.find_one({"_id": ObjectId(result['company_id'])})
+            # The trial, technician and both companies are all already in hand
+            result = expanded_trial(data, request)
+            user = context.user
+            branch_company = request_context.company
+            companies = request_context.company
 
 
             with open("/home/AvaAdmin/data/temp_email/template.html", 'r', encoding='utf-8') as file:
@@ -805,90 +844,47 @@ class DataServicer(messages_pb2_grpc.DataServicer):
             return messages_pb2.CMSResult(string_result=str(res.upserted_id))
 
     def getShoeTrialResults(self, request, context):
-        # Filter by start and end millis if provided in request
-        query = cms_to_mongo(request)
-
-        # Restrict by company if not an admin
-        if not context.user['role'] in [6, 5]:
-            restrict_to_company(query, context)
+        page = request_page(request, context, TRIAL_RESULT_SORTS)
+        if page is None:
+            return
+        query = self.shoe_trial_results_query(request, context)
 
         # Get results
-        shoe_trial_results = self.db.shoeTrialResults.find(query)
-        sort_cursor(request, shoe_trial_results, ['created', 'updated'])
-        skip_and_limit(request, shoe_trial_results)
+        shoe_trial_results = page.find(self.db.shoeTrialResults, query, TRIAL_RESULT_PROJECTION)
 
         # Iterate and yield
-        for x in shoe_trial_results:
-            msg = messages_pb2.ShoeTrialResult()
-            msg.ParseFromString(x['bin'])
-            msg.recording_id = str(x['_id'])
-            msg.created = x['created']
-            yield msg
+        for x in page.results(context, while_active(context, shoe_trial_results)):
+            yield trial_result_message(x)
 
     def getShoeTrialResultsByCustomerId(self, request: messages_pb2.CMSQuery, context):
-        query = cms_to_mongo(request)
-        query = restrict_to_company(query, context)
-        query['customer_id'] = request.string_query
+        page = request_page(request, context, TRIAL_RESULT_SORTS)
+        if page is None:
+            return
+        query = self.customer_results_query(request, context)
 
-        shoe_trial_results = self.db.shoeTrialResults.find(query)
-        sort_cursor(request, shoe_trial_results, ['created', 'updated'])
-        skip_and_limit(request, shoe_trial_results)
-        for x in shoe_trial_results:
+        shoe_trial_results = page.find(self.db.shoeTrialResults, query, TRIAL_RESULT_PROJECTION)
+        for x in page.results(context, while_active(context, shoe_trial_results)):
+            yield trial_result_message(x)
+
+    def getMinifiedResultsByCustomerId(self, request: messages_pb2.CMSQuery, context):
+        page = request_page(request, context, TRIAL_RESULT_SORTS)
+        if page is None:
+            return
+        query = self.customer_results_query(request, context)
+        shoe_trial_results = page.find(self.db.shoeTrialResults, query, TRIAL_RESULT_PROJECTION)
+        for x in page.results(context, while_active(context, shoe_trial_results)):
             msg = messages_pb2.ShoeTrialResult()
-            msg.ParseFromString(x['bin'])
+            msg.ParseFromString(decode_blob(x['bin']))
+            for field in MINIFIED_OMITTED:
+                msg.ClearField(field)
             msg.recording_id = str(x['_id'])
             msg.created = x['created']
             yield msg
 
-    def getMinifiedResultsByCustomerId(self, request: messages_pb2.CMSQuery, context):
-        query = cms_to_mongo(request)
-        query = restrict_to_company(query, context)
-        query['customer_id'] = request.string_query
-        shoe_trial_results = self.db.shoeTrialResults.find(
-            query, {'micro_metric_scores': 0, 'body_frames': 0, 'alignment': 0, 'qa_msg': 0, 'capture_engine_version': 0, 'recording_filename': 0})
-        sort_cursor(request, shoe_trial_results, ['created', 'updated'])
-        skip_and_limit(request, shoe_trial_results)
-        for x in shoe_trial_results:
-            del x['bin']
-            if 'customer' in x:
-                del x['customer']
-            macro_metric_results = x['macro_metric_results']
-            del x['macro_metric_results']
-            raw_metrics = x['raw_metrics']
-            del x['raw_metrics']
-            x['recording_id'] = str(x['_id'])
-            del x['_id']
-            del x['creator']
-
-            in_message = messages_pb2.ShoeTrialResult(**x)
-
-            for name, value in macro_metric_results.items():
-                in_message.macro_metric_results[name]
-                for comp, comp_val in value['component_scores'].items():
-                    in_message.macro_metric_results[name].component_scores[comp]
-                    component_score = messages_pb2.ComponentScore(
-                        **comp_val)
-                    in_message.macro_metric_results[name].component_scores[comp].MergeFrom(
-                        component_score)
-                del value['component_scores']
-
-                macro_metric_result = messages_pb2.MacroMetricResult(
-                    **value)
-                in_message.macro_metric_results[name].MergeFrom(
-                    macro_metric_result)
-
-            for name, value in raw_metrics.items():
-                in_message.raw_metrics[name]
-                raw_metric = messages_pb2.RawMetric(**value)
-                in_message.raw_metrics[name].MergeFrom(raw_metric)
-            yield in_message
-
     def countShoeTrialResultsByCustomerId(self, request: messages_pb2.CMSQuery, context):
-        query = cms_to_mongo(request)
-        query = restrict_to_company(query, context)
-        query['customer_id'] = request.string_query
+        query = self.customer_results_query(request, context)
 
-        count = self.db.shoeTrialResults.count(query)
+        count = count_exact(self.db.shoeTrialResults, query)
         return messages_pb2.CMSResult(int_result=count)
 
     @check_role([5, 6, 4, 3, 2])
@@ -899,10 +895,34 @@ class DataServicer(messages_pb2_grpc.DataServicer):
             return
         else:
             try:
-                res = self.db.shoeTrialResults.delete_one(
-                    {'_id': ObjectId(request.string_query)})
+                deleted = self.db.shoeTrialResults.find_one_and_delete(
+                    {'_id': ObjectId(request.string_query)}, {'customer_id': 1})
+                count_cache.invalidate('shoeTrialResults')
             except InvalidId:
                 context.abort(grpc.StatusCode.INVALID_ARGUMENT,
                               'Invalid recording_id')
                 return
-            return messages_pb2.CMSResult(int_result=res.deleted_count)
+            if deleted is not None:
+                delete_payload(self.db, deleted['_id'])
+                trial_deleted(self.db, deleted)
+            return messages_pb2.CMSResult(int_result=int(deleted is not None))
+
+    def getShoeTrialResultPayload(self, request: messages_pb2.CMSQuery, context):
+        try:
+            query = {'_id': ObjectId(request.string_query)}
+        except InvalidId:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, 'Invalid recording_id')
+            return
+        if request.int_query not in [CLASSIC, PACKED, PACKED_QUANTIZED]:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, 'Invalid body_frames encoding')
+            return
+        if not context.user['role'] in [6, 5]:
+            restrict_to_company(query, context)
+
+        trial = self.db.shoeTrialResults.find_one(query, {'bin': 1, 'payload_chunks': 1})
+        if trial is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, 'No results found for this query')
+            return
+        # Old clients leave int_query at 0 and get the frames they always have
+        payload = encode_payload(trial_payload(self.db, trial), request.int_query)
+        return override_fields(payload, messages_pb2.ShoeTrialResult, recording_id=str(trial['_id']))
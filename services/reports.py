@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from functools import partial
 from bson.objectid import ObjectId
 import grpc
 from lib.query_utils import sort_cursor, save_html_to_file, convert_to_int, get_recommedation_value
@@ -8,15 +9,78 @@ from decorators.required_role import check_role
 from lib.timestamp import now, one_month_ago, one_week_ago, two_weeks_ago
 from pymongo.database import Database
 from lib.emai import send_email_with_html_attachment
-import psutil
-from cryptography import x509
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
+from lib.request_context import get_request_context, while_active
+from lib.blob import decode_blob
+from lib.pagination import InvalidPageToken, Page
+from lib.trial_projection import expanded_trial
+from lib.passthrough import SerializedMessage, override_fields
+from lib.resolver import COMPANY_PROJECTION, USER_PROJECTION, Resolver
+
+
+# Fields sale_record_message reads, projected so the rest of each trial isn't decoded just to be dropped
+SALE_RECORD_PROJECTION = {'$project': {'bin': 1, 'company_id': 1, 'branch_id': 1, 'technician_id': 1, 'created': 1, 'recording_date': 1}}
+
+# Streams of sale records send the stored bin rather than a message built from it
+SALE_RECORD_METHODS = [
+    '/AvaProtos.Reports/GetNoSaleRecords',
+    '/AvaProtos.Reports/GetBrandSaleRecords',
+    '/AvaProtos.Reports/GetTechSaleRecords',
+    '/AvaProtos.Reports/GetDailySaleScanRecords'
+]
+
+
+def sale_record_message(x, created=False) -> SerializedMessage:
+    """Build the message for a shoe trial result listed in a report
+
+    The stored bin is sent once decompressed, with the ids from the document
+    appended to replace the ones in it, rather than parsed and serialized
+    again.
+
+    Args:
+        x (dict): shoeTrialResults document, at least the fields of SALE_RECORD_PROJECTION
+        created (bool, optional): Whether to include the created timestamp
+
+    Returns:
+        SerializedMessage: Encoded messages_pb2.ShoeTrialResult to send
+    """
+    fields = {
+        'recording_id': str(x['_id']),
+        'company_id': str(x['company_id']),
+        'branch_id': str(x['branch_id']),
+        'technician_id': str(x['technician_id'])}
+    if created:
+        fields['created'] = x['created']
+    return override_fields(decode_blob(x['bin']), messages_pb2.ShoeTrialResult, **fields)
+
+
+def records_page(query: messages_pb2.ReportQuery) -> Page:
+    """Page of sale records a report query asks for, in recording_date order
+
+    Limits outside 1 to 50 return every record, as they always have.
+
+    Args:
+        query (ReportQuery): Request
+
+    Raises:
+        InvalidPageToken: If the query's page_token can't be used
+
+    Returns:
+        Page: Page
+    """
+    limit = query.limit if 0 < query.limit <= 50 else 0
+    return Page(limit, query.skip, query.page_token, 'recording_date')
 
 
 class ReportServicer(messages_pb2_grpc.ReportsServicer):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, analytics_db=None):
         self.db = db
+        # The report aggregates read from a secondary when there is one. Reads
+        # that follow a write, like GenerateHtml's, stay on db
+        self.analytics_db: Database = analytics_db if analytics_db is not None else db
+
+    def resolver(self) -> Resolver:
+        """Resolver for the technicians and companies a report's rows refer to"""
+        return Resolver(self.analytics_db, {'users': USER_PROJECTION, 'companies': COMPANY_PROJECTION})
 
     def get_no_sales_reasons(self, start, end, company_id=None, branch_id=None, technician_id=None, gender='0', season=None, brand=None):
         pipeline = []
@@ -55,41 +119,14 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                 '$match': {'shoe_season': season}
             })
 
-        if gender == '1':
+        if gender in ('1', '2'):
             pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 1
-                }
-            })
-
-        if gender == '2':
-            pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 2
-                }
+                '$match': {'customer_info.gender': int(gender)}
             })
 
         pipeline.append(
             {'$group': {'_id': '$purchase_decision.no_sale_reason', 'count': {'$sum': 1}}})
-        results = self.db.shoeTrialResults.aggregate(pipeline)
+        results = self.analytics_db.shoeTrialResults.aggregate(pipeline)
         reasons = {}
         for x in results:
             reasons[x['_id']] = x['count']
@@ -138,42 +175,15 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                 '$match': {'shoe_season': season}
             })
 
-        if gender == '1':
-            pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 1
-                }
-            })
-
-        if gender == '2':
-            pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
+        if gender in ('1', '2'):
             pipeline.append({
-                '$match': {
-                'customer_info.gender': 2
-                }
+                '$match': {'customer_info.gender': int(gender)}
             })
 
         pipeline.append(
             {'$group': {'_id': {'date': {'$toDate': '$recording_date'}}, 'count': {'$sum': 1}}})
 
-        results = self.db.shoeTrialResults.aggregate(pipeline)
+        results = self.analytics_db.shoeTrialResults.aggregate(pipeline)
         daily_performance = {}
         for x in results:
             date = x['_id']['date'].strftime('%d/%m/%Y')
@@ -221,42 +231,15 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                 '$match': {'shoe_season': season}
             })
 
-        if gender == '1':
+        if gender in ('1', '2'):
             pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 1
-                }
-            })
-
-        if gender == '2':
-            pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 2
-                }
+                '$match': {'customer_info.gender': int(gender)}
             })
 
         pipeline.append(
             {'$group': {'_id': {'date': {'$toDate': '$recording_date'}}, 'count': {'$sum': 1}}})
         
-        results = self.db.shoeTrialResults.aggregate(pipeline)
+        results = self.analytics_db.shoeTrialResults.aggregate(pipeline)
         daily_performance = {}
         results = list(results)
         for x in results:
@@ -304,42 +287,15 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                 '$match': {'shoe_season': season}
             })
 
-        if gender == '1':
-            pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 1
-                }
-            })
-
-        if gender == '2':
+        if gender in ('1', '2'):
             pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 2
-                }
+                '$match': {'customer_info.gender': int(gender)}
             })
 
         pipeline.append(
             {'$group': {'_id': '$shoe_brand', 'count': {'$sum': 1}}})
 
-        brand_sales = self.db.shoeTrialResults.aggregate(pipeline)
+        brand_sales = self.analytics_db.shoeTrialResults.aggregate(pipeline)
         brands = {}
         for x in brand_sales:
             brands[x['_id']] = x['count']
@@ -382,36 +338,9 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                 '$match': {'shoe_season': season}
             })
 
-        if gender == '1':
-            pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
+        if gender in ('1', '2'):
             pipeline.append({
-                '$match': {
-                'customer_info.gender': 1
-                }
-            })
-
-        if gender == '2':
-            pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 2
-                }
+                '$match': {'customer_info.gender': int(gender)}
             })
 
         pipeline.append(
@@ -426,7 +355,7 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
             }
         )
 
-        brand_sales = self.db.shoeTrialResults.aggregate(pipeline)
+        brand_sales = self.analytics_db.shoeTrialResults.aggregate(pipeline)
 
         brand_sales_summary = {}
         for x in brand_sales:
@@ -484,42 +413,15 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                 '$match': {'shoe_season': season}
             })
 
-        if gender == '1':
-            pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 1
-                }
-            })
-
-        if gender == '2':
+        if gender in ('1', '2'):
             pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 2
-                }
+                '$match': {'customer_info.gender': int(gender)}
             })
 
         pipeline.append(
             {'$group': {'_id': '$shoe_name', 'count': {'$sum': 1}}})
 
-        brand_sales = self.db.shoeTrialResults.aggregate(pipeline)
+        brand_sales = self.analytics_db.shoeTrialResults.aggregate(pipeline)
         brands = {}
         for x in brand_sales:
             brands[x['_id']] = x['count']
@@ -562,36 +464,9 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                 '$match': {'shoe_season': season}
             })
 
-        if gender == '1':
+        if gender in ('1', '2'):
             pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 1
-                }
-            })
-
-        if gender == '2':
-            pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 2
-                }
+                '$match': {'customer_info.gender': int(gender)}
             })
 
         pipeline.append(
@@ -606,9 +481,9 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
             }
         )
 
-        model_sales = self.db.shoeTrialResults.aggregate(pipeline)
+        model_sales = self.analytics_db.shoeTrialResults.aggregate(pipeline)
 
-        model_sales = self.db.shoeTrialResults.aggregate(pipeline)
+        model_sales = self.analytics_db.shoeTrialResults.aggregate(pipeline)
 
         model_sales_summary = {}
         for x in model_sales:
@@ -662,36 +537,9 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                 '$match': {'shoe_season': season}
             })
 
-        if gender == '1':
+        if gender in ('1', '2'):
             pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 1
-                }
-            })
-
-        if gender == '2':
-            pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 2
-                }
+                '$match': {'customer_info.gender': int(gender)}
             })
 
         pipeline.append({'$group': {
@@ -716,14 +564,18 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
             }}
         )
 
-        technician_decisions = self.db.shoeTrialResults.aggregate(pipeline)
+        technician_decisions = list(self.analytics_db.shoeTrialResults.aggregate(pipeline))
+        resolver = self.resolver()
+        resolver.load('users', [x['_id'] for x in technician_decisions])
+        users = [resolver.get('users', x['_id']) for x in technician_decisions]
+        resolver.load('companies', [x['company_id'] for x in users if x])
         technicians = []
-        for x in technician_decisions:
-            user = self.db.users.find_one({'_id': ObjectId(x['_id'])})
+        for x, user in zip(technician_decisions, users):
             if user and user['branch_id']:
-                company = self.db.companies.find_one({'branches.branch_id': user['branch_id']}, {'branches.$'})
+                company = resolver.get('companies', user.get('company_id')) or {}
                 name = user['name']
-                location = company['branches'][0]['name'] if user['branch_id'] else ''
+                location = next(
+                    (branch['name'] for branch in company.get('branches', []) if branch['branch_id'] == user['branch_id']), '')
             else:
                 name = 'Deleted User'
                 location = ''
@@ -743,15 +595,6 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
     def get_size_group_sales(self, start, end, company_id=None, branch_id=None, technician_id=None, season=None, brand=None):
         pipeline = []
 
-        pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
         pipeline.append(
             {
                 '$match': {
@@ -790,12 +633,12 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
         pipeline.append(
             {'$group': {'_id': {'shoe_size': '$shoe_size', 'gender': '$customer_info.gender'}, 'count': {'$sum': 1}}})
 
-        size_sales = self.db.shoeTrialResults.aggregate(pipeline)
+        size_sales = self.analytics_db.shoeTrialResults.aggregate(pipeline)
         size = []
 
         for x in size_sales:
-            gender_list = x['_id'].get('gender', [])
-            gender = int(gender_list[0]) if gender_list else None
+            gender = x['_id'].get('gender')
+            gender = int(gender) if gender is not None else None
 
             if gender != 0:
                 size.append(messages_pb2.SizeGenderSales(**{
@@ -839,45 +682,20 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                 '$match': {'shoe_season': season}
             })
 
-        if gender == '1':
-            pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 1
-                }
-            })
-
-        if gender == '2':
+        if gender in ('1', '2'):
             pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
+                '$match': {'customer_info.gender': int(gender)}
             })
 
-            pipeline.append({
-                '$match': {
-                'customer_info.gender': 2
-                }
-            })
-
-        tableRecords = self.db.shoeTrialResults.aggregate(pipeline)
+        tableRecords = list(self.analytics_db.shoeTrialResults.aggregate(pipeline))
         tableResult = []
 
+        resolver = self.resolver()
+        resolver.load('users', [x['technician_id'] for x in tableRecords])
+        resolver.load('companies', [x['company_id'] for x in tableRecords])
         for x in tableRecords:
-            technicianInfo = self.db.users.find_one({'_id': ObjectId(x['technician_id'])})
-            companyInfo = self.db.companies.find_one({'_id': ObjectId(x['company_id'])})
-            customerInfo = self.db.customers.find_one({'_id': ObjectId(x['customer_id'])})
+            technicianInfo = resolver.get('users', x['technician_id'])
+            companyInfo = resolver.get('companies', x['company_id']) or {}
 
             name = ''
             season = ''
@@ -899,12 +717,12 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
             else:
                 shoe_model = x['shoe_model']
 
-            if customerInfo: 
-                gender = str(customerInfo['gender'])
+            if x.get('customer_info', {}).get('gender') is not None:
+                gender = str(x['customer_info']['gender'])
             else:
                 gender = ''
 
-            matching_entry = next((entry['name'] for entry in companyInfo['branches'] if entry['branch_id'] == x['branch_id']), None)
+            matching_entry = next((entry['name'] for entry in companyInfo.get('branches', []) if entry['branch_id'] == x['branch_id']), None)
 
             tableResult.append(messages_pb2.DashboardTableRecord(**{
                 'id': str(x['_id']),
@@ -943,15 +761,6 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
 
         pipeline = []
 
-        pipeline.append({
-                '$lookup': {
-                    'from': 'customers',
-                    'localField': 'customer_id',
-                    'foreignField': 'customer_id',
-                    'as': 'customer_info'
-                }
-            })
-
         pipeline.append(
             {
                 '$match': {
@@ -993,7 +802,7 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
             }
         })
 
-        aged_sales = self.db.shoeTrialResults.aggregate(pipeline)
+        aged_sales = self.analytics_db.shoeTrialResults.aggregate(pipeline)
 
         aged_count = 0
 
@@ -1004,51 +813,62 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
 
     @check_role([2, 3, 4, 5, 6])
     def GetDashboardReport(self, request: messages_pb2.ReportQuery, context) -> messages_pb2.DashboardReport:
+        error = self.dashboard_access_error(request, context)
+        if error:
+            context.abort(*error)
+            return
+
+        results = {name: query() for name, query in self.dashboard_queries(request).items()}
+        return self.dashboard_report(results)
+
+    def dashboard_access_error(self, request: messages_pb2.ReportQuery, context):
+        """Check the caller may view the dashboard they asked for
+
+        Returns:
+            tuple: (StatusCode, details) to abort with, None if allowed
+        """
         # Always filter by at least a company and a date frame
         if context.user['role'] not in [5, 6]:
             if not request.company_id:
-                context.abort(grpc.StatusCode.INVALID_ARGUMENT,
-                              'company_id is required')
-                return
+                return grpc.StatusCode.INVALID_ARGUMENT, 'company_id is required'
 
             # Ensure that the company specified is allowed for this user
             if not request.company_id == str(context.user['company_id']):
-                context.abort(grpc.StatusCode.PERMISSION_DENIED,
-                              'you cannot view reports for other companies')
-                return
+                return grpc.StatusCode.PERMISSION_DENIED, 'you cannot view reports for other companies'
+        return None
+
+    def dashboard_queries(self, request: messages_pb2.ReportQuery) -> dict:
+        """The independent queries making up a dashboard, none depend on another's result
 
+        Returns:
+            dict: report part -> callable running its query
+        """
         start = request.start_millis
         end = request.end_millis
-        
-        daily_scans = self.get_scans_counts(
-            start, end, request.company_id, request.branch_id, request.technician_id, request.gender, request.season, request.brand)
-        daily_sales = self.get_sales_counts(
-            start, end, request.company_id, request.branch_id, request.technician_id, request.gender, request.season, request.brand)
-        no_sale_reasons = self.get_no_sales_reasons(
-            start, end, request.company_id, request.branch_id, request.technician_id, request.gender, request.season, request.brand)
-        technician_sales = self.get_top_technicians(
-            start, end, request.company_id, request.branch_id, request.gender, request.season, request.brand)
-        brand_sales = self.get_brand_sales(
-            start, end, request.company_id, request.branch_id, request.technician_id, request.gender, request.season, request.brand)
-        brand_sales_table = self.get_brand_sales_table(
-            start, end, request.company_id, request.branch_id, request.technician_id, request.gender, request.season, request.brand)
-        model_sales = self.get_model_sales(
-            start, end, request.company_id, request.branch_id, request.technician_id, request.gender, request.season, request.brand)
-        model_sales_table = self.get_model_sales_table(
-            start, end, request.company_id, request.branch_id, request.technician_id, request.gender, request.season, request.brand)
-        table_records = self.get_table_record(
-            start, end, request.company_id, request.branch_id, request.technician_id, request.gender, request.season, request.brand)
-        size_gender_sales = self.get_size_group_sales(
-            start, end, request.company_id, request.branch_id, request.technician_id, request.season, request.brand
-        )
-        aged_sales_count = self.get_aged_sales(start, end, request.company_id, request.branch_id, request.technician_id, request.brand)
+        filters = (request.company_id, request.branch_id, request.technician_id)
+        return {
+            'daily_scans': partial(self.get_scans_counts, start, end, *filters, request.gender, request.season, request.brand),
+            'daily_sales': partial(self.get_sales_counts, start, end, *filters, request.gender, request.season, request.brand),
+            'no_sale_reasons': partial(self.get_no_sales_reasons, start, end, *filters, request.gender, request.season, request.brand),
+            'technician_sales': partial(self.get_top_technicians, start, end, request.company_id, request.branch_id, request.gender, request.season, request.brand),
+            'brand_sales': partial(self.get_brand_sales, start, end, *filters, request.gender, request.season, request.brand),
+            'brand_sales_table': partial(self.get_brand_sales_table, start, end, *filters, request.gender, request.season, request.brand),
+            'model_sales': partial(self.get_model_sales, start, end, *filters, request.gender, request.season, request.brand),
+            'model_sales_table': partial(self.get_model_sales_table, start, end, *filters, request.gender, request.season, request.brand),
+            'table_records': partial(self.get_table_record, start, end, *filters, request.gender, request.season, request.brand),
+            'size_gender_sales': partial(self.get_size_group_sales, start, end, *filters, request.season, request.brand),
+            'aged_sales_count': partial(self.get_aged_sales, start, end, *filters, request.brand)
+        }
+
+    def dashboard_report(self, results: dict) -> messages_pb2.DashboardReport:
         report = messages_pb2.DashboardReport(
-            daily_sales=daily_sales, daily_scans=daily_scans, no_sale_reasons=no_sale_reasons, brand_sales=brand_sales, model_sales=model_sales, aged_sales_count=aged_sales_count)
-        report.technician_sales.extend(technician_sales)
-        report.dashboard_table_record.extend(table_records)
-        report.size_gender_sales.extend(size_gender_sales)
-        report.brand_sales_table.extend(brand_sales_table)
-        report.model_sales_table.extend(model_sales_table)
+            daily_sales=results['daily_sales'], daily_scans=results['daily_scans'], no_sale_reasons=results['no_sale_reasons'],
+            brand_sales=results['brand_sales'], model_sales=results['model_sales'], aged_sales_count=results['aged_sales_count'])
+        report.technician_sales.extend(results['technician_sales'])
+        report.dashboard_table_record.extend(results['table_records'])
+        report.size_gender_sales.extend(results['size_gender_sales'])
+        report.brand_sales_table.extend(results['brand_sales_table'])
+        report.model_sales_table.extend(results['model_sales_table'])
         return report
 
     @check_role([2, 3, 4, 5, 6])
@@ -1059,6 +879,28 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                           'company_id is required')
             return
 
+        yield from self._stream_records(self.no_sale_records_pipeline, request, request.query, context)
+
+    def _stream_records(self, pipeline_for, request, query: messages_pb2.ReportQuery, context, created=False):
+        """Stream a page of sale records, sending the next page's token in the trailing metadata
+
+        Args:
+            pipeline_for (callable): Takes the request and the Page, returns the pipeline
+            request: Request
+            query (ReportQuery): Report query of the request
+            context: grpc context of the RPC
+            created (bool, optional): Whether to include the created timestamp
+        """
+        try:
+            page = records_page(query)
+        except InvalidPageToken as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+            return
+        results = self.analytics_db.shoeTrialResults.aggregate(pipeline_for(request, page) + [SALE_RECORD_PROJECTION])
+        for x in page.results(context, while_active(context, results)):
+            yield sale_record_message(x, created)
+
+    def no_sale_records_pipeline(self, request: messages_pb2.NoSaleQuery, page: Page = None) -> list:
         pipeline = []
         pipeline.append(
             {
@@ -1085,26 +927,9 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                 '$match': {'branch_id': request.query.branch_id}
             })
 
-        skip = request.query.skip
-        pipeline.append({
-            '$skip': int(skip)
-        })
-
-        limit = request.query.limit
-        if limit <= 50 and limit > 0:
-            pipeline.append({
-                '$limit': int(limit if limit else 10)
-            })
-
-        shoeTrialResults = self.db.shoeTrialResults.aggregate(pipeline)
-        for x in shoeTrialResults:
-            msg = messages_pb2.ShoeTrialResult()
-            msg.ParseFromString(x['bin'])
-            msg.recording_id = str(x['_id'])
-            msg.company_id = str(x['company_id'])
-            msg.branch_id = str(x['branch_id'])
-            msg.technician_id = str(x['technician_id'])
-            yield msg
+        if page is None:
+            page = records_page(request.query)
+        return pipeline + page.stages()
 
     def GetBrandModelSaleCounts(self, request, context):
         pipeline = []
@@ -1131,13 +956,16 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
             })
 
         pipeline.append({'$group': {'_id': '$shoe_name', 'count': {'$sum': 1}}})
-        brand_sale_counts = self.db.shoeTrialResults.aggregate(pipeline)
+        brand_sale_counts = self.analytics_db.shoeTrialResults.aggregate(pipeline)
         sale_counts = {x['_id']: x['count'] for x in brand_sale_counts}
         return messages_pb2.BrandModelSaleCounts(sale_counts=sale_counts)
         
 
     @check_role([2, 3, 4, 5, 6])
     def GetBrandSaleRecords(self, request, context):
+        yield from self._stream_records(self.brand_sale_records_pipeline, request, request.query, context)
+
+    def brand_sale_records_pipeline(self, request, page: Page = None) -> list:
         pipeline = []
         pipeline.append(
             {
@@ -1161,29 +989,15 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                 '$match': {'branch_id': request.query.branch_id}
             })
 
-        skip = request.query.skip
-        pipeline.append({
-            '$skip': int(skip)
-        })
-
-        limit = request.query.limit
-        if limit <= 50 and limit > 0:
-            pipeline.append({
-                '$limit': int(limit if limit else 10)
-            })
-
-        shoeTrialResults = self.db.shoeTrialResults.aggregate(pipeline)
-        for x in shoeTrialResults:
-            msg = messages_pb2.ShoeTrialResult()
-            msg.ParseFromString(x['bin'])
-            msg.recording_id = str(x['_id'])
-            msg.company_id = str(x['company_id'])
-            msg.branch_id = str(x['branch_id'])
-            msg.technician_id = str(x['technician_id'])
-            yield msg
+        if page is None:
+            page = records_page(request.query)
+        return pipeline + page.stages()
 
     @check_role([2, 3, 4, 5, 6])
     def GetTechSaleRecords(self, request: messages_pb2.ReportQuery, context):
+        yield from self._stream_records(self.tech_sale_records_pipeline, request, request, context)
+
+    def tech_sale_records_pipeline(self, request: messages_pb2.ReportQuery, page: Page = None) -> list:
         pipeline = []
 
         pipeline.append(
@@ -1198,29 +1012,15 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
             }
         )
 
-        skip = request.skip
-        pipeline.append({
-            '$skip': int(skip)
-        })
-
-        limit = request.limit
-        if limit <= 50 and limit > 0:
-            pipeline.append({
-                '$limit': int(limit if limit else 10)
-            })
-
-        shoeTrialResults = self.db.shoeTrialResults.aggregate(pipeline)
-        for x in shoeTrialResults:
-            msg = messages_pb2.ShoeTrialResult()
-            msg.ParseFromString(x['bin'])
-            msg.recording_id = str(x['_id'])
-            msg.company_id = str(x['company_id'])
-            msg.branch_id = str(x['branch_id'])
-            msg.technician_id = str(x['technician_id'])
-            yield msg
+        if page is None:
+            page = records_page(request)
+        return pipeline + page.stages()
 
     @check_role([2, 3, 4, 5, 6])
     def GetDailySaleScanRecords(self, request: messages_pb2.SaleScanRecordsQuery, context):
+        yield from self._stream_records(self.daily_sale_scan_records_pipeline, request, request.query, context, created=True)
+
+    def daily_sale_scan_records_pipeline(self, request: messages_pb2.SaleScanRecordsQuery, page: Page = None) -> list:
         pipeline = []
 
         if request.date:
@@ -1264,31 +1064,9 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
                 '$match': {'technician_id': request.query.technician_id}
             })
 
-        pipeline.append({ '$sort': { 'recording_date': 1} })
-
-        
-
-        skip = request.query.skip
-        pipeline.append({
-            '$skip': int(skip)
-        })
-
-        limit = request.query.limit
-        if limit <= 50 and limit > 0:
-            pipeline.append({
-                '$limit': int(limit)
-            })
-
-        results = self.db.shoeTrialResults.aggregate(pipeline)
-        for x in results:
-            msg = messages_pb2.ShoeTrialResult()
-            msg.ParseFromString(x['bin'])
-            msg.recording_id = str(x['_id'])
-            msg.company_id = str(x['company_id'])
-            msg.branch_id = str(x['branch_id'])
-            msg.technician_id = str(x['technician_id'])
-            msg.created = x['created']
-            yield msg
+        if page is None:
+            page = records_page(request.query)
+        return pipeline + page.stages()
 
     @check_role([2, 3, 4, 5, 6])
     def GetSeasons(self, request: messages_pb2.ReportQuery, context) -> messages_pb2.DashboardReport:
@@ -1297,8 +1075,8 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
         pipeline.append(
             {'$group': {'_id': '$shoe_season', 'count': {'$sum': 1}}})
 
-        results = self.db.shoeTrialResults.aggregate(pipeline)
-        for x in results:
+        results = self.analytics_db.shoeTrialResults.aggregate(pipeline)
+        for x in while_active(context, results):
             msg = messages_pb2.SeasonSelector()
             if str(x['_id']) != '':
                 msg.shoe_season = str(x['_id'])
@@ -1311,8 +1089,8 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
         pipeline.append(
             {'$group': {'_id': '$shoe_brand', 'count': {'$sum': 1}}})
 
-        results = self.db.shoeTrialResults.aggregate(pipeline)
-        for x in results:
+        results = self.analytics_db.shoeTrialResults.aggregate(pipeline)
+        for x in while_active(context, results):
             msg = messages_pb2.ShoeTrialResult()
             if str(x['_id']) != '':
                 msg.shoe_brand = str(x['_id'])
@@ -1327,11 +1105,14 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
             report_str = "66a385671787b6f379a2b4ad"
         print(report_str)
         report_id = ObjectId(report_str)
-        result = self.db.shoeTrialResults.find_one({"_id": report_id})
+        # The report reads the metrics, only in bin
+        result = expanded_trial(self.db.shoeTrialResults.find_one({"_id": report_id}))
         customer = self.db.customers.find_one({"_id": ObjectId(result['customer_id'])})
         user = self.db.users.find_one({"_id": ObjectId(result['technician_id'])})
-        branch_company = self.db.companies.find_one({"_id": ObjectId(user['company_id'])})
-        companies = self.db.companies.find_one({"_id": ObjectId(result['company_id'])})
+        # Technician and trial nearly always share a company, only load it once
+        request_context = get_request_context(context, self.db)
+        branch_company = request_context.get_company(user['company_id'])
+        companies = request_context.get_company(result['company_id'])
 
         with open(f"/home/AvaAdmin/data/temp_email/template.html", 'r', encoding='utf-8') as file:
         # with open(f"/home/neymar/AvaAdmin/data/temp_email/template.html", 'r', encoding='utf-8') as file:              
@@ -1964,6 +1745,11 @@ class ReportServicer(messages_pb2_grpc.ReportsServicer):
         return messages_pb2.DashboardReport(aged_sales_count=0)
 
     def GetData(self, request: messages_pb2.DataRequest, context) -> messages_pb2.DataResponse:
+        # Only needed here, keep them out of server start up
+        import psutil
+        from cryptography import x509
+        from cryptography.hazmat.backends import default_backend
+
         certFile = '/etc/letsencrypt/live/api.runright.io/cert.pem'
         fullChainFile = '/etc/letsencrypt/live/api.runright.io/fullchain.pem'
 
@@ -1,10 +1,15 @@
 from decorators.required_role import check_role
-from lib.query_utils import add_creation_attrs, add_update_attrs, cms_to_mongo, cms_to_shoeModel, restrict_to_company, skip_and_limit, sort_cursor
+from lib.query_utils import add_creation_attrs, add_update_attrs, cms_to_mongo, cms_to_shoeModel, restrict_to_company
+from lib.pagination import request_page
 import proto.messages_pb2_grpc as messages_pb2_grpc
 import proto.messages_pb2 as messages_pb2
 import grpc
 from bson import ObjectId
 from lib.converter import protobuf_to_dict
+from lib.counts import count_cache, count_exact, count_total, exists
+from lib.request_context import while_active
+
+SHOE_SORTS = ['brand', 'model', 'ean', 'season', 'gender']
 
 class ShoesServicer(messages_pb2_grpc.ShoesServicer):
     def __init__(self, db):
@@ -26,16 +31,16 @@ class ShoesServicer(messages_pb2_grpc.ShoesServicer):
     def getShoes(self, request, context):
         # query = cms_to_mongo(request, allowed_filters=['ean', 'brand', 'model', 'season','gender'])
         query = cms_to_shoeModel(request)
-        count = self.db.shoes.count(query)
-        if not count:
+        if not exists(self.db.shoes, query):
             context.abort(grpc.StatusCode.NOT_FOUND, 'No results found for this query')
             return
 
-        shoes = self.db.shoes.find(query, {'branches': 0})
-        skip_and_limit(request, shoes)
-        sort_cursor(request, shoes, ['brand', 'model', 'ean', 'season', 'gender'])
+        page = request_page(request, context, SHOE_SORTS)
+        if page is None:
+            return
+        shoes = page.find(self.db.shoes, query, {'branches': 0})
 
-        for x in shoes:
+        for x in page.results(context, while_active(context, shoes)):
             x['shoe_id'] = str(x['_id'])
             del x['_id']
             yield messages_pb2.Shoe(**x)
@@ -43,13 +48,14 @@ class ShoesServicer(messages_pb2_grpc.ShoesServicer):
     def countShoes(self, request, context):
         # query = cms_to_mongo(request, allowed_filters=['ean', 'brand', 'model', 'season','gender'])
         query = cms_to_shoeModel(request)
-        count = self.db.shoes.count(query)
+        count = count_total(self.db.shoes, query)
         return messages_pb2.CMSResult(int_result=count)
 
     def doesEanExist(self, request: messages_pb2.CMSQuery, context):
         if not request.string_query:
             context.abort(grpc.StatusCode.INVALID_ARGUMENT, 'Please specify EAN in string_query')
-        count = self.db.shoes.count({'ean': request.string_query})
+        # EANs are unique so this is the count
+        count = int(exists(self.db.shoes, {'ean': request.string_query}))
         return messages_pb2.CMSResult(int_result=count)
 
     @check_role([6,5])
@@ -67,6 +73,8 @@ class ShoesServicer(messages_pb2_grpc.ShoesServicer):
                 return
 
         res = self.db.shoes.update_one({'_id': mongo_id}, {'$set': data}, upsert=True)
+        if res.upserted_id:
+            count_cache.invalidate('shoes')
         if res.modified_count:
             data['_id'] = mongo_id
             return messages_pb2.CMSResult(int_result=res.modified_count)
@@ -82,6 +90,7 @@ class ShoesServicer(messages_pb2_grpc.ShoesServicer):
             mongo_id = ObjectId()
 
         res = self.db.shoes.delete_one({'_id': mongo_id})
+        count_cache.invalidate('shoes')
         return messages_pb2.CMSResult(int_result=int(res.deleted_count))
 
     def getShoesForBranchId(self, request, context):
@@ -105,11 +114,12 @@ class ShoesServicer(messages_pb2_grpc.ShoesServicer):
         branch_id = request.branch_id
         query = cms_to_shoeModel(request)
         query['branches'] = {'$in': [branch_id]}
-        shoes = self.db.shoes.find(query, {'branches': 0})
-        skip_and_limit(request, shoes)
-        sort_cursor(request, shoes, ['brand', 'model', 'ean', 'season', 'gender'])
+        page = request_page(request, context, SHOE_SORTS)
+        if page is None:
+            return
+        shoes = page.find(self.db.shoes, query, {'branches': 0})
 
-        for x in shoes:
+        for x in page.results(context, while_active(context, shoes)):
             x['shoe_id'] = str(x['_id'])
             del x['_id']
             yield messages_pb2.Shoe(**x)
@@ -121,7 +131,7 @@ class ShoesServicer(messages_pb2_grpc.ShoesServicer):
         query['branches'] = {'$in': [branch_id]}
         shoes = self.db.shoes.find(query, {'branches': 0})
 
-        for shoe in shoes:
+        for shoe in while_active(context, shoes):
             shoe['shoe_id'] = str(shoe['_id'])
             del shoe['_id']
             yield messages_pb2.Shoe(**shoe)
@@ -139,8 +149,7 @@ class ShoesServicer(messages_pb2_grpc.ShoesServicer):
         branch_id = request.branch_id
         query = cms_to_shoeModel(request)
         query['branches'] = {'$in': [branch_id]}
-        shoes = self.db.shoes.find(query, {'branches': 0})
-        res = self.db.shoes.count(query)
+        res = count_exact(self.db.shoes, query)
         return messages_pb2.CMSResult(int_result=res)
 
     def setShoesForBranch(self, request, context):
@@ -154,7 +163,7 @@ class ShoesServicer(messages_pb2_grpc.ShoesServicer):
         query = {}
         shoes = self.db.shoes.find({'brand': brand})
 
-        for shoe in shoes:
+        for shoe in while_active(context, shoes):
             shoe['shoe_id'] = str(shoe['_id'])
             del shoe['_id']
             del shoe['branches']
@@ -173,7 +182,7 @@ class ShoesServicer(messages_pb2_grpc.ShoesServicer):
 
         results = self.db.shoeTrialResults.aggregate(pipeline)
 
-        for shoe in results:
+        for shoe in while_active(context, results):
             if str(shoe['_id']) != '':
                 shoe['size'] = str(shoe['_id'])
             del(shoe['_id'])
@@ -3,18 +3,36 @@ from time import time
 from uuid import uuid4
 from bson.errors import InvalidId
 from lib.emai import send_email
-from lib.query_utils import add_creation_attrs, add_update_attrs, cms_to_mongo, restrict_to_company, skip_and_limit, sort_cursor
+from lib.query_utils import add_creation_attrs, add_update_attrs, cms_to_mongo, restrict_to_company
+from lib.pagination import PagedAggregate, request_page
 import proto.messages_pb2_grpc as messages_pb2_grpc
 import proto.messages_pb2 as messages_pb2
 import grpc
-import bcrypt
 import jwt
 from bson import ObjectId
-import bcrypt
 from lib.timestamp import now
 from lib.converter import protobuf_to_dict
+from lib.counts import count_cache, count_total, exists
+from lib.principal_cache import principal_cache
+from lib.request_context import get_request_context, while_active
 from decorators.required_role import check_role, check_user_role
 
+
+def hash_password(password: str) -> bytes:
+    """Hash a password for storing on a user
+
+    bcrypt is imported here rather than at the top, it is only needed when a password is set.
+
+    Args:
+        password (str): Plain text password
+
+    Returns:
+        bytes: bcrypt hash
+    """
+    import bcrypt
+    return bcrypt.hashpw(password.encode('utf8'), bcrypt.gensalt())
+
+
 class UserServicer(messages_pb2_grpc.UsersServicer):
     def __init__(self, db, config):
         self.db = db
@@ -69,7 +87,7 @@ class UserServicer(messages_pb2_grpc.UsersServicer):
             del data['user_id']
 
         if len(data['password']):
-            data['password'] = bcrypt.hashpw(data['password'].encode('utf8'), bcrypt.gensalt())
+            data['password'] = hash_password(data['password'])
         else:
             del data['password']
 
@@ -79,8 +97,7 @@ class UserServicer(messages_pb2_grpc.UsersServicer):
         # Ensure we have a branch ID on user
         if len(data['branch_id']):
             # Try and parse it into ObjectId
-            exists = self.db.companies.count({'_id': ObjectId(data['company_id']), 'branches.branch_id': data['branch_id']})
-            if not exists:
+            if not exists(self.db.companies, {'_id': ObjectId(data['company_id']), 'branches.branch_id': data['branch_id']}):
                 # If invalid, bail
                 context.abort(grpc.StatusCode.INVALID_ARGUMENT, 'branchId is invalid')
                 return
@@ -92,6 +109,12 @@ class UserServicer(messages_pb2_grpc.UsersServicer):
         data['branch_id'] = str(data['branch_id'])
 
         res = self.db.users.update_one({'_id': mongoid}, {'$set': data}, True)
+        principal_cache.invalidate_user(mongoid)
+        if res.upserted_id:
+            count_cache.invalidate('users', data['company_id'])
+        elif res.modified_count:
+            # Filtered totals match on the edited fields, and admins can move the user to another company
+            count_cache.invalidate('users', data['company_id'] if context.user['role'] not in [6, 5] else None)
         if res.modified_count:
             return messages_pb2.CMSResult()
         elif res.upserted_id:
@@ -103,7 +126,7 @@ class UserServicer(messages_pb2_grpc.UsersServicer):
         if context.user['role'] not in [6, 5, 2]:
             restrict_to_company(query, context)
         
-        count = self.db.users.count(query)
+        count = count_total(self.db.users, query)
         return messages_pb2.CMSResult(
             int_result=count
         )
@@ -117,6 +140,9 @@ class UserServicer(messages_pb2_grpc.UsersServicer):
             query['company_id'] = context.user['company_id']
 
         res = self.db.users.delete_one(query)
+        if res.deleted_count:
+            principal_cache.invalidate_user(query['_id'])
+            count_cache.invalidate('users')
         return messages_pb2.CMSResult(int_result=int(res.deleted_count))
 
 
@@ -143,15 +169,16 @@ class UserServicer(messages_pb2_grpc.UsersServicer):
         else:
             query['role'] = {'$lte' : context.user['role'] } 
 
-        if not self.db.users.count(query):
+        page = request_page(request, context, ['name', 'email', 'created'])
+        if page is None:
+            return
+        # The first page comes with the total, which saves checking there are any separately
+        users = PagedAggregate(self.db.users, [{'$match': query}], page, query.get('company_id', '')).run()
+        if page.total == 0 or (page.total is None and not exists(self.db.users, query)):
             context.abort(grpc.StatusCode.NOT_FOUND, 'No results found for this query')
             return
 
-        users = self.db.users.find(query)
-        skip_and_limit(request, users)
-        sort_cursor(request, users, ['name', 'email', 'created'])
-
-        for x in users:
+        for x in page.results(context, while_active(context, users)):
             # Only allow admins to view all
             # Else only show this company
             if (context.user['role'] in [6, 5, 2]) or (x['company_id'] == context.user['company_id']):
@@ -170,9 +197,11 @@ class UserServicer(messages_pb2_grpc.UsersServicer):
         
         query = {'branch_id': request.string_query}
         restrict_to_company(query, context)
-        users = self.db.users.find(query)
-        skip_and_limit(request, users)
-        for x in users:
+        page = request_page(request, context)
+        if page is None:
+            return
+        users = page.find(self.db.users, query)
+        for x in page.results(context, while_active(context, users)):
             x['user_id'] = str(x['_id'])
             x['company_id'] = str(x['company_id'])
             del x['_id']
@@ -218,7 +247,9 @@ class UserServicer(messages_pb2_grpc.UsersServicer):
                 return
 
         # --------------------------   update part
-        company = self.db.companies.find_one({'_id': ObjectId(str(user['company_id']))})
+        request_context = get_request_context(context, self.db)
+        request_context.user = user
+        company = request_context.company
         user['licence_expiry'] = company.get('licence_expiry', 0)
         # if user['licence_expiry'] == 0 and user['role'] == 3:
         #     context.abort(grpc.StatusCode.PERMISSION_DENIED, 'This user can not join because of subscription')
@@ -303,7 +334,7 @@ class UserServicer(messages_pb2_grpc.UsersServicer):
             context.abort(grpc.StatusCode.NOT_FOUND, 'Password reset link has expired')
             return
 
-        password = bcrypt.hashpw(request.password.encode('utf8'), bcrypt.gensalt())
+        password = hash_password(request.password)
         self.db.users.update_one({'_id': ObjectId(user['_id'])}, {'$set': {'password': password}})
         self.db.users.update_one({'_id': ObjectId(user['_id'])}, {'$unset': {'reset_token': 1}})
         return messages_pb2.CMSResult()
\ No newline at end of file
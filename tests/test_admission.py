@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+
+import grpc
+from interceptors.admission_interceptor import AdmissionInterceptor
+from lib.admission import AdmissionController
+from tests.utils.testing_context import TestingContext
+
+REPORT = '/AvaProtos.Reports/GetDashboardReport'
+UPLOAD = '/AvaProtos.Data/setShoeTrialResult'
+
+
+class TestAdmission(unittest.TestCase):
+    def test_service_limit(self):
+        controller = AdmissionController(service_limits={'AvaProtos.Reports': 1})
+        slot, reason = controller.acquire(REPORT, 'a')
+        self.assertIsNotNone(slot)
+        self.assertEqual(controller.acquire(REPORT, 'b'), (None, 'service'))
+        # Other services are unaffected
+        self.assertIsNotNone(controller.acquire('/AvaProtos.Shoes/getShoes', 'b')[0])
+        controller.release(slot)
+        self.assertIsNotNone(controller.acquire(REPORT, 'b')[0])
+
+    def test_company_limit(self):
+        controller = AdmissionController(company_limit=2)
+        controller.acquire(REPORT, 'a')
+        controller.acquire(REPORT, 'a')
+        self.assertEqual(controller.acquire(REPORT, 'a'), (None, 'company'))
+        self.assertIsNotNone(controller.acquire(REPORT, 'b')[0])
+        # Callers without a company (admins) only count towards the global limits
+        self.assertIsNotNone(controller.acquire(REPORT, None)[0])
+
+    def test_priority_lane(self):
+        controller = AdmissionController(max_in_flight=1, company_limit=1, company_rate=1, company_burst=1)
+        controller.acquire(REPORT, 'a')
+        self.assertEqual(controller.acquire(REPORT, 'b'), (None, 'server'))
+        for _ in range(5):
+            self.assertEqual(controller.acquire(UPLOAD, 'a'), ((), None))
+
+    def test_rate_limit(self):
+        controller = AdmissionController(company_rate=10, company_burst=2)
+        with patch('lib.admission.time.monotonic', return_value=100.0):
+            slot, _ = controller.acquire(REPORT, 'a')
+            controller.release(slot)
+            slot, _ = controller.acquire(REPORT, 'a')
+            controller.release(slot)
+            self.assertEqual(controller.acquire(REPORT, 'a'), (None, 'rate'))
+            self.assertIsNotNone(controller.acquire(REPORT, 'b')[0])
+        # Refills at company-rate tokens per second
+        with patch('lib.admission.time.monotonic', return_value=100.2):
+            self.assertIsNotNone(controller.acquire(REPORT, 'a')[0])
+
+    def test_from_config(self):
+        controller = AdmissionController.from_config({'admission': {'max-in-flight': 3, 'priority-methods': []}})
+        self.assertEqual(controller.max_in_flight, 3)
+        self.assertIsNone(controller.company_limit)
+        self.assertNotIn(UPLOAD, controller.priority_methods)
+        self.assertIn(UPLOAD, AdmissionController.from_config({}).priority_methods)
+
+    def test_interceptor(self):
+        controller = AdmissionController(company_limit=1)
+        interceptor = AdmissionInterceptor(controller)
+        user = {'email': 'tech@testing.com', 'company_id': 'a', 'role': 2}
+
+        def stream(request, context):
+            yield 1
+            yield 2
+
+        responses = interceptor.intercept(stream, None, TestingContext(user), REPORT)
+        self.assertEqual(next(responses), 1)
+
+        # The stream holds the company's only slot until it finishes
+        context = TestingContext(user)
+        self.assertIsNone(interceptor.intercept(lambda r, c: 'ok', None, context, REPORT))
+        self.assertEqual(context.status_code, grpc.StatusCode.RESOURCE_EXHAUSTED)
+
+        self.assertEqual(list(responses), [2])
+        self.assertEqual(controller.in_flight(), {})
+        self.assertEqual(interceptor.intercept(lambda r, c: 'ok', None, TestingContext(user), REPORT), 'ok')
+
+
+if __name__ == '__main__':
+    unittest.main()
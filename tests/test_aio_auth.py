@@ -0,0 +1,81 @@
+import asyncio
+from concurrent import futures
+
+import grpc
+import jwt
+from decorators.required_role import check_role
+from interceptors.aio_auth_interceptor import AioAuthInterceptor
+from interceptors.auth_interceptor import AuthInterceptor
+from proto import messages_pb2, messages_pb2_grpc
+from tests.test_servicer import TestServicer
+
+
+class ExampleServicer(messages_pb2_grpc.ShoesServicer):
+    @check_role([4, 5, 6])
+    async def getShoe(self, request, context):
+        return messages_pb2.Shoe(brand=context.user['email'])
+
+    async def getShoes(self, request, context):
+        for _ in range(2):
+            yield messages_pb2.Shoe(brand=context.user['email'])
+
+    def countShoes(self, request, context):
+        # Sync handlers run on the migration thread pool
+        return messages_pb2.CMSResult(string_result=context.user['email'])
+
+
+class TestAioAuthInterceptor(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.config = {'jwt-key': 'fake_jwt_key'}
+        company_id, branch_ids = self.data_generator.generate_fake_company(1, generate_shoes=False)
+        _, self.manager = self.data_generator.generate_fake_user(4, company_id, branch_ids[0])
+        _, self.technician = self.data_generator.generate_fake_user(2, company_id, branch_ids[0])
+
+    def metadata(self, user):
+        return (('authorization', f'token {jwt.encode(user, self.config["jwt-key"], algorithm="HS256")}'),)
+
+    def call(self, test):
+        async def run():
+            server = grpc.aio.server(
+                migration_thread_pool=futures.ThreadPoolExecutor(max_workers=2),
+                interceptors=[AioAuthInterceptor(AuthInterceptor(self.db, self.config))])
+            messages_pb2_grpc.add_ShoesServicer_to_server(ExampleServicer(), server)
+            port = server.add_insecure_port('127.0.0.1:0')
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(f'127.0.0.1:{port}') as channel:
+                    return await test(messages_pb2_grpc.ShoesStub(channel))
+            finally:
+                await server.stop(None)
+        return asyncio.run(run())
+
+    def test_async_handlers_see_user(self):
+        async def test(stub):
+            shoe = await stub.getShoe(messages_pb2.CMSQuery(), metadata=self.metadata(self.manager))
+            shoes = [x async for x in stub.getShoes(messages_pb2.CMSQuery(), metadata=self.metadata(self.manager))]
+            return shoe, shoes
+        shoe, shoes = self.call(test)
+        self.assertEqual(shoe.brand, self.manager['email'])
+        self.assertEqual([x.brand for x in shoes], [self.manager['email']] * 2)
+
+    def test_sync_handler_sees_user(self):
+        async def test(stub):
+            return await stub.countShoes(messages_pb2.CMSQuery(), metadata=self.metadata(self.technician))
+        self.assertEqual(self.call(test).string_result, self.technician['email'])
+
+    def test_rejections(self):
+        async def test(stub):
+            errors = []
+            for call, metadata in [(stub.getShoe, ()), (stub.countShoes, (('authorization', 'malformed'),)),
+                                   (stub.getShoe, self.metadata(self.technician))]:
+                try:
+                    await call(messages_pb2.CMSQuery(), metadata=metadata)
+                except grpc.aio.AioRpcError as e:
+                    errors.append((e.code(), e.details()))
+            return errors
+        self.assertEqual(self.call(test), [
+            (grpc.StatusCode.UNAUTHENTICATED, 'No authorization header provided'),
+            (grpc.StatusCode.UNAUTHENTICATED, 'Authorization header is malformed'),
+            (grpc.StatusCode.PERMISSION_DENIED, 'You do not have permission to perform this action')
+        ])
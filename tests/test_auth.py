@@ -4,6 +4,7 @@ import grpc
 import jwt
 from proto import messages_pb2
 from interceptors.auth_interceptor import AuthInterceptor
+from lib.principal_cache import PrincipalCache
 from tests.test_servicer import TestServicer
 from tests.utils.testing_context import TestingContext
 from freezegun import freeze_time
@@ -76,3 +77,25 @@ class TestAuthInterceptor(TestServicer):
         self.assertEqual(self.context.detail, 'This account has been locked')
         self.assertEqual(self.context.status_code, grpc.StatusCode.PERMISSION_DENIED)
         self.assertIsNone(result)
+
+    def test_cached_principal(self):
+        cache = PrincipalCache()
+        user_id, user = self.data_generator.generate_fake_user(2)
+        token = jwt.encode(user, self.config['jwt-key'], algorithm="HS256")
+        self.context.set_token(token)
+        interceptor = AuthInterceptor(self.db, self.config, cache)
+        self.assertTrue(interceptor.intercept(lambda a,b : a, messages_pb2.CMSQuery(), self.context, '/AvaProtos/ExampleMethod'))
+        self.assertEqual(cache.stats()['misses'], 1)
+
+        # Lock the user behind the cache's back, cached principal is still served
+        self.db.users.update_one({'_id': ObjectId(user_id)}, {'$set': {'locked': True}})
+        self.assertTrue(interceptor.intercept(lambda a,b : a, messages_pb2.CMSQuery(), self.context, '/AvaProtos/ExampleMethod'))
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(str(self.context.user['_id']), user_id)
+        self.assertNotIn('password', self.context.user)
+
+        # Once invalidated the lock is picked up
+        cache.invalidate_user(user_id)
+        result = interceptor.intercept(lambda a,b : a, messages_pb2.CMSQuery(), self.context, '/AvaProtos/ExampleMethod')
+        self.assertEqual(self.context.detail, 'This account has been locked')
+        self.assertIsNone(result)
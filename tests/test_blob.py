@@ -0,0 +1,67 @@
+import os
+import unittest
+
+from lib.blob import LZMA, RAW, ZLIB, blob_codec, decode_blob, encode_blob, recompress_blobs
+from lib.trial_payloads import split_payload
+from proto import messages_pb2
+from tests.test_servicer import TestServicer
+from tests.test_trial_payloads import stored_trial
+
+
+class TestBlob(unittest.TestCase):
+    def setUp(self):
+        self.data = messages_pb2.ShoeTrialResult(shoe_brand='Nike', shoe_name='Pegasus' * 50).SerializeToString()
+
+    def test_round_trip(self):
+        for codec in [RAW, ZLIB, LZMA]:
+            blob = encode_blob(self.data, codec)
+            self.assertEqual(blob_codec(blob), codec)
+            self.assertEqual(decode_blob(blob), self.data)
+        self.assertLess(len(encode_blob(self.data)), len(self.data))
+        self.assertEqual(decode_blob(encode_blob(b'')), b'')
+
+    def test_stored_before_envelope(self):
+        self.assertIsNone(blob_codec(self.data))
+        self.assertEqual(decode_blob(self.data), self.data)
+        self.assertEqual(decode_blob(b''), b'')
+
+    def test_incompressible(self):
+        data = os.urandom(100)
+        self.assertEqual(encode_blob(data, ZLIB), bytes((RAW,)) + data)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            decode_blob(b'\x07abc')
+        with self.assertRaises(ValueError):
+            encode_blob(self.data, 7)
+
+
+class TestRecompressBlobs(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.db.shoeTrialResults.delete_many({})
+        self.db.schema.delete_many({'name': {'$regex': '^blob_recompress'}})
+        self.data_generator.generate_and_insert_shoe_trial_results(count=3)
+        trial = stored_trial()
+        split_payload(trial)
+        # As stored before there was an envelope
+        for x in self.db.shoeTrialResults.find():
+            trial.recording_id = str(x['_id'])
+            self.db.shoeTrialResults.update_one({'_id': x['_id']}, {'$set': {'bin': trial.SerializeToString()}})
+        self.messages = {x['_id']: x['bin'] for x in self.db.shoeTrialResults.find()}
+
+    def codecs(self):
+        return [blob_codec(x['bin']) for x in self.db.shoeTrialResults.find().sort('_id', 1)]
+
+    def test_recompress(self):
+        self.assertEqual(recompress_blobs(self.db, 'shoeTrialResults', ZLIB, batch_size=2, max_batches=1), 2)
+        self.assertEqual(self.codecs(), [ZLIB, ZLIB, None])
+        self.assertEqual(recompress_blobs(self.db, 'shoeTrialResults', ZLIB, batch_size=2), 1)
+        self.assertEqual(recompress_blobs(self.db, 'shoeTrialResults', ZLIB, batch_size=2), 0)
+        self.assertEqual(self.codecs(), [ZLIB] * 3)
+
+        # Another codec goes through the collection again
+        self.assertEqual(recompress_blobs(self.db, 'shoeTrialResults', LZMA), 3)
+        self.assertEqual(self.codecs(), [LZMA] * 3)
+        for x in self.db.shoeTrialResults.find():
+            self.assertEqual(decode_blob(x['bin']), self.messages[x['_id']])
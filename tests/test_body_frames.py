@@ -0,0 +1,55 @@
+import unittest
+
+from lib.body_frames import (BONES, CLASSIC, PACKED, PACKED_QUANTIZED, POSITION_TOLERANCE, QUATERNION_TOLERANCE,
+                             encode_body_frames, pack_body_frames, unpack_body_frames)
+from proto import messages_pb2
+from tests.test_trial_payloads import stored_trial
+
+
+class TestBodyFrames(unittest.TestCase):
+    def setUp(self):
+        self.body_frames = stored_trial().body_frames
+        # The stored trials only have avg_stride_frames
+        for i, x in enumerate(self.body_frames.avg_stride_frames):
+            frame = self.body_frames.frames.add()
+            frame.CopyFrom(x)
+            frame.micros = 1614000000000000 + i * 33333
+
+    def test_lossless(self):
+        data = pack_body_frames(self.body_frames)
+        self.assertLess(len(data), self.body_frames.ByteSize() / 2)
+        self.assertEqual(unpack_body_frames(data), self.body_frames)
+
+    def test_presence_and_lengths(self):
+        msg = messages_pb2.BodyFramesMsg()
+        msg.frames.add(micros=-1, com_offset=[1.5]).left_hip.SetInParent()
+        msg.frames.add(stride_index=float('nan')).head.quaternion.extend([0.5, -0.0, 0.25, 1, 2])
+        msg.avg_stride_frames.add()
+        self.assertEqual(str(unpack_body_frames(pack_body_frames(msg))), str(msg))
+        self.assertEqual(unpack_body_frames(pack_body_frames(messages_pb2.BodyFramesMsg())), messages_pb2.BodyFramesMsg())
+
+    def test_bounded_error(self):
+        data = pack_body_frames(self.body_frames, POSITION_TOLERANCE, QUATERNION_TOLERANCE)
+        self.assertLess(len(data), len(pack_body_frames(self.body_frames)) / 2)
+        msg = unpack_body_frames(data)
+        self.assertEqual(len(msg.frames), len(self.body_frames.frames))
+        for expected, frame in zip(self.body_frames.frames, msg.frames):
+            self.assertEqual(frame.micros, expected.micros)
+            self.assertEqual(frame.stride_index, expected.stride_index)
+            for name in BONES:
+                self.assertEqual(frame.HasField(name), expected.HasField(name))
+                bone, expected_bone = getattr(frame, name), getattr(expected, name)
+                for axis in ['x_pos', 'y_pos', 'z_pos']:
+                    self.assertAlmostEqual(getattr(bone, axis), getattr(expected_bone, axis), delta=POSITION_TOLERANCE * 1.001)
+                self.assertEqual(len(bone.quaternion), len(expected_bone.quaternion))
+                for value, expected_value in zip(bone.quaternion, expected_bone.quaternion):
+                    self.assertAlmostEqual(value, expected_value, delta=QUATERNION_TOLERANCE * 1.001)
+
+    def test_encode(self):
+        packed = encode_body_frames(self.body_frames, PACKED)
+        self.assertEqual(list(packed.frames), [])
+        self.assertIs(encode_body_frames(packed, PACKED), packed)
+        self.assertIs(encode_body_frames(self.body_frames, CLASSIC), self.body_frames)
+        self.assertEqual(encode_body_frames(packed, CLASSIC), self.body_frames)
+        quantized = encode_body_frames(packed, PACKED_QUANTIZED)
+        self.assertLess(len(quantized.packed_frames), len(packed.packed_frames))
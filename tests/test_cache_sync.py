@@ -0,0 +1,76 @@
+from bson import ObjectId
+from lib.cache_sync import COLLECTION, CacheSync, cache_sync
+from lib.counts import CountCache
+from lib.principal_cache import PrincipalCache, principal_cache
+from tests.test_servicer import TestServicer
+
+
+class TestCacheSync(TestServicer):
+    """Two server processes, each with its own caches, sharing the database"""
+
+    def setUp(self):
+        super().setUp()
+        self.db[COLLECTION].delete_many({})
+        self.syncs = [CacheSync(), CacheSync()]
+        self.principals = [PrincipalCache(), PrincipalCache()]
+        self.counts = [CountCache(60), CountCache(60)]
+        for sync, principals, counts in zip(self.syncs, self.principals, self.counts):
+            sync.configure(self.db, interval=0)
+            sync.subscribe('user', principals.drop_user)
+            sync.subscribe('company', principals.drop_company)
+            sync.subscribe('count', counts.drop)
+        self.company_id = str(ObjectId())
+        self.user = {'_id': ObjectId(), 'role': 4, 'company_id': self.company_id}
+
+    def tearDown(self):
+        cache_sync.configure(None)
+
+    def test_principal_invalidated_everywhere(self):
+        self.principals[1].set('token', self.user)
+        self.principals[1].set('other', dict(self.user, _id=ObjectId(), company_id=str(ObjectId())))
+        self.syncs[0].publish('user', self.user['_id'])
+        self.assertIsNotNone(self.principals[1].get('token'))
+
+        self.syncs[1].poll()
+        self.assertIsNone(self.principals[1].get('token'))
+        self.assertIsNotNone(self.principals[1].get('other'))
+
+        # Each version is only applied once
+        self.principals[1].set('token', self.user)
+        self.syncs[1].poll()
+        self.assertIsNotNone(self.principals[1].get('token'))
+
+        self.syncs[0].publish('company', self.company_id)
+        self.syncs[1].poll()
+        self.assertIsNone(self.principals[1].get('token'))
+
+    def test_counts_invalidated_by_tenant(self):
+        collection = self.db.customers
+        self.counts[1].put(collection, {'company_id': self.company_id}, 5, self.company_id)
+        self.counts[1].put(collection, {'company_id': 'other'}, 7, 'other')
+        self.syncs[0].publish('count', 'customers', self.company_id)
+        self.syncs[1].poll()
+        self.assertIsNone(self.counts[1].get(collection, {'company_id': self.company_id}, self.company_id))
+        self.assertEqual(self.counts[1].get(collection, {'company_id': 'other'}, 'other'), 7)
+
+        # None for every company
+        self.syncs[0].publish('count', 'customers', None)
+        self.syncs[1].poll()
+        self.assertIsNone(self.counts[1].get(collection, {'company_id': 'other'}, 'other'))
+
+    def test_polls_once_an_interval(self):
+        self.syncs[1].configure(self.db, interval=60)
+        self.principals[1].set('token', self.user)
+        self.syncs[1].poll()
+        self.syncs[0].publish('user', self.user['_id'])
+        self.syncs[1].poll()
+        self.assertIsNotNone(self.principals[1].get('token'))
+
+    def test_shared_caches_publish(self):
+        principal_cache.invalidate_user(self.user['_id'])
+        self.assertIsNone(self.db[COLLECTION].find_one())
+
+        cache_sync.configure(self.db)
+        principal_cache.invalidate_user(self.user['_id'])
+        principal_cache.invalidate_user(self.user['_id'])
+        self.assertEqual(self.db[COLLECTION].find_one({'kind': 'user'})['version'], 2)
@@ -0,0 +1,99 @@
+import random
+
+import grpc
+
+from bson import ObjectId
+from lib.counts import CountCache, count_cache, count_exact, count_total, exists, index_hint
+from lib.latest_trial import trial_saved
+from lib.pagination import TOTAL_COUNT
+from proto import messages_pb2
+from services.customers import CustomerServicer
+from services.data import DataServicer
+from services.users import UserServicer
+from tests.test_servicer import TestServicer
+from tests.utils.testing_context import TestingContext
+
+
+class TestCounts(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.db.shoeTrialResults.delete_many({})
+        self.company_id, branch_ids = self.data_generator.generate_fake_company(2)
+        self.technician_id, self.technician = self.data_generator.generate_fake_user(
+            4, self.company_id, random.choice(branch_ids))
+        self.data_generator.generate_and_insert_shoe_trial_results(count=3, technician_id=self.technician_id)
+        self.db.shoeTrialResults.update_many({}, {'$set': {'company_id': self.company_id}})
+
+    def tearDown(self):
+        count_cache.configure(0)
+
+    def test_index_hint(self):
+        self.assertEqual(index_hint('shoeTrialResults', {'customer_id': 'a', 'company_id': 'b'}),
+                         [('customer_id', 1), ('created', 1), ('_id', 1)])
+        self.assertEqual(index_hint('shoeTrialResults', {'company_id': 'b'}), [('company_id', 1), ('recording_date', 1)])
+        self.assertIsNone(index_hint('shoeTrialResults', {'shoe_brand': 'b'}))
+
+    def test_exact_and_exists(self):
+        self.assertEqual(count_exact(self.db.shoeTrialResults, {'company_id': self.company_id}), 3)
+        self.assertTrue(exists(self.db.shoeTrialResults, {'company_id': self.company_id}))
+        self.assertFalse(exists(self.db.shoeTrialResults, {'company_id': str(ObjectId())}))
+
+    def test_cached_until_invalidated(self):
+        cache = CountCache(ttl=60)
+        query = {'company_id': self.company_id}
+        self.assertEqual(cache.count(self.db.shoeTrialResults, query, self.company_id), 3)
+        self.db.shoeTrialResults.delete_one(query)
+        self.assertEqual(cache.count(self.db.shoeTrialResults, query, self.company_id), 3)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'size': 1})
+
+        # Another company's write leaves it alone
+        cache.invalidate('shoeTrialResults', str(ObjectId()))
+        self.assertEqual(cache.count(self.db.shoeTrialResults, query, self.company_id), 3)
+        cache.invalidate('shoeTrialResults', self.company_id)
+        self.assertEqual(cache.count(self.db.shoeTrialResults, query, self.company_id), 2)
+
+    def test_count_rpc_picks_mode(self):
+        count_cache.configure(60)
+        servicer = DataServicer(self.db)
+        context = TestingContext(self.technician)
+        self.assertEqual(servicer.countShoeTrialResults(messages_pb2.CMSQuery(), context).int_result, 3)
+
+        # Deleting through the servicer invalidates the cached total
+        recording_id = str(self.db.shoeTrialResults.find_one()['_id'])
+        servicer.deleteShoeTrialResult(messages_pb2.CMSQuery(string_query=recording_id), context)
+        self.assertEqual(servicer.countShoeTrialResults(messages_pb2.CMSQuery(), context).int_result, 2)
+
+        # Filtered counts are never cached
+        self.db.shoeTrialResults.delete_many({})
+        self.assertEqual(count_total(self.db.shoeTrialResults, {'company_id': self.company_id, 'created': {'$gte': 0}}), 0)
+
+    def test_edits_drop_filtered_totals(self):
+        count_cache.configure(60)
+        customer_id = self.data_generator.generate_fake_customer(self.company_id)
+        trial = {'_id': ObjectId(), 'customer_id': customer_id, 'company_id': self.company_id, 'recording_date': 1000}
+        self.db.shoeTrialResults.insert_one(trial)
+        trial_saved(self.db, trial)
+        customer = self.db.customers.find_one({'_id': ObjectId(customer_id)})
+        servicer = CustomerServicer(self.db)
+        context = TestingContext(self.technician)
+        request = messages_pb2.CMSQuery(mode=True, filter_on='email', string_query=customer['email'])
+        self.assertEqual(servicer.countCustomers(request, context).int_result, 1)
+
+        servicer.setCustomer(messages_pb2.Customer(
+            customer_id=customer_id, first_name=customer['first_name'], email='renamed@testing.com'), context)
+        self.assertEqual(servicer.countCustomers(request, context).int_result, 0)
+
+        _, admin = self.data_generator.generate_fake_user(6)
+        servicer = UserServicer(self.db, {})
+        request = messages_pb2.CMSQuery(filter_on='email', string_query=self.technician['email'], limit=10)
+        context = TestingContext(admin)
+        list(servicer.getUsers(request, context))
+        self.assertEqual(context.trailing_metadata[TOTAL_COUNT], '1')
+
+        user = self.db.users.find_one({'_id': ObjectId(self.technician_id)})
+        servicer.setUser(messages_pb2.User(
+            user_id=self.technician_id, email='renamed@testing.com', name=user['name'], role=user['role'],
+            company_id=user['company_id'], branch_id=user['branch_id']), TestingContext(admin))
+        context = TestingContext(admin)
+        self.assertEqual(list(servicer.getUsers(request, context)), [])
+        self.assertEqual(context.status_code, grpc.StatusCode.NOT_FOUND)
@@ -0,0 +1,73 @@
+import random
+
+from bson import ObjectId
+from lib.customer_info import BACKFILL_SETTING, backfill_customer_info, customer_info
+from lib.timestamp import now
+from proto import messages_pb2
+from services.customers import CustomerServicer
+from services.reports import ReportServicer
+from tests.test_servicer import TestServicer
+from tests.utils.testing_context import TestingContext
+
+
+class TestCustomerInfo(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.db.shoeTrialResults.delete_many({})
+        self.db.schema.delete_many({'name': BACKFILL_SETTING})
+        self.company_id, branch_ids = self.data_generator.generate_fake_company(2)
+        self.technician_id, self.technician = self.data_generator.generate_fake_user(
+            4, self.company_id, random.choice(branch_ids))
+
+    def add_customer(self, gender):
+        customer_id = self.data_generator.generate_fake_customer(self.company_id)
+        self.db.customers.update_one({'_id': ObjectId(customer_id)}, {'$set': {'gender': gender}})
+        return customer_id
+
+    def test_backfill_resumes(self):
+        customer_ids = [self.add_customer(1), self.add_customer(2)]
+        for customer_id in customer_ids:
+            self.data_generator.generate_and_insert_shoe_trial_results(
+                count=3, technician_id=self.technician_id, customer_id=customer_id)
+
+        # Stopped part way through
+        self.assertEqual(backfill_customer_info(self.db, batch_size=2, max_batches=2), 4)
+        self.assertEqual(self.db.shoeTrialResults.count_documents({'customer_info': {'$exists': False}}), 2)
+
+        # and carried on later
+        self.assertEqual(backfill_customer_info(self.db, batch_size=2), 2)
+        self.assertEqual(backfill_customer_info(self.db, batch_size=2), 0)
+        for x in self.db.shoeTrialResults.find():
+            customer = self.db.customers.find_one({'_id': ObjectId(x['customer_id'])})
+            self.assertEqual(x['customer_info'], customer_info(customer))
+
+    def test_set_customer_syncs_trials(self):
+        customer_id = self.add_customer(1)
+        self.data_generator.generate_and_insert_shoe_trial_results(
+            count=2, technician_id=self.technician_id, customer_id=customer_id)
+        backfill_customer_info(self.db)
+
+        customer = messages_pb2.Customer(
+            customer_id=customer_id, first_name='Ada', email='ada@example.com', gender=2, date_of_birth=1000)
+        CustomerServicer(self.db).setCustomer(customer, TestingContext(self.technician))
+        for x in self.db.shoeTrialResults.find({'customer_id': customer_id}):
+            self.assertEqual(x['customer_info']['gender'], 2)
+            self.assertEqual(x['customer_info']['date_of_birth'], 1000)
+
+    def test_reports_filter_on_copy(self):
+        male, female = self.add_customer(1), self.add_customer(2)
+        self.data_generator.generate_and_insert_shoe_trial_results(
+            count=4, technician_id=self.technician_id, customer_id=male)
+        self.data_generator.generate_and_insert_shoe_trial_results(
+            count=2, technician_id=self.technician_id, customer_id=female)
+        self.db.shoeTrialResults.update_many({}, {'$set': {'recording_date': now(), 'company_id': self.company_id}})
+        backfill_customer_info(self.db)
+
+        servicer = ReportServicer(self.db)
+        start, end = now() - 60000, now() + 60000
+        total = self.db.shoeTrialResults.count_documents({'customer_id': female, 'purchase_decision.decision': {'$in': [0, 1]}})
+        sizes = servicer.get_size_group_sales(start, end, self.company_id)
+        self.assertEqual(sum(x.count for x in sizes if x.gender == 2), total)
+        records = servicer.get_table_record(start, end, self.company_id, gender='2')
+        self.assertEqual(len(records), total)
+        self.assertTrue(all(x.gender == '2' for x in records))
@@ -3,6 +3,7 @@ from bson.objectid import ObjectId
 from faker.proxy import Faker
 
 import grpc
+from lib.latest_trial import trial_saved
 from proto import messages_pb2
 from services.customers import CustomerServicer
 from tests.test_servicer import TestServicer
@@ -52,6 +53,37 @@ class TestCustomersServicer(TestServicer):
             response = self.servicer.countCustomers(request, context)
             self.assertEqual(response.int_result, num_customers)
 
+    def test_customer_count_mode_matches_list(self):
+        company_id, branch_ids = self.data_generator.generate_fake_company(2)
+        customers = []
+        for branch_id, has_trial in [(0, True), (0, True), (1, True), (0, False)]:
+            customer_id = self.data_generator.generate_fake_customer(company_id)
+            self.db.customers.update_one({'_id': ObjectId(customer_id)}, {'$set': {'branch_id': branch_ids[branch_id]}})
+            if has_trial:
+                self.add_trial(customer_id, company_id)
+            customers.append(customer_id)
+        self.add_trial(self.data_generator.generate_fake_customer(), '')
+        email = self.db.customers.find_one({'_id': ObjectId(customers[0])})['email']
+
+        _, admin = self.data_generator.generate_fake_user(6)
+        _, company_user = self.data_generator.generate_fake_user(4, company_id)
+        _, branch_user = self.data_generator.generate_fake_user(3, company_id)
+        branch_user['branch_id'] = branch_ids[0]
+        for user, request, expected in [
+                (admin, messages_pb2.CMSQuery(mode=True), 4),
+                (company_user, messages_pb2.CMSQuery(mode=True), 3),
+                (branch_user, messages_pb2.CMSQuery(mode=True), 2),
+                (company_user, messages_pb2.CMSQuery(mode=True, filter_on='email', string_query=email), 1)]:
+            count = self.servicer.countCustomers(request, TestingContext(user)).int_result
+            listed = list(self.servicer.getCustomers(request, TestingContext(user)))
+            self.assertEqual(count, expected)
+            self.assertEqual(len(listed), expected)
+
+    def add_trial(self, customer_id, company_id):
+        trial = {'_id': ObjectId(), 'customer_id': customer_id, 'company_id': company_id, 'recording_date': 1000}
+        self.db.shoeTrialResults.insert_one(trial)
+        trial_saved(self.db, trial)
+
     def test_create_new_customer(self):
         fake_customer = {
             "first_name": self.fake.first_name(),
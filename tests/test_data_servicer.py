@@ -6,13 +6,20 @@ from bson import ObjectId
 import grpc
 from tests.test_servicer import TestServicer
 from tests.utils.test_data import MockDataGenerator
+from lib.blob import CODEC, blob_codec
 from lib.converter import protobuf_to_dict
+from lib.customer_info import customer_info
 from proto import messages_pb2
 from services.data import DataServicer
 
 from tests.utils.testing_context import TestingContext
 
 
+def parsed(results) -> list:
+    """Decode the pre-serialized messages the trial result streams yield"""
+    return [x.message() for x in results]
+
+
 class TestDataServicer(TestServicer):
     def setUp(self):
         super().setUp()
@@ -86,7 +93,7 @@ class TestDataServicer(TestServicer):
         results = self.servicer.getShoeTrialResults(request, context)
         count = 0
 
-        for i, x in enumerate(results):
+        for i, x in enumerate(parsed(results)):
             count = i
             # Ensure we're only receiving the company_id of the technician that's
             # requesting them
@@ -103,7 +110,7 @@ class TestDataServicer(TestServicer):
         results = self.servicer.getShoeTrialResults(request, context)
         count = 0
 
-        for i, x in enumerate(results):
+        for i, x in enumerate(parsed(results)):
             count = i
             # Ensure we're only receiving the company_id of the technician that's
             # requesting them
@@ -140,14 +147,14 @@ class TestDataServicer(TestServicer):
         context = TestingContext(
             self.db.users.find_one({'_id': ObjectId(admin_id)}))
         request = messages_pb2.CMSQuery()
-        results = list(self.servicer.getShoeTrialResults(request, context))
+        results = parsed(self.servicer.getShoeTrialResults(request, context))
         record_to_delete = random.choice(results)
         delete_query = messages_pb2.CMSQuery(string_query=record_to_delete.recording_id)
         result = self.servicer.deleteShoeTrialResult(delete_query, context)
         self.assertEqual(result.int_result, 1)
 
         request = messages_pb2.CMSQuery(start_millis=7)
-        results = list(self.servicer.getShoeTrialResults(request, context))
+        results = parsed(self.servicer.getShoeTrialResults(request, context))
         self.assertEqual(len(results), 3)
         for x in results:
             self.assertNotEqual(x.recording_id, record_to_delete.recording_id)
@@ -215,7 +222,7 @@ class TestDataServicer(TestServicer):
 
         # Attempt to get the results for customer 2 using tech 2's creds
         request = messages_pb2.CMSQuery(string_query=str(customer_2_id))
-        customer_2_response = list(self.servicer.getShoeTrialResultsByCustomerId(
+        customer_2_response = parsed(self.servicer.getShoeTrialResultsByCustomerId(
             request, TestingContext(user=technician_2)))
         customer_2_response_ids = [str(x.recording_id)
                                    for x in customer_2_response]
@@ -233,7 +240,7 @@ class TestDataServicer(TestServicer):
 
         # Attept to get the results of customer 1 using tech 1's creds
         request = messages_pb2.CMSQuery(string_query=str(customer_1_id))
-        customer_1_response = list(self.servicer.getShoeTrialResultsByCustomerId(
+        customer_1_response = parsed(self.servicer.getShoeTrialResultsByCustomerId(
             request, TestingContext(user=technician_1)))
         customer_1_response_ids = [str(x.recording_id)
                                    for x in customer_1_response]
@@ -250,7 +257,7 @@ class TestDataServicer(TestServicer):
 
         # Attempt to get the results of customer 3 using tech 2's creds
         request = messages_pb2.CMSQuery(string_query=str(customer_3_id))
-        customer_3_response = list(self.servicer.getShoeTrialResultsByCustomerId(
+        customer_3_response = parsed(self.servicer.getShoeTrialResultsByCustomerId(
             request, TestingContext(user=technician_2)))
         customer_3_response_ids = [str(x.recording_id)
                                    for x in customer_3_response]
@@ -267,7 +274,7 @@ class TestDataServicer(TestServicer):
 
         # Attempt to get the results of customer 3, but using a different tech from the same company
         request = messages_pb2.CMSQuery(string_query=str(customer_3_id))
-        customer_3_response = list(self.servicer.getShoeTrialResultsByCustomerId(
+        customer_3_response = parsed(self.servicer.getShoeTrialResultsByCustomerId(
             request, TestingContext(user=technician_3)))
         customer_3_response_ids = [str(x.recording_id)
                                    for x in customer_3_response]
@@ -339,6 +346,9 @@ class TestDataServicer(TestServicer):
         self.assertEqual(inserted_doc['branch_id'], technician['branch_id'])
         self.assertEqual(inserted_doc['technician_id'], technician_id)
         self.assertEqual(inserted_doc['device_id'], device_id)
+        # The reports read the customer's details from the trial rather than joining on customers
+        customer = self.db.customers.find_one({'_id': ObjectId(shoe_trial_result.customer_id)})
+        self.assertEqual(inserted_doc['customer_info'], customer_info(customer))
 
     def test_set_shoe_trial_result_differing_company_id(self):
         self.data_generatorerator = MockDataGenerator(
@@ -401,6 +411,8 @@ class TestDataServicer(TestServicer):
         test_context = TestingContext(user)
         response = self.servicer.setMetricMapping(request, test_context)
         inserted_id = ObjectId(response.string_result)
+        stored = self.db.metricMappings.find_one({'_id': inserted_id})
+        self.assertEqual(blob_codec(stored['bin']), CODEC)
         out_messages = self.servicer.getMetricMapping(
             messages_pb2.CMSQuery(), test_context)
         for x in out_messages:
@@ -474,7 +486,7 @@ class TestDataServicer(TestServicer):
             request = messages_pb2.CMSQuery(string_query=customer_id)
             response = self.servicer.getShoeTrialResultsByCustomerId(
                 request, testing_context)
-            for i, shoe_trial_result in enumerate(response):
+            for i, shoe_trial_result in enumerate(parsed(response)):
                 self.assertEqual(shoe_trial_result.customer_id, customer_id)
                 self.assertEqual(shoe_trial_result.company_id,
                                  technician['company_id'])
@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import patch
+
+from bson import ObjectId
+from lib.db import PROFILES, Db, db_profiles
+from lib.latest_trial import trial_saved
+from lib.request_context import RequestContext, run_tracked
+from proto import messages_pb2
+from pymongo.read_preferences import ReadPreference
+from services.customers import CustomerServicer
+from services.reports import ReportServicer
+from tests.test_servicer import TestServicer
+from tests.utils.testing_context import TestingContext
+
+
+class TestDb(unittest.TestCase):
+    def setUp(self):
+        self.db = Db('127.0.0.1')
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_profiles_from_config(self):
+        profiles = db_profiles({'db-profiles': {'analytics': {'pool-size': 4}, 'exports': {'read-preference': 'secondary'}}})
+        self.assertEqual(profiles['analytics']['pool-size'], 4)
+        self.assertEqual(profiles['analytics']['read-preference'], 'secondaryPreferred')
+        self.assertEqual(profiles['ingest'], PROFILES['ingest'])
+        # New profiles start from the interactive one
+        self.assertEqual(profiles['exports']['read-preference'], 'secondary')
+        self.assertEqual(profiles['exports']['pool-size'], PROFILES['interactive']['pool-size'])
+        self.assertEqual(db_profiles({}), PROFILES)
+
+    def test_profile_clients(self):
+        interactive = self.db.get_database('avaclone-unittests')
+        analytics = self.db.get_database('avaclone-unittests', 'analytics')
+        self.assertIsNot(interactive.client, analytics.client)
+        self.assertEqual(interactive.read_preference, ReadPreference.PRIMARY)
+        self.assertEqual(analytics.read_preference, ReadPreference.SECONDARY_PREFERRED)
+        self.assertEqual(analytics.max_time_ms, PROFILES['analytics']['max-time-ms'])
+        # Clients are reused per profile
+        self.assertIs(self.db.get_database('avaclone', 'analytics').client, analytics.client)
+
+    @patch('pymongo.collection.Collection.aggregate')
+    def test_profile_max_time(self, aggregate):
+        analytics = self.db.get_database('avaclone-unittests', 'analytics')
+        analytics.shoeTrialResults.aggregate([])
+        self.assertEqual(aggregate.call_args[1]['maxTimeMS'], PROFILES['analytics']['max-time-ms'])
+
+        # An explicit limit is kept
+        analytics.shoeTrialResults.aggregate([], maxTimeMS=10)
+        self.assertEqual(aggregate.call_args[1]['maxTimeMS'], 10)
+
+        # and the RPC's deadline still wins when it is sooner
+        request_context = RequestContext(analytics, time_remaining=5)
+        run_tracked('/AvaProtos.Test/profile', request_context, lambda: analytics.shoeTrialResults.aggregate([]))
+        self.assertLessEqual(aggregate.call_args[1]['maxTimeMS'], 5000)
+
+        ingest = self.db.get_database('avaclone-unittests', 'ingest')
+        ingest.shoeTrialResults.aggregate([])
+        self.assertNotIn('maxTimeMS', aggregate.call_args[1])
+
+
+class TestAnalyticsReads(TestServicer):
+    def setUp(self):
+        super().setUp()
+        # Stands in for a secondary that hasn't caught up yet
+        self.analytics = self.db.client.get_database('avaclone-unittests-analytics')
+        self.analytics.shoeTrialResults.delete_many({})
+        self.analytics.customers.delete_many({})
+        self.servicer = ReportServicer(self.db, self.analytics)
+        company_id, _ = self.data_generator.generate_fake_company()
+        technician_id, _ = self.data_generator.generate_fake_user(4, company_id)
+        _, self.admin = self.data_generator.generate_fake_user(6)
+        self.recording_id = self.data_generator.generate_and_insert_shoe_trial_results(1, technician_id)[0]
+
+    def test_aggregates_read_analytics(self):
+        self.db.shoeTrialResults.update_one({'_id': ObjectId(self.recording_id)}, {'$set': {'shoe_season': 'AW'}})
+        seasons = self.servicer.GetSeasons(messages_pb2.ReportQuery(), TestingContext(self.admin))
+        self.assertEqual(list(seasons), [])
+
+    @patch('services.reports.open', side_effect=FileNotFoundError, create=True)
+    def test_generate_html_reads_primary(self, _):
+        # Gets as far as the template, so found the trial just written
+        with self.assertRaises(FileNotFoundError):
+            self.servicer.GenerateHtml(messages_pb2.ReportQuery(branch_id=self.recording_id), TestingContext(self.admin))
+
+    def test_bio_customers_read_analytics(self):
+        trial = self.db.shoeTrialResults.find_one({'_id': ObjectId(self.recording_id)})
+        trial_saved(self.db, trial)
+        servicer = CustomerServicer(self.db, self.analytics)
+        context = TestingContext(self.admin)
+        self.assertEqual(list(servicer.getBioCustomers(messages_pb2.CMSQuery(), context)), [])
+        self.assertEqual(servicer.countBioCustomers(messages_pb2.CMSQuery(), context).int_result, 0)
+        customers = CustomerServicer(self.db).getBioCustomers(messages_pb2.CMSQuery(), context)
+        self.assertIn(trial['customer_id'], [x.customer_id for x in customers])
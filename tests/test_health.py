@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import MagicMock
+
+from grpc_health.v1 import health_pb2
+from lib.health import NOT_SERVING, SERVING, HealthMonitor
+from pymongo.errors import ServerSelectionTimeoutError
+from tests.utils.testing_context import TestingContext
+
+SERVICE = 'AvaProtos.Data'
+
+
+class TestHealth(unittest.TestCase):
+    def setUp(self):
+        self.database = MagicMock()
+        self.monitor = HealthMonitor(self.database, [SERVICE])
+
+    def status(self, service=''):
+        request = health_pb2.HealthCheckRequest(service=service)
+        return self.monitor.servicer.Check(request, TestingContext()).status
+
+    def test_serving(self):
+        self.assertEqual(self.monitor.check(), SERVING)
+        self.assertEqual(self.status(), SERVING)
+        self.assertEqual(self.status(SERVICE), SERVING)
+
+    def test_mongo_unreachable(self):
+        self.monitor.check()
+        self.database.client.admin.command.side_effect = ServerSelectionTimeoutError('down')
+        self.assertEqual(self.monitor.check(), NOT_SERVING)
+        self.assertEqual(self.status(), NOT_SERVING)
+        self.assertEqual(self.status(SERVICE), NOT_SERVING)
+
+        # Back to serving once Mongo is back
+        self.database.client.admin.command.side_effect = None
+        self.assertEqual(self.monitor.check(), SERVING)
+        self.assertEqual(self.status(SERVICE), SERVING)
+
+    def test_drain(self):
+        self.monitor.check()
+        self.monitor.drain()
+        self.assertEqual(self.status(), NOT_SERVING)
+        self.assertEqual(self.status(SERVICE), NOT_SERVING)
+        # A healthy Mongo doesn't bring a draining server back
+        self.assertEqual(self.monitor.check(), NOT_SERVING)
+        self.assertEqual(self.status(), NOT_SERVING)
@@ -0,0 +1,106 @@
+import random
+
+from bson import ObjectId
+from lib.pagination import Page, encode_page_token
+from lib.query_log import explain_flags
+from lib.timestamp import now
+from proto import messages_pb2
+from schema import v003, v004
+from services.customers import CustomerServicer
+from services.data import DataServicer
+from services.reports import ReportServicer
+from tests.test_servicer import TestServicer
+from tests.utils.testing_context import TestingContext
+
+DAY = 24 * 60 * 60 * 1000
+
+
+def winning_stages(explain) -> set:
+    """Every stage of the winning plans in an explain, however the plan is nested"""
+    stages = set()
+
+    def walk(value, winning=False):
+        if isinstance(value, dict):
+            if winning and 'stage' in value:
+                stages.add(value['stage'])
+            for key, x in value.items():
+                if key != 'rejectedPlans':
+                    walk(x, winning or key in ('winningPlan', 'queryPlan'))
+        elif isinstance(value, list):
+            for x in value:
+                walk(x, winning)
+
+    walk(explain)
+    return stages
+
+
+class TestIndexes(TestServicer):
+    """Run the queries the RPCs send through explain to check they use the v003 and v004 indexes"""
+
+    def setUp(self):
+        super().setUp()
+        v003.update(self.db)
+        v004.update(self.db)
+        self.company_id, branch_ids = self.data_generator.generate_fake_company(2)
+        self.branch_id = random.choice(branch_ids)
+        self.technician_id, _ = self.data_generator.generate_fake_user(4, self.company_id, self.branch_id)
+        self.manager = self.db.users.find_one({'_id': ObjectId(self.technician_id)})
+        self.data_generator.generate_and_insert_shoe_trial_results(count=5, technician_id=self.technician_id)
+
+    def report_query(self, **kwargs):
+        return messages_pb2.ReportQuery(start_millis=now() - 30 * DAY, end_millis=now(), **kwargs)
+
+    def assertIndexed(self, explain):
+        stages = winning_stages(explain)
+        self.assertIn('IXSCAN', stages, explain)
+        self.assertNotIn('COLLSCAN', explain_flags(explain))
+
+    def explain_pipeline(self, collection, pipeline):
+        return self.db.command('aggregate', collection, pipeline=pipeline, explain=True)
+
+    def test_report_pipelines(self):
+        servicer = ReportServicer(self.db)
+        pipelines = [
+            servicer.no_sale_records_pipeline(messages_pb2.NoSaleQuery(
+                query=self.report_query(company_id=self.company_id), reason=1)),
+            servicer.no_sale_records_pipeline(messages_pb2.NoSaleQuery(
+                query=self.report_query(company_id=self.company_id, branch_id=self.branch_id), reason=1)),
+            servicer.brand_sale_records_pipeline(messages_pb2.BrandSaleRecordsQuery(
+                query=self.report_query(), brand='Nike')),
+            servicer.tech_sale_records_pipeline(self.report_query(technician_id=self.technician_id)),
+            servicer.daily_sale_scan_records_pipeline(messages_pb2.SaleScanRecordsQuery(
+                query=self.report_query(company_id=self.company_id), type='sales')),
+            servicer.daily_sale_scan_records_pipeline(messages_pb2.SaleScanRecordsQuery(
+                query=self.report_query(technician_id=self.technician_id)))
+        ]
+        for pipeline in pipelines:
+            self.assertIndexed(self.explain_pipeline('shoeTrialResults', pipeline))
+
+    def test_results_by_customer(self):
+        request = messages_pb2.CMSQuery(string_query=str(ObjectId()), sort_by='created', limit=10)
+        query = DataServicer(self.db).customer_results_query(request, TestingContext(self.manager))
+        explain = Page.from_query(request, ['created']).find(self.db.shoeTrialResults, query).explain()
+        self.assertIndexed(explain)
+        # The sort comes from the index rather than being done in memory
+        self.assertNotIn('SORT', winning_stages(explain))
+
+    def test_customer_lists(self):
+        servicer = CustomerServicer(self.db)
+        context = TestingContext(self.manager)
+        request = messages_pb2.CMSQuery(start_millis=now() - DAY, sort_by='updated', limit=10)
+        explain = Page.from_query(request, ['updated']).find(
+            self.db.customers, servicer.customers_query(request, context)).explain()
+        self.assertIndexed(explain)
+        self.assertNotIn('SORT', winning_stages(explain))
+
+        self.manager['role'] = 3
+        pipeline = servicer.customers_pipeline(messages_pb2.CMSQuery(limit=10), context)
+        self.assertIndexed(self.explain_pipeline('customers', pipeline))
+
+    def test_page_token_ranges_on_index(self):
+        token = encode_page_token('updated', False, now() - DAY, ObjectId())
+        request = messages_pb2.CMSQuery(sort_by='updated', limit=10, page_token=token)
+        query = CustomerServicer(self.db).customers_query(request, TestingContext(self.manager))
+        explain = Page.from_query(request, ['updated']).find(self.db.customers, query).explain()
+        self.assertIndexed(explain)
+        self.assertNotIn('SORT', winning_stages(explain))
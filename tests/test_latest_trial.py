@@ -0,0 +1,106 @@
+from unittest.mock import patch
+
+from bson import ObjectId
+from lib.latest_trial import REBUILD_SETTING, rebuild_latest_trials, trial_deleted, trial_saved
+from proto import messages_pb2
+from services.customers import CustomerServicer
+from services.data import DataServicer
+from tests.test_servicer import TestServicer
+from tests.utils.testing_context import TestingContext
+
+
+class TestLatestTrial(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.db.customers.delete_many({})
+        self.db.shoeTrialResults.delete_many({})
+        self.db.schema.delete_many({'name': REBUILD_SETTING})
+        self.company_id, _ = self.data_generator.generate_fake_company()
+        self.customer_id = self.data_generator.generate_fake_customer(self.company_id)
+
+    def add_trial(self, recording_date, customer_id=None, save=True):
+        trial = {
+            '_id': ObjectId(),
+            'customer_id': customer_id or self.customer_id,
+            'company_id': self.company_id,
+            'recording_date': recording_date,
+            'shoe_name': 'Model %d' % recording_date,
+            'shoe_brand': 'Nike'}
+        self.db.shoeTrialResults.insert_one(trial)
+        if save:
+            trial_saved(self.db, trial)
+        return trial
+
+    def latest(self, customer_id=None):
+        customer = self.db.customers.find_one({'_id': ObjectId(customer_id or self.customer_id)})
+        return customer.get('latest_trial')
+
+    def test_most_recent_wins_whatever_the_order(self):
+        newest = self.add_trial(2000)
+        self.add_trial(1000)
+        self.assertEqual(self.latest()['recording_id'], newest['_id'])
+        self.assertEqual(self.latest()['shoe_name'], 'Model 2000')
+
+    def test_delete_falls_back_to_the_next(self):
+        older = self.add_trial(1000)
+        newest = self.add_trial(2000)
+        self.db.shoeTrialResults.delete_one({'_id': newest['_id']})
+        self.assertTrue(trial_deleted(self.db, newest))
+        self.assertEqual(self.latest()['recording_id'], older['_id'])
+
+        # Deleting a trial that isn't the latest leaves it alone
+        self.assertFalse(trial_deleted(self.db, newest))
+
+        self.db.shoeTrialResults.delete_one({'_id': older['_id']})
+        trial_deleted(self.db, older)
+        self.assertIsNone(self.latest())
+
+    def test_rebuild_resumes(self):
+        customer_ids = [self.customer_id] + [self.data_generator.generate_fake_customer(self.company_id) for _ in range(2)]
+        newest = [self.add_trial(1000 + i, customer_id, save=False) for i, customer_id in enumerate(customer_ids)]
+        self.add_trial(1, customer_ids[0], save=False)
+        # Left over from a trial that has since gone
+        self.db.customers.update_one({'_id': ObjectId(customer_ids[1])}, {'$set': {'latest_trial': {'recording_id': 1}}})
+
+        self.assertEqual(rebuild_latest_trials(self.db, batch_size=2, max_batches=1), 2)
+        self.assertEqual(rebuild_latest_trials(self.db, batch_size=2), 1)
+        self.assertEqual(rebuild_latest_trials(self.db, batch_size=2), 0)
+        for customer_id, trial in zip(customer_ids, newest):
+            self.assertEqual(self.latest(customer_id)['recording_id'], trial['_id'])
+
+    def test_rebuild_keeps_saves_made_while_it_runs(self):
+        other_id = self.data_generator.generate_fake_customer(self.company_id)
+        self.add_trial(1000, save=False)
+        self.add_trial(1000, other_id, save=False)
+        collection = type(self.db.customers)
+        bulk_write = collection.bulk_write
+        saved = []
+
+        def save_during_rebuild(collection, requests, *args, **kwargs):
+            # Lands after the rebuild has found the latest trials, before it writes them
+            if not saved:
+                saved.append(self.add_trial(2000))
+            return bulk_write(collection, requests, *args, **kwargs)
+
+        with patch.object(collection, 'bulk_write', save_during_rebuild):
+            rebuild_latest_trials(self.db)
+        self.assertEqual(self.latest()['recording_id'], saved[0]['_id'])
+        self.assertEqual(self.latest(other_id)['recording_date'], 1000)
+
+    def test_servicers_keep_it_up_to_date(self):
+        technician_id, technician = self.data_generator.generate_fake_user(4, self.company_id)
+        request = self.data_generator.generate_shoe_trial_result_request(technician_id, customer_id=self.customer_id)
+        request.device_id = self.db.companies.find_one(
+            {'_id': ObjectId(self.company_id)})['branches'][0]['devices'][0]['device_id']
+        request.recording_date = 5000
+        servicer = DataServicer(self.db)
+        recording_id = servicer.setShoeTrialResult(request, TestingContext(technician)).string_result
+        self.assertEqual(self.latest()['recording_id'], ObjectId(recording_id))
+
+        _, admin = self.data_generator.generate_fake_user(6)
+        customers = list(CustomerServicer(self.db).getCustomers(messages_pb2.CMSQuery(mode=True), TestingContext(admin)))
+        self.assertEqual([x.customer_id for x in customers], [self.customer_id])
+        self.assertEqual(customers[0].shoeTrialResults.recording_date, 5000)
+
+        servicer.deleteShoeTrialResult(messages_pb2.CMSQuery(string_query=recording_id), TestingContext(admin))
+        self.assertIsNone(self.latest())
@@ -0,0 +1,96 @@
+import unittest
+from urllib.request import urlopen
+
+import grpc
+from interceptors.metrics_interceptor import HANDLED, HANDLING_SECONDS, MESSAGES_SENT, MetricsInterceptor, split_method_name
+from lib.metrics import Counter, Histogram, Registry, start_metrics_server
+from proto.messages_pb2 import Customer
+from tests.utils.testing_context import TestingContext
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.interceptor = MetricsInterceptor()
+        return super().setUp()
+
+    def test_render(self):
+        registry = Registry()
+        counter = registry.register(Counter('calls_total', 'Calls', ('method',)))
+        histogram = registry.register(Histogram('latency_seconds', 'Latency', (), buckets=(0.1, 1)))
+        counter.inc(method='Get')
+        counter.inc(2, method='Get')
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        body = registry.render()
+        self.assertIn('# TYPE calls_total counter', body)
+        self.assertIn('calls_total{method="Get"} 3', body)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', body)
+        self.assertIn('latency_seconds_bucket{le="1"} 2', body)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 2', body)
+        self.assertIn('latency_seconds_count 2', body)
+        with self.assertRaises(ValueError):
+            registry.register(Counter('calls_total', 'Calls again'))
+
+    def test_split_method_name(self):
+        self.assertEqual(split_method_name('/AvaProtos.Reports/GetData'), ('AvaProtos.Reports', 'GetData'))
+        self.assertEqual(split_method_name('bad'), ('unknown', 'bad'))
+
+    def test_unary(self):
+        labels = {'grpc_service': 'Test.Metrics', 'grpc_method': 'Unary', 'grpc_code': 'OK'}
+        before = HANDLED.value(**labels)
+        response = self.interceptor.intercept(lambda r, c: Customer(first_name='a'), None, TestingContext(), '/Test.Metrics/Unary')
+        self.assertEqual(response.first_name, 'a')
+        self.assertEqual(HANDLED.value(**labels), before + 1)
+        self.assertGreaterEqual(HANDLING_SECONDS.count(**labels), 1)
+
+    def test_aborted(self):
+        def handler(request, context):
+            context.abort(grpc.StatusCode.PERMISSION_DENIED, 'No')
+
+        labels = {'grpc_service': 'Test.Metrics', 'grpc_method': 'Aborted', 'grpc_code': 'PERMISSION_DENIED'}
+        before = HANDLED.value(**labels)
+        self.interceptor.intercept(handler, None, TestingContext(), '/Test.Metrics/Aborted')
+        self.assertEqual(HANDLED.value(**labels), before + 1)
+
+    def test_stream(self):
+        def handler(request, context):
+            for x in range(3):
+                yield Customer(first_name=str(x))
+
+        labels = {'grpc_service': 'Test.Metrics', 'grpc_method': 'Stream'}
+        sent = MESSAGES_SENT.value(**labels)
+        handled = HANDLED.value(grpc_code='OK', **labels)
+        responses = self.interceptor.intercept(handler, None, TestingContext(), '/Test.Metrics/Stream')
+        # Nothing is recorded until the stream is consumed
+        self.assertEqual(HANDLED.value(grpc_code='OK', **labels), handled)
+        self.assertEqual(len(list(responses)), 3)
+        self.assertEqual(MESSAGES_SENT.value(**labels), sent + 3)
+        self.assertEqual(HANDLED.value(grpc_code='OK', **labels), handled + 1)
+
+    def test_stream_cancelled(self):
+        def handler(request, context):
+            for x in range(3):
+                yield Customer(first_name=str(x))
+
+        labels = {'grpc_service': 'Test.Metrics', 'grpc_method': 'Cancelled', 'grpc_code': 'CANCELLED'}
+        before = HANDLED.value(**labels)
+        responses = self.interceptor.intercept(handler, None, TestingContext(), '/Test.Metrics/Cancelled')
+        next(responses)
+        responses.close()
+        self.assertEqual(HANDLED.value(**labels), before + 1)
+
+    def test_scrape_endpoint(self):
+        registry = Registry()
+        registry.register(Counter('scraped_total', 'Scrapes')).inc()
+        httpd = start_metrics_server(0, registry=registry)
+        try:
+            with urlopen(f'http://127.0.0.1:{httpd.server_address[1]}/metrics') as response:
+                body = response.read().decode('utf-8')
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+        self.assertIn('scraped_total 1', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
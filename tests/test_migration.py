@@ -0,0 +1,33 @@
+from lib.migration import resumable_batches
+from tests.test_servicer import TestServicer
+
+SETTING = 'migration_test'
+
+
+class TestMigration(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.collection = self.db.migrationTest
+        self.collection.delete_many({})
+        self.db.schema.delete_many({'name': SETTING})
+        self.collection.insert_many([{'_id': x, 'done': False} for x in range(5)])
+
+    def ids(self, **kwargs) -> list:
+        return [[x['_id'] for x in batch] for batch in resumable_batches(self.db, 'migrationTest', SETTING, **kwargs)]
+
+    def test_carries_on(self):
+        self.assertEqual(self.ids(batch_size=2, max_batches=1), [[0, 1]])
+        self.assertEqual(self.ids(batch_size=2), [[2, 3], [4]])
+        self.assertEqual(self.ids(batch_size=2), [])
+        self.assertEqual(self.ids(batch_size=2, max_batches=1, restart=True), [[0, 1]])
+
+    def test_query(self):
+        self.collection.update_many({'_id': {'$in': [1, 3]}}, {'$set': {'done': True}})
+        self.assertEqual(self.ids(query={'done': False}, projection={'_id': 1}, restart=True), [[0, 2, 4]])
+
+    def test_failed_batch_read_again(self):
+        with self.assertRaises(ValueError):
+            for batch in resumable_batches(self.db, 'migrationTest', SETTING, batch_size=2):
+                if batch[0]['_id'] == 2:
+                    raise ValueError()
+        self.assertEqual(self.ids(batch_size=2), [[2, 3], [4]])
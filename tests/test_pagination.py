@@ -0,0 +1,215 @@
+import unittest
+
+import grpc
+from bson import ObjectId
+from lib.counts import count_cache
+from lib.pagination import (NEXT_PAGE_TOKEN, TOTAL_COUNT, InvalidPageToken, Page, PagedAggregate, decode_page_token,
+                            encode_page_token, keyset_match)
+from proto import messages_pb2
+from services.customers import CustomerServicer
+from services.reports import ReportServicer
+from tests.test_servicer import TestServicer
+from tests.utils.testing_context import TestingContext
+
+
+class TestPageToken(unittest.TestCase):
+    def test_round_trip(self):
+        _id = ObjectId()
+        token = encode_page_token('updated', True, 1234, _id)
+        self.assertEqual(decode_page_token(token, 'updated', True), (1234, _id))
+
+    def test_rejects_other_sort(self):
+        token = encode_page_token('updated', False, 1234, ObjectId())
+        with self.assertRaises(InvalidPageToken):
+            decode_page_token(token, 'created', False)
+        with self.assertRaises(InvalidPageToken):
+            decode_page_token(token, 'updated', True)
+
+    def test_rejects_garbage(self):
+        for token in ['not a token', 'AAAA', encode_page_token('updated', False, 1, ObjectId())[:-6]]:
+            with self.assertRaises(InvalidPageToken):
+                decode_page_token(token, 'updated', False)
+
+    def test_keyset_match(self):
+        _id = ObjectId()
+        self.assertEqual(keyset_match(None, False, None, _id), {'_id': {'$gt': _id}})
+        self.assertEqual(keyset_match('updated', True, 5, _id),
+                         {'$or': [{'updated': {'$lt': 5}}, {'updated': None}, {'updated': 5, '_id': {'$lt': _id}}]})
+        self.assertEqual(keyset_match('updated', False, 5, _id),
+                         {'$or': [{'updated': {'$gt': 5}}, {'updated': 5, '_id': {'$gt': _id}}]})
+        self.assertEqual(keyset_match('updated', False, None, _id),
+                         {'$or': [{'updated': {'$ne': None}}, {'updated': None, '_id': {'$gt': _id}}]})
+
+    def test_skip_is_the_fallback(self):
+        page = Page(limit=10, skip=20, sort_by='updated')
+        self.assertEqual(page.stages(), [{'$sort': {'updated': 1, '_id': 1}}, {'$skip': 20}, {'$limit': 11}])
+
+        page = Page(limit=10, skip=20, token=encode_page_token('updated', False, 5, 'a'), sort_by='updated')
+        self.assertEqual(page.stages(), [
+            {'$match': keyset_match('updated', False, 5, 'a')},
+            {'$sort': {'updated': 1, '_id': 1}},
+            {'$limit': 11}])
+
+    def test_unpaged_keeps_order(self):
+        self.assertEqual(Page().sort(), [])
+        self.assertEqual(Page(sort_by='name').sort(), [('name', 1)])
+
+
+class TestPagedCustomers(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.db.customers.delete_many({})
+        self.servicer = CustomerServicer(self.db)
+        _, self.admin = self.data_generator.generate_fake_user(6)
+        company_id, _ = self.data_generator.generate_fake_company()
+        for _ in range(8):
+            self.data_generator.generate_fake_customer(company_id)
+        # Ties on the sort key have to be broken the same way on every page
+        ids = [x['_id'] for x in self.db.customers.find()]
+        for i, _id in enumerate(ids):
+            self.db.customers.update_one({'_id': _id}, {'$set': {'date_of_birth': i // 3}})
+
+    def list_customers(self, sort_order=1, **kwargs):
+        context = TestingContext(self.admin)
+        request = messages_pb2.CMSQuery(sort_by='date_of_birth', sort_order=sort_order, **kwargs)
+        customers = [x.customer_id for x in self.servicer.getCustomers(request, context)]
+        return customers, context
+
+    def page_through(self, limit, sort_order=1):
+        customers = []
+        token = ''
+        pages = 0
+        while True:
+            page, context = self.list_customers(sort_order, limit=limit, page_token=token)
+            customers.extend(page)
+            pages += 1
+            token = context.trailing_metadata.get(NEXT_PAGE_TOKEN)
+            if not token:
+                break
+        return customers, pages
+
+    def test_tokens_page_through_everything(self):
+        expected, _ = self.list_customers()
+
+        customers, pages = self.page_through(3)
+        self.assertEqual(pages, 3)
+        self.assertEqual(sorted(customers), sorted(expected))
+        self.assertEqual(len(set(customers)), 8)
+
+        # Old clients skipping get the same pages
+        self.assertEqual(self.list_customers(limit=3, skip=3)[0], customers[3:6])
+
+    def test_missing_sort_values(self):
+        ids = [x['_id'] for x in self.db.customers.find()]
+        self.db.customers.update_one({'_id': ids[0]}, {'$set': {'date_of_birth': None}})
+        self.db.customers.update_one({'_id': ids[4]}, {'$set': {'date_of_birth': None}})
+        self.db.customers.update_one({'_id': ids[6]}, {'$unset': {'date_of_birth': ''}})
+        for sort_order in [messages_pb2.CMSQuery.ASCENDING, messages_pb2.CMSQuery.DESCENDING]:
+            customers, pages = self.page_through(2, sort_order)
+            self.assertEqual(pages, 4)
+            self.assertEqual(sorted(customers), sorted(str(x) for x in ids))
+            # Missing sort first, so come last when descending
+            missing = {str(ids[0]), str(ids[4]), str(ids[6])}
+            ends = set(customers[:3]) if sort_order == messages_pb2.CMSQuery.ASCENDING else set(customers[-3:])
+            self.assertEqual(ends, missing)
+
+    def test_last_page_has_no_token(self):
+        customers, context = self.list_customers(limit=8)
+        self.assertEqual(len(customers), 8)
+        self.assertNotIn(NEXT_PAGE_TOKEN, context.trailing_metadata)
+
+    def test_invalid_token(self):
+        customers, context = self.list_customers(limit=3, page_token='nonsense')
+        self.assertEqual(customers, [])
+        self.assertEqual(context.status_code, grpc.StatusCode.INVALID_ARGUMENT)
+
+
+class TestPagedSaleRecords(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.db.shoeTrialResults.delete_many({})
+        self.servicer = ReportServicer(self.db)
+        company_id, branch_ids = self.data_generator.generate_fake_company(1, generate_shoes=False)
+        self.technician_id, self.technician = self.data_generator.generate_fake_user(4, company_id, branch_ids[0])
+        self.data_generator.generate_and_insert_shoe_trial_results(count=7, technician_id=self.technician_id)
+        # Ties on recording_date have to be broken the same way on every page
+        ids = [x['_id'] for x in self.db.shoeTrialResults.find()]
+        for i, _id in enumerate(ids):
+            self.db.shoeTrialResults.update_one({'_id': _id}, {'$set': {'recording_date': 1000 + i // 3}})
+
+    def list_records(self, **kwargs):
+        context = TestingContext(self.technician)
+        request = messages_pb2.ReportQuery(technician_id=self.technician_id, start_millis=1, end_millis=2000, **kwargs)
+        records = [x.message().recording_id for x in self.servicer.GetTechSaleRecords(request, context)]
+        return records, context
+
+    def test_tokens_page_through_everything(self):
+        records = []
+        token = ''
+        pages = 0
+        while True:
+            page, context = self.list_records(limit=3, page_token=token)
+            records.extend(page)
+            pages += 1
+            token = context.trailing_metadata.get(NEXT_PAGE_TOKEN)
+            if not token:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(records, self.list_records()[0])
+        self.assertEqual(len(set(records)), 7)
+
+        # Old clients skipping get the same pages
+        self.assertEqual(self.list_records(limit=3, skip=3)[0], records[3:6])
+
+    def test_invalid_token(self):
+        records, context = self.list_records(limit=3, page_token='nonsense')
+        self.assertEqual(records, [])
+        self.assertEqual(context.status_code, grpc.StatusCode.INVALID_ARGUMENT)
+
+
+class TestPagedAggregate(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.db.customers.delete_many({})
+        self.company_id, _ = self.data_generator.generate_fake_company()
+        for _ in range(5):
+            self.data_generator.generate_fake_customer(self.company_id)
+        self.data_generator.generate_fake_customer()
+        self.stages = [{'$match': {'company_id': self.company_id}}]
+
+    def tearDown(self):
+        count_cache.configure(0)
+
+    def aggregate(self, page):
+        return PagedAggregate(self.db.customers, self.stages, page, self.company_id, depends=['shoeTrialResults'])
+
+    def test_page_and_total_together(self):
+        page = Page(limit=2, sort_by='email')
+        context = TestingContext()
+        customers = list(page.results(context, self.aggregate(page).run()))
+        self.assertEqual(len(customers), 2)
+        self.assertEqual(page.total, 5)
+        self.assertEqual(context.trailing_metadata[TOTAL_COUNT], '5')
+        self.assertIn(NEXT_PAGE_TOKEN, context.trailing_metadata)
+
+    def test_later_pages_reuse_the_cached_total(self):
+        count_cache.configure(60)
+        first = Page(limit=2, sort_by='email')
+        list(first.results(TestingContext(), self.aggregate(first).run()))
+
+        self.db.customers.delete_one({'company_id': self.company_id})
+        second = Page(limit=2, token=first.next_page_token, sort_by='email')
+        list(second.results(TestingContext(), self.aggregate(second).run()))
+        self.assertEqual(second.total, 5)
+        self.assertEqual(self.aggregate(Page()).count(), 5)
+
+        # A write to a collection the stages read drops it
+        count_cache.invalidate('shoeTrialResults', self.company_id)
+        self.assertEqual(self.aggregate(Page()).count(), 4)
+
+    def test_no_total_without_a_limit_or_cache(self):
+        page = Page()
+        context = TestingContext()
+        self.assertEqual(len(list(page.results(context, self.aggregate(page).run()))), 5)
+        self.assertIsNone(page.total)
+        self.assertEqual(context.trailing_metadata, {})
@@ -0,0 +1,89 @@
+import unittest
+from concurrent import futures
+
+import grpc
+from bson import ObjectId
+from lib.passthrough import SerializedMessage, add_passthrough_servicer, encode_fields, override_fields
+from proto import messages_pb2, messages_pb2_grpc
+from services.data import trial_result_message
+from services.reports import sale_record_message
+from tests.test_servicer import TestServicer
+
+
+class ExampleServicer(messages_pb2_grpc.DataServicer):
+    def __init__(self, stored):
+        self.stored = stored
+
+    def getShoeTrialResults(self, request, context):
+        for x in self.stored:
+            yield trial_result_message(x)
+
+    def getMinifiedResultsByCustomerId(self, request, context):
+        # Not registered as a passthrough method, so still serialized as usual
+        yield messages_pb2.ShoeTrialResult(recording_id='plain')
+
+
+class TestEncodeFields(unittest.TestCase):
+    def test_same_as_parsing(self):
+        stored = messages_pb2.ShoeTrialResult(recording_id='old', company_id='company', created=5, shoe_brand='Nike')
+        fields = {'recording_id': 'new', 'company_id': '', 'created': -1}
+        msg = override_fields(stored.SerializeToString(), messages_pb2.ShoeTrialResult, **fields).message()
+
+        expected = messages_pb2.ShoeTrialResult()
+        expected.CopyFrom(stored)
+        expected.recording_id = 'new'
+        # Left at its default, which SerializeToString alone would drop
+        expected.company_id = ''
+        expected.created = -1
+        self.assertEqual(msg, expected)
+
+    def test_only_scalars(self):
+        with self.assertRaises(TypeError):
+            encode_fields(messages_pb2.ShoeTrialResult, purchase_decision=b'')
+
+
+class TestStoredMessages(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.request = self.data_generator.generate_shoe_trial_result_request()
+        self.stored = {
+            '_id': ObjectId(),
+            'bin': self.request.SerializeToString(),
+            'created': 1234,
+            'company_id': 'company',
+            'branch_id': 'branch',
+            'technician_id': 'technician'}
+
+    def parsed(self, **fields):
+        msg = messages_pb2.ShoeTrialResult()
+        msg.ParseFromString(self.stored['bin'])
+        for name, value in fields.items():
+            setattr(msg, name, value)
+        return msg
+
+    def test_trial_result_message(self):
+        msg = trial_result_message(self.stored)
+        self.assertIsInstance(msg, SerializedMessage)
+        self.assertEqual(msg.message(), self.parsed(recording_id=str(self.stored['_id']), created=1234))
+
+    def test_sale_record_message(self):
+        ids = {'recording_id': str(self.stored['_id']), 'company_id': 'company', 'branch_id': 'branch',
+               'technician_id': 'technician'}
+        self.assertEqual(sale_record_message(self.stored).message(), self.parsed(**ids))
+        self.assertEqual(sale_record_message(self.stored, created=True).message(), self.parsed(created=1234, **ids))
+
+    def test_streamed_without_serializing(self):
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        add_passthrough_servicer(messages_pb2_grpc.add_DataServicer_to_server, ExampleServicer([self.stored]), server,
+                                 ['/AvaProtos.Data/getShoeTrialResults'])
+        port = server.add_insecure_port('127.0.0.1:0')
+        server.start()
+        try:
+            with grpc.insecure_channel(f'127.0.0.1:{port}') as channel:
+                stub = messages_pb2_grpc.DataStub(channel)
+                results = list(stub.getShoeTrialResults(messages_pb2.CMSQuery()))
+                plain = list(stub.getMinifiedResultsByCustomerId(messages_pb2.CMSQuery()))
+        finally:
+            server.stop(None)
+        self.assertEqual(results, [self.parsed(recording_id=str(self.stored['_id']), created=1234)])
+        self.assertEqual([x.recording_id for x in plain], ['plain'])
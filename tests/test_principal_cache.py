@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch
+
+from bson import ObjectId
+from lib.principal_cache import PrincipalCache
+
+
+class TestPrincipalCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = PrincipalCache(max_size=3, ttl=60)
+        self.company_id = str(ObjectId())
+        self.user = {'_id': ObjectId(), 'email': 'tech@testing.com', 'role': 2, 'company_id': self.company_id, 'locked': False}
+        self.company = {'_id': ObjectId(self.company_id), 'blocked': False}
+        return super().setUp()
+
+    def test_hit_and_miss(self):
+        self.assertIsNone(self.cache.get('token'))
+        self.cache.set('token', self.user, self.company)
+        user, company = self.cache.get('token')
+        self.assertEqual(user, self.user)
+        self.assertEqual(company, self.company)
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_returns_copy_of_user(self):
+        self.cache.set('token', self.user, self.company)
+        user, _ = self.cache.get('token')
+        user['role'] = 6
+        user, _ = self.cache.get('token')
+        self.assertEqual(user['role'], 2)
+
+    def test_expiry(self):
+        self.cache.set('token', self.user, self.company)
+        with patch('lib.principal_cache.time.monotonic', return_value=10 ** 12):
+            self.assertIsNone(self.cache.get('token'))
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+    def test_lru_eviction(self):
+        for token in ['a', 'b', 'c']:
+            self.cache.set(token, self.user, self.company)
+        # Touch 'a' so 'b' is the least recently used
+        self.cache.get('a')
+        self.cache.set('d', self.user, self.company)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_invalidate_user(self):
+        other_user = dict(self.user, _id=ObjectId())
+        self.cache.set('a', self.user, self.company)
+        self.cache.set('b', other_user, self.company)
+        self.cache.invalidate_user(str(self.user['_id']))
+        self.assertIsNone(self.cache.get('a'))
+        self.assertIsNotNone(self.cache.get('b'))
+
+    def test_invalidate_company(self):
+        other_user = dict(self.user, _id=ObjectId(), company_id=str(ObjectId()))
+        self.cache.set('a', self.user, self.company)
+        self.cache.set('b', other_user, None)
+        self.cache.invalidate_company(ObjectId(self.company_id))
+        self.assertIsNone(self.cache.get('a'))
+        self.assertIsNotNone(self.cache.get('b'))
+        self.assertEqual(self.cache.stats()['invalidations'], 1)
@@ -0,0 +1,73 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from lib.query_log import COMMAND_SECONDS, SLOW_COMMANDS, QueryLog, explain_flags, fingerprint, query_shape
+from lib.request_context import RequestContext, run_tracked
+
+
+def events(command_name, command, duration_ms, request_id=1):
+    started = SimpleNamespace(
+        command_name=command_name, command=command, database_name='avaclone-unittests',
+        connection_id=('localhost', 27017), request_id=request_id)
+    succeeded = SimpleNamespace(
+        command_name=command_name, connection_id=('localhost', 27017), request_id=request_id,
+        duration_micros=duration_ms * 1000)
+    return started, succeeded
+
+
+class TestQueryLog(unittest.TestCase):
+    def test_fingerprint_ignores_values(self):
+        first = query_shape('find', {'find': 'customers', 'filter': {'company_id': 'a', 'gender': {'$in': [1, 2]}},
+                                     'sort': {'created': -1}, 'limit': 10, 'lsid': {'id': 1}})
+        second = query_shape('find', {'find': 'customers', 'filter': {'company_id': 'b', 'gender': {'$in': [1]}},
+                                      'sort': {'created': -1}, 'limit': 50})
+        self.assertEqual(first, {'find': 'customers', 'filter': {'company_id': '?', 'gender': {'$in': ['?']}},
+                                 'sort': {'created': -1}})
+        self.assertEqual(fingerprint(first), fingerprint(second))
+
+        other = query_shape('find', {'find': 'customers', 'filter': {'email': 'a'}})
+        self.assertNotEqual(fingerprint(first), fingerprint(other))
+
+    def test_explain_flags(self):
+        explain = {'stages': [
+            {'$cursor': {'queryPlanner': {'winningPlan': {'stage': 'FETCH', 'inputStage': {'stage': 'COLLSCAN'}}}}},
+            {'$lookup': {'from': 'customers'}, 'totalDocsExamined': 50000, 'collectionScans': 0}
+        ]}
+        self.assertEqual(explain_flags(explain), ['COLLSCAN', 'LOOKUP_FANOUT'])
+        self.assertEqual(explain_flags({'queryPlanner': {'winningPlan': {'stage': 'IXSCAN'}}}), [])
+
+    def test_slow_command(self):
+        query_log = QueryLog(slow_ms=100, explain_sample_rate=1)
+        query_log.client = MagicMock()
+        query_log.client.__getitem__.return_value.command.return_value = {
+            'queryPlanner': {'winningPlan': {'stage': 'COLLSCAN'}}}
+        command = {'aggregate': 'shoeTrialResults', 'pipeline': [{'$match': {'company_id': 'a'}}],
+                   'cursor': {'batchSize': 100}, 'lsid': {'id': 1}, '$db': 'avaclone-unittests'}
+        started, succeeded = events('aggregate', command, 250)
+        key = fingerprint(query_shape('aggregate', command))
+        before = SLOW_COMMANDS.value(command='aggregate', collection='shoeTrialResults', fingerprint=key)
+
+        query_log.started(started)
+        query_log.succeeded(succeeded)
+        self.assertEqual(SLOW_COMMANDS.value(command='aggregate', collection='shoeTrialResults', fingerprint=key), before + 1)
+        query_log._executor.shutdown(wait=True)
+        explained = query_log.client.__getitem__.return_value.command.call_args
+        self.assertEqual(explained[0], ('explain', {'aggregate': 'shoeTrialResults', 'pipeline': command['pipeline'], 'cursor': {}}))
+        self.assertEqual(explained[1], {'verbosity': 'executionStats'})
+
+        # The same shape isn't explained again straight away
+        started, succeeded = events('aggregate', command, 250, request_id=2)
+        query_log.started(started)
+        query_log.succeeded(succeeded)
+        query_log._executor.shutdown(wait=True)
+        self.assertEqual(query_log.client.__getitem__.return_value.command.call_count, 1)
+
+    def test_tagged_by_rpc(self):
+        query_log = QueryLog()
+        labels = dict(command='find', collection='users', grpc_service='AvaProtos.Test', grpc_method='tagged')
+        before = COMMAND_SECONDS.count(**labels)
+        started, succeeded = events('find', {'find': 'users', 'filter': {}}, 5)
+        run_tracked('/AvaProtos.Test/tagged', RequestContext(None), lambda: query_log.started(started))
+        query_log.succeeded(succeeded)
+        self.assertEqual(COMMAND_SECONDS.count(**labels), before + 1)
@@ -0,0 +1,116 @@
+import random
+import re
+import unittest
+
+from bson import ObjectId
+from lib.latest_trial import rebuild_latest_trials
+from lib.pagination import Page
+from lib.query_planner import CustomerTrialPlan
+from lib.query_utils import cms_to_customerModel
+from proto import messages_pb2
+from services.customers import LIST_FIELDS, TRIAL_FIELDS, CustomerServicer, bio_filters
+from tests.test_servicer import TestServicer
+
+
+class TestCustomerTrialPlan(unittest.TestCase):
+    def plan(self, *queries):
+        plan = CustomerTrialPlan()
+        for query in queries:
+            plan.add(query)
+        return plan
+
+    def test_trial_predicates_go_on_latest_trial(self):
+        plan = self.plan({'gender': 1, 'shoeTrialResults.shoe_brand': 'Nike', 'company_id': 'a'})
+        self.assertEqual(plan.match(), {
+            'company_id': 'a',
+            'gender': 1,
+            'latest_trial.shoe_brand': 'Nike',
+            'latest_trial.recording_id': {'$exists': True}})
+
+    def test_index_keys_then_equality_then_ranges(self):
+        pattern = re.compile('smith', re.IGNORECASE)
+        plan = self.plan({
+            'last_name': {'$regex': pattern},
+            'shoeTrialResults.recording_date': {'$gte': 1, '$lte': 2},
+            'gender': 2,
+            'branch_id': 'b',
+            'company_id': 'a'})
+        self.assertEqual(list(plan.match()), ['company_id', 'branch_id', 'gender', 'latest_trial.recording_date',
+                                              'last_name', 'latest_trial.recording_id'])
+
+    def test_repeated_fields_are_all_kept(self):
+        pattern = re.compile('1', re.IGNORECASE)
+        plan = self.plan({'gender': 1}, {'gender': {'$regex': pattern}})
+        self.assertEqual(plan.match()['$and'], [{'gender': 1}, {'gender': {'$regex': pattern}}])
+
+    def test_no_predicates(self):
+        self.assertEqual(self.plan().stages(), [{'$match': {'latest_trial.recording_id': {'$exists': True}}}])
+
+
+class TestPlannedResults(TestServicer):
+    """Matching on latest_trial finds the customers the join to shoeTrialResults used to, needs $lookup with a pipeline"""
+
+    BRANDS = ['Nike', 'Asics', 'Brooks']
+
+    def setUp(self):
+        super().setUp()
+        self.db.customers.delete_many({})
+        self.db.shoeTrialResults.delete_many({})
+        self.servicer = CustomerServicer(self.db)
+        self.company_id, _ = self.data_generator.generate_fake_company()
+        for i in range(12):
+            customer_id = self.data_generator.generate_fake_customer(self.company_id if i % 3 else None)
+            self.db.customers.update_one({'_id': ObjectId(customer_id)}, {'$set': {'gender': random.choice([1, 2])}})
+            # Customers with no trials are never listed
+            for day in range(i % 4):
+                self.db.shoeTrialResults.insert_one({
+                    'customer_id': customer_id,
+                    'recording_date': day * 1000 + i,
+                    'shoe_name': 'Model %d' % day,
+                    'shoe_brand': random.choice(self.BRANDS),
+                    'shoe_size': '9',
+                    'shoe_season': 'SS'})
+        rebuild_latest_trials(self.db, restart=True)
+
+    def reference_stages(self, request):
+        """The pipeline as it was, joining each customer to their latest trial and matching after the join"""
+        stages = [
+            {'$project': dict({'_id': {'$toString': '$_id'}}, **{x: '$' + x for x in LIST_FIELDS})},
+            {
+                '$lookup': {
+                    'from': 'shoeTrialResults',
+                    'localField': '_id',
+                    'foreignField': 'customer_id',
+                    'as': 'shoeTrialResults',
+                    'pipeline': [
+                        {'$sort': {'recording_date': -1}},
+                        {'$group': dict({'_id': '$customer_id'}, **{x: {'$first': '$' + x} for x in TRIAL_FIELDS})}
+                    ]
+                }
+            },
+            {'$unwind': '$shoeTrialResults'}
+        ]
+        for query in [cms_to_customerModel(request), bio_filters(request)]:
+            if query:
+                stages.append({'$match': query})
+        return stages
+
+    def assertSameCustomers(self, request):
+        planned = self.servicer.bio_customers_aggregate(request, Page()).stages
+        expected = sorted(ObjectId(x['_id']) for x in self.db.customers.aggregate(self.reference_stages(request)))
+        actual = sorted(x['_id'] for x in self.db.customers.aggregate(planned))
+        self.assertEqual(actual, expected, request)
+
+    def test_bio_filters(self):
+        requests = [
+            messages_pb2.CMSQuery(),
+            messages_pb2.CMSQuery(company=self.company_id),
+            messages_pb2.CMSQuery(gender='2'),
+            messages_pb2.CMSQuery(brand='Nike'),
+            messages_pb2.CMSQuery(company=self.company_id, gender='1', brand='Asics'),
+            messages_pb2.CMSQuery(start_millis=1000, end_millis=2500),
+            messages_pb2.CMSQuery(start_bir_millis=1, end_bir_millis=5000000, model='Model 1'),
+            messages_pb2.CMSQuery(filter_on='shoe_brand,first_name', string_query='nik,a'),
+        ]
+        for request in requests:
+            self.assertSameCustomers(request)
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from bson import ObjectId
+from lib.db import DeadlineDatabase
+from pymongo.collection import Collection
+from lib.request_context import ABANDONED, ReadCounter, RequestContext, get_request_context, read_stats, run_tracked, while_active
+from tests.test_servicer import TestServicer
+from tests.utils.testing_context import TestingContext
+
+
+class TestRequestContext(TestServicer):
+    def setUp(self):
+        super().setUp()
+        company_id, branch_ids = self.data_generator.generate_fake_company(2, generate_shoes=False)
+        self.company_id = company_id
+        self.user_id, self.user = self.data_generator.generate_fake_user(2, company_id, branch_ids[0])
+
+    def test_company_memoized(self):
+        request_context = RequestContext(self.db, self.user)
+        company = request_context.company
+        self.assertEqual(str(company['_id']), self.company_id)
+        # Changes after the first load are not seen for the rest of the RPC
+        self.db.companies.update_one({'_id': ObjectId(self.company_id)}, {'$set': {'name': 'Renamed'}})
+        self.assertIs(request_context.company, company)
+        self.assertIs(request_context.get_company(ObjectId(self.company_id)), company)
+
+    def test_branch_and_devices(self):
+        request_context = RequestContext(self.db, self.user)
+        self.assertEqual(request_context.branch['branch_id'], self.user['branch_id'])
+        company = self.db.companies.find_one({'_id': ObjectId(self.company_id)})
+        devices = {d['device_id'] for b in company['branches'] for d in b['devices']}
+        self.assertSetEqual(request_context.device_ids, devices)
+
+    def test_no_company(self):
+        request_context = RequestContext(self.db, {'company_id': '', 'branch_id': ''})
+        self.assertIsNone(request_context.company)
+        self.assertIsNone(request_context.branch)
+        self.assertSetEqual(request_context.device_ids, set())
+        self.assertFalse(request_context.licence_active)
+
+    def test_licence_active(self):
+        expiry = int((datetime.now() + timedelta(days=1)).timestamp() * 1000)
+        self.assertTrue(RequestContext(self.db, self.user, {'type': 'pro', 'licence_expiry': expiry}).licence_active)
+        self.assertFalse(RequestContext(self.db, self.user, {'type': 'lite', 'licence_expiry': expiry}).licence_active)
+        self.assertFalse(RequestContext(self.db, self.user, {'type': 'pro'}).licence_active)
+        expired = int((datetime.now() - timedelta(days=1)).timestamp() * 1000)
+        self.assertFalse(RequestContext(self.db, self.user, {'type': 'pro', 'licence_expiry': expired}).licence_active)
+
+    def test_get_request_context_attaches_once(self):
+        context = TestingContext(self.user)
+        request_context = get_request_context(context, self.db)
+        self.assertIs(request_context.user, self.user)
+        self.assertIs(get_request_context(context, self.db), request_context)
+
+    def test_reads_counted_per_rpc(self):
+        counter = ReadCounter()
+        request_context = RequestContext(self.db, self.user)
+
+        def stream():
+            for _ in range(3):
+                counter.started(SimpleNamespace(command_name='find'))
+                counter.started(SimpleNamespace(command_name='insert'))
+                yield 1
+
+        responses = run_tracked('/AvaProtos.Test/stream', request_context, stream)
+        self.assertEqual(list(responses), [1, 1, 1])
+        self.assertEqual(request_context.reads, 3)
+        calls, reads = read_stats()['/AvaProtos.Test/stream']
+        self.assertGreaterEqual(calls, 1)
+        self.assertGreaterEqual(reads, 3)
+
+        # Nothing is bound once the RPC has finished
+        counter.started(SimpleNamespace(command_name='find'))
+        self.assertEqual(request_context.reads, 3)
+
+    def test_deadline_caps_max_time(self):
+        self.assertIsNone(RequestContext(self.db).max_time_ms())
+        request_context = RequestContext(self.db, time_remaining=5)
+        self.assertTrue(4000 < request_context.max_time_ms() <= 5000)
+        # An expired deadline still gives Mongo a limit so the query fails fast
+        self.assertEqual(RequestContext(self.db, time_remaining=-1).max_time_ms(), 1)
+
+        database = DeadlineDatabase(self.db.client, self.db.name, max_time_ms=15000)
+        reads = [
+            ('find', 'max_time_ms', lambda users, **kwargs: users.find({}, **kwargs)),
+            ('aggregate', 'maxTimeMS', lambda users, **kwargs: users.aggregate([], **kwargs)),
+            ('count_documents', 'maxTimeMS', lambda users, **kwargs: users.count_documents({}, **kwargs)),
+            ('count', 'maxTimeMS', lambda users, **kwargs: users.count({}, **kwargs)),
+            ('distinct', 'maxTimeMS', lambda users, **kwargs: users.distinct('email', **kwargs))
+        ]
+        for name, key, read in reads:
+            with self.subTest(name), patch.object(Collection, name) as sent:
+                # The deadline is under the profile's limit
+                run_tracked('/AvaProtos.Test/deadline', request_context, lambda: read(database.users))
+                self.assertTrue(4000 < sent.call_args.kwargs[key] <= 5000)
+                # A tighter limit from the caller is kept
+                run_tracked('/AvaProtos.Test/deadline', request_context, lambda: read(database.users, **{key: 100}))
+                self.assertEqual(sent.call_args.kwargs[key], 100)
+                # Without a deadline the profile's limit applies
+                run_tracked('/AvaProtos.Test/deadline', RequestContext(self.db), lambda: read(database.users))
+                self.assertEqual(sent.call_args.kwargs[key], 15000)
+                read(DeadlineDatabase(self.db.client, self.db.name).users)
+                self.assertNotIn(key, sent.call_args.kwargs)
+
+    def test_while_active_stops_on_cancel(self):
+        class CancellingContext(TestingContext):
+            active = True
+
+            def is_active(self):
+                return self.active
+
+        context = CancellingContext()
+        request_context = get_request_context(context, self.db)
+        request_context.method_name = '/AvaProtos.Test/cancel'
+        before = ABANDONED.value(grpc_service='AvaProtos.Test', grpc_method='cancel', reason='cancelled')
+        pulled = []
+
+        def results():
+            for x in range(5):
+                pulled.append(x)
+                yield x
+
+        for x in while_active(context, results()):
+            if x == 1:
+                context.active = False
+        # Nothing more is pulled from the cursor once the client has gone
+        self.assertEqual(pulled, [0, 1])
+        self.assertEqual(ABANDONED.value(grpc_service='AvaProtos.Test', grpc_method='cancel', reason='cancelled'), before + 1)
+
+        # Contexts without is_active (e.g. in tests) stream everything
+        self.assertEqual(list(while_active(TestingContext(), range(3))), [0, 1, 2])
@@ -0,0 +1,84 @@
+from bson import ObjectId
+from lib.resolver import Resolver, batches
+from lib.timestamp import now
+from services.reports import ReportServicer
+from tests.test_servicer import TestServicer
+
+
+class CountingCollection():
+    def __init__(self, collection, finds):
+        self.collection = collection
+        self.finds = finds
+
+    def find(self, *args, **kwargs):
+        self.finds.append(self.collection.name)
+        return self.collection.find(*args, **kwargs)
+
+
+class CountingDatabase():
+    def __init__(self, db):
+        self.db = db
+        self.finds = []
+
+    def __getitem__(self, name):
+        return CountingCollection(self.db[name], self.finds)
+
+
+class TestResolver(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.company_ids = [self.data_generator.generate_fake_company(generate_shoes=False)[0] for _ in range(3)]
+
+    def test_one_query_per_load(self):
+        db = CountingDatabase(self.db)
+        resolver = Resolver(db, {'companies': {'name': 1}})
+        resolver.load('companies', self.company_ids * 2 + ['', 'not an id', str(ObjectId())])
+        self.assertEqual(db.finds, ['companies'])
+
+        for company_id in self.company_ids:
+            company = resolver.get('companies', ObjectId(company_id))
+            self.assertEqual(set(company), {'_id', 'name'})
+        self.assertIsNone(resolver.get('companies', 'not an id'))
+
+        # Everything already loaded, found or not, is memoized
+        resolver.load('companies', self.company_ids + [''])
+        self.assertEqual(db.finds, ['companies'])
+
+    def test_get_loads_what_was_missed(self):
+        db = CountingDatabase(self.db)
+        resolver = Resolver(db)
+        self.assertEqual(str(resolver.get('companies', self.company_ids[0])['_id']), self.company_ids[0])
+        self.assertEqual(db.finds, ['companies'])
+
+    def test_batches(self):
+        self.assertEqual(list(batches(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(batches([], 2)), [])
+
+
+class TestResolvedReports(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.db.shoeTrialResults.delete_many({})
+        self.company_id, branch_ids = self.data_generator.generate_fake_company(2)
+        self.technicians = [self.data_generator.generate_fake_user(2, self.company_id, branch_id)[1] for branch_id in branch_ids]
+        for x in self.technicians:
+            self.data_generator.generate_and_insert_shoe_trial_results(count=4, technician_id=str(x['_id']))
+        self.db.shoeTrialResults.update_many({}, {'$set': {'recording_date': now()}})
+        company = self.db.companies.find_one({'_id': ObjectId(self.company_id)})
+        self.branch_names = {x['branch_id']: x['name'] for x in company['branches']}
+
+    def test_table_record_names(self):
+        db = CountingDatabase(self.db)
+        servicer = ReportServicer(self.db)
+        servicer.resolver = lambda: Resolver(db, {})
+        records = servicer.get_table_record(now() - 60000, now() + 60000, self.company_id)
+        self.assertTrue(records)
+        names = {x['name']: self.branch_names[x['branch_id']] for x in self.technicians}
+        for x in records:
+            self.assertEqual(x.store, names[x.tech])
+        self.assertEqual(sorted(db.finds), ['companies', 'users'])
+
+    def test_top_technician_locations(self):
+        technicians = ReportServicer(self.db).get_top_technicians(now() - 60000, now() + 60000, self.company_id)
+        expected = {str(x['_id']): (x['name'], self.branch_names[x['branch_id']]) for x in self.technicians}
+        self.assertEqual({x.id: (x.name, x.location) for x in technicians}, expected)
@@ -0,0 +1,150 @@
+import asyncio
+from concurrent import futures
+from unittest.mock import patch
+
+import grpc
+import jwt
+from aio_server import AioServer, aio_server_interceptors
+from config import get_config
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+from interceptors.admission_interceptor import REJECTED
+from interceptors.compression_interceptor import CompressionInterceptor
+from interceptors.metrics_interceptor import HANDLED
+from lib.health import NOT_SERVING, SERVING, HealthMonitor
+from lib.server_settings import server_settings
+from proto import messages_pb2, messages_pb2_grpc
+from server import server_interceptors
+from tests.test_servicer import TestServicer
+from tests.utils.testing_context import TestingContext
+
+LABELS = {'grpc_service': 'AvaProtos.Shoes', 'grpc_method': 'getShoe'}
+CODES = ['OK', 'UNAUTHENTICATED', 'RESOURCE_EXHAUSTED']
+
+
+class SyncServicer(messages_pb2_grpc.ShoesServicer):
+    def getShoe(self, request, context):
+        return messages_pb2.Shoe(brand=context.user['email'])
+
+
+class AsyncServicer(messages_pb2_grpc.ShoesServicer):
+    async def getShoe(self, request, context):
+        return messages_pb2.Shoe(brand=context.user['email'])
+
+
+class TestServerParity(TestServicer):
+    """Runs getShoe through the interceptors of Server and of AioServer
+
+    The aio server is tried with a sync handler, as the passthrough servicers
+    have, and an async one, as its motor servicers have.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.config = {'jwt-key': 'fake_jwt_key', 'server': {'method-compression': {'/AvaProtos.Shoes/getShoe': 'gzip'}}}
+        company_id, branch_ids = self.data_generator.generate_fake_company(1, generate_shoes=False)
+        _, self.manager = self.data_generator.generate_fake_user(4, company_id, branch_ids[0])
+        self.metadata = (('authorization', f'token {jwt.encode(self.manager, self.config["jwt-key"], algorithm="HS256")}'),)
+
+    def call_sync(self, config, metadata):
+        executor = futures.ThreadPoolExecutor(max_workers=2)
+        server = grpc.server(executor, interceptors=server_interceptors(self.db, config, server_settings(config)))
+        messages_pb2_grpc.add_ShoesServicer_to_server(SyncServicer(), server)
+        port = server.add_insecure_port('127.0.0.1:0')
+        server.start()
+        try:
+            with grpc.insecure_channel(f'127.0.0.1:{port}') as channel:
+                return messages_pb2_grpc.ShoesStub(channel).getShoe(messages_pb2.CMSQuery(), metadata=metadata).brand
+        except grpc.RpcError as e:
+            return e.code()
+        finally:
+            server.stop(None)
+            executor.shutdown()
+
+    def call_aio(self, config, servicer, metadata):
+        async def run():
+            server = grpc.aio.server(
+                migration_thread_pool=executor,
+                interceptors=aio_server_interceptors(self.db, config, server_settings(config)))
+            messages_pb2_grpc.add_ShoesServicer_to_server(servicer, server)
+            port = server.add_insecure_port('127.0.0.1:0')
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(f'127.0.0.1:{port}') as channel:
+                    response = await messages_pb2_grpc.ShoesStub(channel).getShoe(messages_pb2.CMSQuery(), metadata=metadata)
+                    return response.brand
+            except grpc.aio.AioRpcError as e:
+                return e.code()
+            finally:
+                await server.stop(None)
+
+        executor = futures.ThreadPoolExecutor(max_workers=2)
+        try:
+            return asyncio.run(run())
+        finally:
+            # A sync handler's abort reaches the client before the interceptors around it return
+            executor.shutdown()
+
+    def outcomes(self, config, metadata) -> list:
+        # What the client got back, and what the metrics and compression saw, through each server
+        results = []
+        for call in [lambda: self.call_sync(config, metadata),
+                     lambda: self.call_aio(config, SyncServicer(), metadata),
+                     lambda: self.call_aio(config, AsyncServicer(), metadata)]:
+            handled = {code: HANDLED.value(grpc_code=code, **LABELS) for code in CODES}
+            rejected = REJECTED.value(reason='service', **LABELS)
+            with patch.object(CompressionInterceptor, 'apply', autospec=True) as apply:
+                result = call()
+            results.append((
+                result,
+                {code: HANDLED.value(grpc_code=code, **LABELS) - handled[code] for code in CODES},
+                REJECTED.value(reason='service', **LABELS) - rejected,
+                [x.args[2] for x in apply.call_args_list]))
+        return results
+
+    def test_served(self):
+        self.assertEqual(self.outcomes(self.config, self.metadata), [
+            (self.manager['email'], {'OK': 1, 'UNAUTHENTICATED': 0, 'RESOURCE_EXHAUSTED': 0}, 0, ['/AvaProtos.Shoes/getShoe'])
+        ] * 3)
+
+    def test_unauthenticated(self):
+        self.assertEqual(self.outcomes(self.config, ()), [
+            (grpc.StatusCode.UNAUTHENTICATED, {'OK': 0, 'UNAUTHENTICATED': 1, 'RESOURCE_EXHAUSTED': 0}, 0, [])
+        ] * 3)
+
+    def test_rejected(self):
+        config = dict(self.config, admission={'service-limits': {'AvaProtos.Shoes': 0}})
+        self.assertEqual(self.outcomes(config, self.metadata), [
+            (grpc.StatusCode.RESOURCE_EXHAUSTED, {'OK': 0, 'UNAUTHENTICATED': 0, 'RESOURCE_EXHAUSTED': 1}, 1, [])
+        ] * 3)
+
+
+class TestAioServer(TestServicer):
+    def aio_server(self, config) -> AioServer:
+        # Skips __init__, the motor databases aren't used by anything this runs
+        aio = AioServer.__new__(AioServer)
+        aio.config = config
+        aio.unittesting = True
+        aio.database = aio.ingest_database = aio.analytics_database = self.db
+        aio.motor_database = aio.motor_ingest_database = aio.motor_analytics_database = None
+        return aio
+
+    def test_health_and_drain(self):
+        config = dict(get_config(), **{'aio-server': {'insecure-port': 0}})
+        config['server'] = dict(config.get('server') or {}, **{'drain-delay-seconds': 0, 'drain-grace-seconds': 0})
+        aio = self.aio_server(config)
+
+        async def run():
+            server = await aio.serve()
+            try:
+                async with grpc.aio.insecure_channel(f'127.0.0.1:{aio.insecure_port}') as channel:
+                    stub = health_pb2_grpc.HealthStub(channel)
+                    before = (await stub.Check(health_pb2.HealthCheckRequest())).status
+                    await aio.drain(server, server_settings(config))
+                    after = aio.health.servicer.Check(health_pb2.HealthCheckRequest(), TestingContext()).status
+                    # Stopped within the grace period
+                    return before, after, await server.wait_for_termination(1)
+            finally:
+                await server.stop(None)
+
+        with patch.object(HealthMonitor, 'check', lambda monitor: monitor.servicer.set('', SERVING)):
+            self.assertEqual(asyncio.run(run()), (SERVING, NOT_SERVING, False))
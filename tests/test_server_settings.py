@@ -0,0 +1,67 @@
+import unittest
+from concurrent import futures
+
+import grpc
+from interceptors.compression_interceptor import CompressionInterceptor
+from lib.server_settings import channel_options, compression, server_settings
+from tests.utils.testing_context import TestingContext
+
+
+class TestServerSettings(unittest.TestCase):
+    def test_defaults(self):
+        settings = server_settings({'server': {'workers': 4}})
+        self.assertEqual(settings['workers'], 4)
+        self.assertEqual(settings['insecure-port'], 50051)
+        self.assertEqual(channel_options(server_settings({})), [])
+
+    def test_channel_options(self):
+        options = channel_options({
+            'max-message-bytes': 1024,
+            'keepalive-permit-without-calls': True,
+            'grpc-options': {'grpc.so_reuseport': 0}
+        })
+        self.assertIn(('grpc.max_send_message_length', 1024), options)
+        self.assertIn(('grpc.max_receive_message_length', 1024), options)
+        self.assertIn(('grpc.keepalive_permit_without_calls', 1), options)
+        self.assertIn(('grpc.so_reuseport', 0), options)
+
+    def test_compression(self):
+        self.assertEqual(compression('gzip'), grpc.Compression.Gzip)
+        self.assertEqual(compression(None), grpc.Compression.NoCompression)
+        with self.assertRaises(ValueError):
+            compression('brotli')
+
+    def test_server_accepts_options(self):
+        settings = server_settings({'server': {
+            'max-message-bytes': 64 * 1024 * 1024,
+            'keepalive-time-ms': 60000,
+            'http2-bdp-probe': True,
+            'max-concurrent-rpcs': 10
+        }})
+        server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=settings['workers']),
+            options=channel_options(settings),
+            maximum_concurrent_rpcs=settings['max-concurrent-rpcs'],
+            compression=compression(settings['compression']))
+        self.assertNotEqual(server.add_insecure_port('127.0.0.1:0'), 0)
+        server.start()
+        server.stop(None)
+
+    def test_method_compression(self):
+        class CompressingContext(TestingContext):
+            compression = None
+
+            def set_compression(self, compression):
+                self.compression = compression
+
+        interceptor = CompressionInterceptor({'/AvaProtos.Data/getShoeTrialResults': 'gzip'})
+        context = CompressingContext()
+        self.assertEqual(interceptor.intercept(lambda r, c: 'ok', None, context, '/AvaProtos.Data/getShoeTrialResults'), 'ok')
+        self.assertEqual(context.compression, grpc.Compression.Gzip)
+        context = CompressingContext()
+        interceptor.intercept(lambda r, c: 'ok', None, context, '/AvaProtos.Users/login')
+        self.assertIsNone(context.compression)
+
+
+if __name__ == '__main__':
+    unittest.main()
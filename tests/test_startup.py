@@ -0,0 +1,30 @@
+import subprocess
+import sys
+import unittest
+
+from utils.startup_benchmark import ROOT, parse_importtime
+
+# cryptography and bcrypt aren't listed, PyJWT imports them itself when they are installed. Nor is lzma,
+# PyJWT's urllib.request loads it through tempfile and shutil
+LAZY_MODULES = ['debugpy', 'psutil', 'numpy']
+
+
+class TestStartup(unittest.TestCase):
+    def test_lazy_imports(self):
+        # Run in a new interpreter, other tests may already have imported these
+        code = 'import sys, server; print(",".join(m for m in %r if m in sys.modules))' % LAZY_MODULES
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT, universal_newlines=True)
+        self.assertEqual(output.strip(), '')
+
+    def test_parse_importtime(self):
+        output = '\n'.join([
+            'import time: self [us] | cumulative | imported package',
+            'import time:       120 |        120 |     lib.timestamp',
+            'import time:       300 |        420 |   lib.query_utils',
+            'import time:       900 |       1320 | services.users',
+        ])
+        self.assertEqual(parse_importtime(output), [
+            ('lib.timestamp', 2, 120, 120),
+            ('lib.query_utils', 1, 300, 420),
+            ('services.users', 0, 900, 1320)
+        ])
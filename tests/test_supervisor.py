@@ -0,0 +1,63 @@
+import time
+import unittest
+
+from lib.metrics import Counter, Histogram, Registry
+from lib.supervisor import RESTARTS, Supervisor, merge_scrapes
+
+
+def exit_worker(index):
+    pass
+
+
+class TestSupervisor(unittest.TestCase):
+    def test_merge_scrapes(self):
+        scrapes = []
+        for worker in range(2):
+            registry = Registry()
+            registry.register(Counter('calls_total', 'Calls', ('method',))).inc(method='Get')
+            registry.register(Histogram('latency_seconds', 'Latency', buckets=(1,))).observe(0.5)
+            scrapes.append((str(worker), registry.render()))
+
+        body = merge_scrapes(scrapes)
+        self.assertEqual(body.count('# TYPE calls_total counter'), 1)
+        self.assertIn('calls_total{method="Get",worker="0"} 1', body)
+        self.assertIn('calls_total{method="Get",worker="1"} 1', body)
+        self.assertIn('latency_seconds_bucket{le="1",worker="1"} 1', body)
+        self.assertIn('latency_seconds_count{worker="0"} 1', body)
+        # Samples stay grouped under their own family
+        lines = body.splitlines()
+        self.assertLess(lines.index('# TYPE latency_seconds histogram'), lines.index('latency_seconds_count{worker="0"} 1'))
+        self.assertLess(lines.index('calls_total{method="Get",worker="1"} 1'), lines.index('# TYPE latency_seconds histogram'))
+
+    def test_restarts_dead_workers(self):
+        supervisor = Supervisor(exit_worker, 2, min_uptime=0)
+        for index in range(2):
+            supervisor._start(index)
+        first = {index: worker['process'].pid for index, worker in supervisor._workers.items()}
+        for worker in supervisor._workers.values():
+            worker['process'].join()
+
+        before = RESTARTS.value(worker='0')
+        supervisor.check_workers()
+        self.assertEqual(RESTARTS.value(worker='0'), before + 1)
+        for index, worker in supervisor._workers.items():
+            self.assertNotEqual(worker['process'].pid, first[index])
+            worker['process'].join()
+
+    def test_backs_off_crash_loops(self):
+        supervisor = Supervisor(exit_worker, 1, min_uptime=60)
+        supervisor._start(0)
+        supervisor._workers[0]['process'].join()
+        supervisor.check_workers()
+        supervisor.check_workers()
+        self.assertEqual(supervisor._workers[0]['failures'], 1)
+        # Not restarted until the back off has passed
+        self.assertIn('restart_at', supervisor._workers[0])
+        self.assertGreater(supervisor._workers[0]['restart_at'], time.monotonic())
+
+        supervisor.stopping = True
+        supervisor.check_workers()
+
+
+if __name__ == '__main__':
+    unittest.main()
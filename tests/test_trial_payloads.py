@@ -0,0 +1,152 @@
+import json
+import os
+from unittest.mock import patch
+
+import grpc
+from bson import ObjectId
+from google.protobuf import json_format
+from lib.blob import decode_blob
+from lib.body_frames import PACKED, PACKED_QUANTIZED, unpack_body_frames
+from lib.converter import protobuf_to_dict
+from lib.trial_payloads import SPLIT_SETTING, load_payload, save_payload, split_payload, split_trial_payloads
+from proto import messages_pb2
+from pymongo.errors import WriteError
+from services.data import DataServicer
+from tests.test_servicer import TestServicer
+from tests.utils.testing_context import TestingContext
+
+JSON_DIR = os.path.join(os.path.dirname(__file__), 'json')
+
+
+def stored_trial(name='shoe_trial_result_1.json') -> messages_pb2.ShoeTrialResult:
+    with open(os.path.join(JSON_DIR, name)) as f:
+        return json_format.ParseDict(json.load(f), messages_pb2.ShoeTrialResult(), ignore_unknown_fields=True)
+
+
+class TestTrialPayloads(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.db.shoeTrialResults.delete_many({})
+        self.db.shoeTrialPayloads.delete_many({})
+        self.db.schema.delete_many({'name': SPLIT_SETTING})
+        self.servicer = DataServicer(self.db)
+        self.company_id, branch_ids = self.data_generator.generate_fake_company(1)
+        self.technician_id, self.technician = self.data_generator.generate_fake_user(4, self.company_id, branch_ids[0])
+        self.customer_id = self.data_generator.generate_fake_customer(self.company_id)
+        self.trial = stored_trial()
+
+    def save(self):
+        request = messages_pb2.ShoeTrialResult()
+        request.CopyFrom(self.trial)
+        request.customer_id = self.customer_id
+        request.device_id = self.db.companies.find_one(
+            {'_id': ObjectId(self.company_id)})['branches'][0]['devices'][0]['device_id']
+        return self.servicer.setShoeTrialResult(request, TestingContext(self.technician)).string_result
+
+    def payload(self, recording_id, user=None):
+        context = TestingContext(user or self.technician)
+        result = self.servicer.getShoeTrialResultPayload(messages_pb2.CMSQuery(string_query=recording_id), context)
+        return result.message() if result is not None else context.status_code
+
+    def test_chunks_round_trip(self):
+        payload = split_payload(self.trial)
+        self.assertFalse(self.trial.HasField('body_frames'))
+        recording_id = ObjectId()
+        self.assertEqual(save_payload(self.db, recording_id, payload, chunk_size=1000), -(-len(payload) // 1000))
+        self.assertEqual(load_payload(self.db, recording_id), payload)
+        self.assertEqual(save_payload(self.db, recording_id, b''), 0)
+        self.assertEqual(load_payload(self.db, recording_id), b'')
+
+    def test_saved_without_payload(self):
+        recording_id = self.save()
+        stored = self.db.shoeTrialResults.find_one({'_id': ObjectId(recording_id)})
+        self.assertNotIn('body_frames', stored)
+        self.assertEqual(stored['payload_chunks'], 1)
+
+        listed = self.servicer.getShoeTrialResults(messages_pb2.CMSQuery(), TestingContext(self.technician))
+        listed = [x.message() for x in listed]
+        self.assertEqual(len(listed), 1)
+        self.assertFalse(listed[0].HasField('body_frames'))
+        self.assertEqual(listed[0].shoe_brand, self.trial.shoe_brand)
+
+        payload = self.payload(recording_id)
+        self.assertEqual(payload.recording_id, recording_id)
+        self.assertEqual(payload.body_frames, self.trial.body_frames)
+        self.assertEqual(payload.qa_msg, self.trial.qa_msg)
+
+        _, other = self.data_generator.generate_fake_user(4)
+        self.assertEqual(self.payload(recording_id, other), grpc.StatusCode.NOT_FOUND)
+
+        _, admin = self.data_generator.generate_fake_user(6)
+        self.servicer.deleteShoeTrialResult(messages_pb2.CMSQuery(string_query=recording_id), TestingContext(admin))
+        self.assertEqual(self.db.shoeTrialPayloads.count_documents({'recording_id': ObjectId(recording_id)}), 0)
+
+    def test_failed_save_leaves_no_chunks(self):
+        collection = type(self.db.shoeTrialResults)
+        with patch.object(collection, 'update_one', side_effect=WriteError('Document failed validation')):
+            with self.assertRaises(WriteError):
+                self.save()
+        self.assertEqual(self.db.shoeTrialResults.count_documents({}), 0)
+        self.assertEqual(self.db.shoeTrialPayloads.count_documents({}), 0)
+
+    def test_split_existing_trials(self):
+        recording_ids = []
+        for _ in range(3):
+            data = protobuf_to_dict(self.trial, including_default_value_fields=True)
+            data.update(bin=self.trial.SerializeToString(), company_id=self.company_id)
+            recording_ids.append(str(self.db.shoeTrialResults.insert_one(data).inserted_id))
+
+        # Read from bin until they are moved
+        self.assertEqual(self.payload(recording_ids[0]).body_frames, self.trial.body_frames)
+
+        self.assertEqual(split_trial_payloads(self.db, batch_size=2, max_batches=1), 2)
+        self.assertEqual(split_trial_payloads(self.db, batch_size=2), 1)
+        self.assertEqual(split_trial_payloads(self.db, batch_size=2), 0)
+        for recording_id in recording_ids:
+            stored = self.db.shoeTrialResults.find_one({'_id': ObjectId(recording_id)})
+            self.assertNotIn('body_frames', stored)
+            msg = messages_pb2.ShoeTrialResult()
+            msg.ParseFromString(decode_blob(stored['bin']))
+            self.assertFalse(msg.HasField('body_frames'))
+            self.assertEqual(msg.shoe_name, self.trial.shoe_name)
+            self.assertEqual(self.payload(recording_id).body_frames, self.trial.body_frames)
+
+    def test_split_skips_rewritten_trial(self):
+        data = protobuf_to_dict(self.trial, including_default_value_fields=True)
+        data.update(bin=self.trial.SerializeToString(), company_id=self.company_id)
+        recording_id = self.db.shoeTrialResults.insert_one(data).inserted_id
+        rewritten = messages_pb2.ShoeTrialResult(shoe_name='Rewritten').SerializeToString()
+
+        def rewrite(db, *args):
+            # Saved again between the migration reading the trial and updating it
+            chunks = save_payload(db, *args)
+            db.shoeTrialResults.update_one({'_id': recording_id}, {'$set': {'bin': rewritten}})
+            return chunks
+
+        with patch('lib.trial_payloads.save_payload', side_effect=rewrite):
+            self.assertEqual(split_trial_payloads(self.db), 0)
+        stored = self.db.shoeTrialResults.find_one({'_id': recording_id})
+        self.assertEqual(stored['bin'], rewritten)
+        self.assertNotIn('payload_chunks', stored)
+        self.assertEqual(self.db.shoeTrialPayloads.count_documents({'recording_id': recording_id}), 0)
+
+    def test_packed_body_frames(self):
+        recording_id = self.save()
+        stored = messages_pb2.ShoeTrialResult()
+        stored.ParseFromString(load_payload(self.db, ObjectId(recording_id)))
+        self.assertEqual(list(stored.body_frames.avg_stride_frames), [])
+        self.assertTrue(stored.body_frames.packed_frames)
+
+        context = TestingContext(self.technician)
+        packed = self.servicer.getShoeTrialResultPayload(
+            messages_pb2.CMSQuery(string_query=recording_id, int_query=PACKED), context).message()
+        self.assertEqual(packed.body_frames.packed_frames, stored.body_frames.packed_frames)
+        self.assertEqual(unpack_body_frames(packed.body_frames.packed_frames), self.trial.body_frames)
+
+        quantized = self.servicer.getShoeTrialResultPayload(
+            messages_pb2.CMSQuery(string_query=recording_id, int_query=PACKED_QUANTIZED), context).message()
+        self.assertLess(len(quantized.body_frames.packed_frames), len(packed.body_frames.packed_frames))
+        self.assertEqual(quantized.qa_msg, self.trial.qa_msg)
+
+        self.servicer.getShoeTrialResultPayload(messages_pb2.CMSQuery(string_query=recording_id, int_query=3), context)
+        self.assertEqual(context.status_code, grpc.StatusCode.INVALID_ARGUMENT)
@@ -0,0 +1,89 @@
+import bson
+from bson import ObjectId
+from lib.blob import decode_blob
+from lib.converter import protobuf_to_dict
+from lib.trial_payloads import split_payload
+from lib.trial_projection import (FIELDS, MAP_FIELDS, REINDEX_SETTING, UNPROJECTED, expanded_trial, reindex_trials,
+                                  trial_projection)
+from proto import messages_pb2
+from services.data import DataServicer
+from tests.test_servicer import TestServicer
+from tests.test_trial_payloads import stored_trial
+from tests.utils.testing_context import TestingContext
+
+
+class TestTrialProjection(TestServicer):
+    def setUp(self):
+        super().setUp()
+        self.db.shoeTrialResults.delete_many({})
+        self.db.schema.delete_many({'name': REINDEX_SETTING})
+        self.trial = stored_trial()
+        split_payload(self.trial)
+        self.trial.purchase_decision.notes = 'Liked them'
+
+    def test_projection(self):
+        data = trial_projection(self.trial)
+        self.assertEqual(set(data), set(FIELDS) | set(MAP_FIELDS))
+        # Left at their defaults and still stored, queries match on them
+        self.assertEqual(data['recording_date'], 0)
+        self.assertEqual(data['shoe_season'], '')
+        self.assertEqual(data['purchase_decision'],
+                         {'decision': 0, 'no_sale_reason': 0, 'notes': 'Liked them', 'purchased_pair_count': 0})
+        for name, value in self.trial.raw_metrics.items():
+            self.assertEqual(data['raw_metrics'][name], {'median': value.median})
+        for name, value in self.trial.macro_metric_results.items():
+            self.assertEqual(data['macro_metric_results'][name], {'score': value.score, 'grade': value.grade})
+
+        self.trial.ClearField('purchase_decision')
+        self.assertNotIn('purchase_decision', trial_projection(self.trial))
+
+        full = protobuf_to_dict(self.trial, including_default_value_fields=True)
+        self.assertLess(len(bson.BSON.encode(trial_projection(self.trial))) * 10, len(bson.BSON.encode(full)))
+
+    def test_saved_with_projection(self):
+        company_id, branch_ids = self.data_generator.generate_fake_company(1)
+        _, technician = self.data_generator.generate_fake_user(4, company_id, branch_ids[0])
+        request = messages_pb2.ShoeTrialResult()
+        request.CopyFrom(self.trial)
+        request.customer_id = self.data_generator.generate_fake_customer(company_id)
+        request.device_id = self.db.companies.find_one(
+            {'_id': ObjectId(company_id)})['branches'][0]['devices'][0]['device_id']
+        servicer = DataServicer(self.db)
+        context = TestingContext(technician)
+        recording_id = servicer.setShoeTrialResult(request, context).string_result
+
+        stored = self.db.shoeTrialResults.find_one({'_id': ObjectId(recording_id)})
+        for name in UNPROJECTED:
+            self.assertNotIn(name, stored)
+        self.assertEqual(stored['company_id'], company_id)
+        self.assertEqual(stored['customer_id'], request.customer_id)
+
+        # Everything else is still sent, read from bin
+        minified = list(servicer.getMinifiedResultsByCustomerId(
+            messages_pb2.CMSQuery(string_query=request.customer_id), context))
+        self.assertEqual(len(minified), 1)
+        self.assertEqual(minified[0].recording_id, recording_id)
+        self.assertEqual(minified[0].created, stored['created'])
+        self.assertEqual(minified[0].raw_metrics, self.trial.raw_metrics)
+        self.assertEqual(minified[0].macro_metric_results, self.trial.macro_metric_results)
+        self.assertEqual(len(minified[0].micro_metric_scores), 0)
+        self.assertFalse(minified[0].recording_filename)
+
+    def test_reindex(self):
+        old = protobuf_to_dict(self.trial, including_default_value_fields=True)
+        del old['recording_id'], old['created']
+        for _ in range(3):
+            self.db.shoeTrialResults.insert_one(dict(old, bin=self.trial.SerializeToString(), created=1234))
+
+        self.assertEqual(reindex_trials(self.db, batch_size=2, max_batches=1), 2)
+        self.assertEqual(reindex_trials(self.db, batch_size=2), 1)
+        self.assertEqual(reindex_trials(self.db, batch_size=2), 0)
+        for x in self.db.shoeTrialResults.find():
+            self.assertEqual(set(x), set(FIELDS) | set(MAP_FIELDS) | {'_id', 'bin', 'created'})
+            self.assertEqual(x['raw_metrics'], trial_projection(self.trial)['raw_metrics'])
+            self.assertEqual(decode_blob(x['bin']), self.trial.SerializeToString())
+
+            expanded = expanded_trial(x)
+            self.assertEqual(expanded.pop('created'), 1234)
+            del expanded['_id'], expanded['bin']
+            self.assertEqual(expanded, old)
@@ -2,7 +2,9 @@ from datetime import datetime, timedelta
 from lib2to3.pytree import generate_matches
 
 from bson.objectid import ObjectId
+from lib.blob import encode_blob
 from lib.converter import protobuf_to_dict
+from lib.trial_projection import trial_projection
 import random
 from proto import messages_pb2
 from pymongo import MongoClient
@@ -174,11 +176,11 @@ class MockDataGenerator():
                 technician_id, created, customer_id)
 
             serialised = request.SerializeToString()
-            data = protobuf_to_dict(
-                request, including_default_value_fields=True)
+            data = trial_projection(request)
+            data['created'] = request.created
 
             # Store message encoded in bin attribute
-            data['bin'] = serialised
+            data['bin'] = encode_blob(serialised)
             res = self.db.shoeTrialResults.insert_one(data)
             created_ids.append(str(res.inserted_id))
 
@@ -4,6 +4,7 @@ class TestingContext():
         self.user = user
         self.status_code = None
         self.detail = None
+        self.trailing_metadata = {}
         if token:
             self.metadata = {'authorization': f'token {token}'}
         else:
@@ -16,5 +17,8 @@ class TestingContext():
         self.status_code = status_code
         self.detail = detail
 
+    def set_trailing_metadata(self, metadata):
+        self.trailing_metadata = dict(metadata)
+
     def invocation_metadata(self):
         return self.metadata
\ No newline at end of file
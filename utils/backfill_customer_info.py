@@ -0,0 +1,19 @@
+"""Copy customer gender, date of birth and branch onto shoeTrialResults saved before they were kept there
+
+Only trials without customer_info are read, so a second run after an
+interrupted one picks up the rest.
+
+    python -m utils.backfill_customer_info [--restart]
+"""
+from functools import partial
+
+from lib.customer_info import backfill_customer_info
+from utils.migration import run_batches, run_migration
+
+
+def run(database, args):
+    run_batches(partial(backfill_customer_info, database), 'Updated {} shoeTrialResults', args.restart)
+
+
+if __name__ == '__main__':
+    run_migration(__doc__, run, 'Backfill complete')
@@ -0,0 +1,91 @@
+"""Report what each blob codec saves and costs on the messages in tests/json
+
+For every fixture the message is stored the way the servicers store it,
+shoe trial results without the payload kept in shoeTrialPayloads, and
+encoded with each codec. The stored size is also what Mongo sends the
+server for every bin it reads.
+
+    python -m utils.blob_benchmark [--repeat N]
+"""
+import argparse
+import json
+import os
+import time
+
+from google.protobuf import json_format
+from lib.blob import CODECS, decode_blob, encode_blob
+from lib.trial_payloads import split_payload
+from proto import messages_pb2
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+JSON_DIR = os.path.join(ROOT, 'tests', 'json')
+
+
+def fixtures() -> list:
+    """The messages in tests/json, serialized as they are stored in bin
+
+    Returns:
+        list: (file name, serialized message)
+    """
+    messages = []
+    for name in sorted(os.listdir(JSON_DIR)):
+        with open(os.path.join(JSON_DIR, name)) as f:
+            data = json.load(f)
+        if name.startswith('metric_mapping'):
+            msg = json_format.ParseDict(data, messages_pb2.MetricMappingMsg(), ignore_unknown_fields=True)
+        else:
+            msg = json_format.ParseDict(data, messages_pb2.ShoeTrialResult(), ignore_unknown_fields=True)
+            split_payload(msg)
+        messages.append((name, msg.SerializeToString()))
+    return messages
+
+
+def timed(fn, arg, repeat: int) -> float:
+    """Fastest of repeat calls in microseconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e6
+
+
+def measure(data: bytes, codec: int, repeat=20) -> tuple:
+    """Encode and decode one message with a codec
+
+    Args:
+        data (bytes): Serialized message
+        codec (int): RAW, ZLIB or LZMA
+        repeat (int, optional): Runs to take the fastest of
+
+    Returns:
+        tuple: Stored size in bytes, encode and decode time in microseconds
+    """
+    blob = encode_blob(data, codec)
+    assert decode_blob(blob) == data
+    return len(blob), timed(lambda x: encode_blob(x, codec), data, repeat), timed(decode_blob, blob, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    totals = {name: [0, 0.0, 0.0] for name in CODECS}
+    raw_total = 0
+    print(f'{"fixture":<28} {"codec":<5} {"bytes":>8} {"ratio":>6} {"encode us":>10} {"decode us":>10}')
+    for fixture, data in fixtures():
+        raw_total += len(data)
+        for name, codec in CODECS.items():
+            size, encode_us, decode_us = measure(data, codec, args.repeat)
+            totals[name][0] += size
+            totals[name][1] += encode_us
+            totals[name][2] += decode_us
+            print(f'{fixture:<28} {name:<5} {size:>8} {len(data) / size:>6.2f} {encode_us:>10.1f} {decode_us:>10.1f}')
+    for name, (size, encode_us, decode_us) in totals.items():
+        print(f'{"total":<28} {name:<5} {size:>8} {raw_total / size:>6.2f} {encode_us:>10.1f} {decode_us:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
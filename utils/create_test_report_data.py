@@ -3,6 +3,7 @@ import random
 from lib.timestamp import now
 from pymongo import MongoClient
 from bson import Int64
+from lib.blob import decode_blob, encode_blob
 from lib.converter import protobuf_to_dict
 from google.protobuf.json_format import MessageToJson, ParseDict
 from bson.json_util import loads
@@ -37,12 +38,12 @@ def main():
         recording['shoe_name'] = shoe_name
 
         binary_shoe_trial_result = ShoeTrialResult()
-        binary_shoe_trial_result.ParseFromString(recording['bin'])
+        binary_shoe_trial_result.ParseFromString(decode_blob(recording['bin']))
         binary_shoe_trial_result.recording_date = Int64(timestamp)
         binary_shoe_trial_result.created = Int64(timestamp)
         binary_shoe_trial_result.shoe_brand = shoe_brand
         binary_shoe_trial_result.shoe_name = shoe_name
-        recording['bin'] = binary_shoe_trial_result.SerializeToString()
+        recording['bin'] = encode_blob(binary_shoe_trial_result.SerializeToString())
         
         db.shoeTrialResults.update_one({'_id': recording['_id']}, {'$set': recording})
         print(recording['purchase_decision'])
@@ -0,0 +1,53 @@
+import argparse
+
+from config import get_config
+from lib.db import Db
+
+# Batches per call, the running total is printed between calls
+BATCHES = 10
+
+
+def run_batches(migrate, progress: str, restart=False) -> int:
+    """Call a lib migration until it has nothing left, printing the running total
+
+    Args:
+        migrate (callable): Takes max_batches and restart, returns how many documents it did, 0 once done
+        progress (str): Format of the running total, e.g. 'Updated {} shoeTrialResults'
+        restart (bool, optional): Start the migration again from the first document
+
+    Returns:
+        int: Documents done
+    """
+    total = 0
+    done = migrate(max_batches=BATCHES, restart=restart)
+    while done:
+        total += done
+        print(progress.format(total))
+        done = migrate(max_batches=BATCHES)
+    return total
+
+
+def run_migration(doc: str, run, finished: str, arguments=None):
+    """Parse the command line of a utils migration and run it against the avaclone database
+
+    Every migration takes --restart.
+
+    Args:
+        doc (str): Docstring of the script, its first line is the --help description
+        run (callable): Called with the Database and the parsed arguments
+        finished (str): Printed once run returns
+        arguments (callable, optional): Adds the script's own arguments to the ArgumentParser
+    """
+    parser = argparse.ArgumentParser(description=doc.splitlines()[0])
+    parser.add_argument('--restart', action='store_true', help='Go through every document again')
+    if arguments is not None:
+        arguments(parser)
+    args = parser.parse_args()
+
+    config = get_config()
+    db = Db(config['db-host'])
+    try:
+        run(db.get_database('avaclone'), args)
+    finally:
+        db.close()
+    print(finished)
@@ -0,0 +1,19 @@
+"""Recompute the latest_trial kept on every customer from their shoeTrialResults
+
+Starts from the last customer a previous run reached, --restart goes back
+to the first.
+
+    python -m utils.rebuild_latest_trials [--restart]
+"""
+from functools import partial
+
+from lib.latest_trial import rebuild_latest_trials
+from utils.migration import run_batches, run_migration
+
+
+def run(database, args):
+    run_batches(partial(rebuild_latest_trials, database), 'Rebuilt {} customers', args.restart)
+
+
+if __name__ == '__main__':
+    run_migration(__doc__, run, 'Rebuild complete')
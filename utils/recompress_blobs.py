@@ -0,0 +1,25 @@
+"""Rewrite the bin of shoeTrialResults and metricMappings with a blob codec
+
+Each collection and codec keeps its own position, so switching codec starts
+from the beginning while rerunning the same one doesn't.
+
+    python -m utils.recompress_blobs [--codec raw|zlib|lzma] [--restart]
+"""
+from functools import partial
+
+from lib.blob import CODECS, COLLECTIONS, recompress_blobs
+from utils.migration import run_batches, run_migration
+
+
+def arguments(parser):
+    parser.add_argument('--codec', choices=list(CODECS), default='zlib')
+
+
+def run(database, args):
+    for collection in COLLECTIONS:
+        run_batches(partial(recompress_blobs, database, collection, CODECS[args.codec]),
+                    f'Recompressed {{}} {collection}', args.restart)
+
+
+if __name__ == '__main__':
+    run_migration(__doc__, run, 'Recompress complete', arguments)
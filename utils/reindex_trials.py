@@ -0,0 +1,20 @@
+"""Rebuild the queryable fields stored next to the bin of every shoeTrialResult
+
+Drops the rest of the message stored before there was a projection. After
+changing lib.trial_projection, run it with --restart so trials an earlier
+run already reached are done again.
+
+    python -m utils.reindex_trials [--restart]
+"""
+from functools import partial
+
+from lib.trial_projection import reindex_trials
+from utils.migration import run_batches, run_migration
+
+
+def run(database, args):
+    run_batches(partial(reindex_trials, database), 'Reindexed {} shoeTrialResults', args.restart)
+
+
+if __name__ == '__main__':
+    run_migration(__doc__, run, 'Reindex complete')
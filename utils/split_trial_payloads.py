@@ -0,0 +1,19 @@
+"""Move body_frames, alignment and qa_msg of shoeTrialResults saved before they were split out into shoeTrialPayloads
+
+Trials that already have payload_chunks are skipped, interrupting it part
+way loses nothing.
+
+    python -m utils.split_trial_payloads [--restart]
+"""
+from functools import partial
+
+from lib.trial_payloads import split_trial_payloads
+from utils.migration import run_batches, run_migration
+
+
+def run(database, args):
+    run_batches(partial(split_trial_payloads, database), 'Updated {} shoeTrialResults', args.restart)
+
+
+if __name__ == '__main__':
+    run_migration(__doc__, run, 'Split complete')
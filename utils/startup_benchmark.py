@@ -0,0 +1,72 @@
+"""Report what importing a module costs at start up
+
+Runs the import in a fresh interpreter with -X importtime and lists the
+slowest modules by their cumulative import time.
+
+    python -m utils.startup_benchmark [module] [--top N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+def parse_importtime(output: str) -> list:
+    """Parse the stderr of python -X importtime
+
+    Args:
+        output (str): Output to parse
+
+    Returns:
+        list: (module, depth, self_us, cumulative_us) for every import
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nested imports are indented two spaces per level below the module that imported them
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return imports
+
+
+def measure(module: str) -> tuple:
+    """Import a module in a new interpreter
+
+    Args:
+        module (str): Module to import
+
+    Returns:
+        tuple: Wall time in seconds and the parsed import times
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, stderr=subprocess.PIPE, universal_newlines=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode:
+        raise RuntimeError(proc.stderr)
+    return elapsed, parse_importtime(proc.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('module', nargs='?', default='server')
+    parser.add_argument('--top', type=int, default=25)
+    args = parser.parse_args()
+
+    elapsed, imports = measure(args.module)
+    # Modules imported directly by the one being measured
+    direct = [x for x in imports if x[1] == 1]
+    print(f'import {args.module}: {elapsed:.3f}s wall, {len(imports)} modules')
+    print(f'{"cumulative ms":>14} {"self ms":>9}  module')
+    for name, _, self_us, cumulative_us in sorted(direct, key=lambda x: -x[3])[:args.top]:
+        print(f'{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}')
+
+
+if __name__ == '__main__':
+    main()